@@ -0,0 +1,71 @@
+"""
+Benchmark: bulk raw_data loading, Supabase REST upserts vs binary COPY + merge (db/postgres.py).
+Both paths write the same synthetic rows through ChunkedWriter (same chunking, in-flight limit and
+natural-key upsert), into the database behind SUPABASE_URL / DATABASE_URL. Rows are generated per chunk,
+so 10M rows don't sit in memory, and are deleted afterwards.
+
+Usage: python -m etl.benchmarks.bench_bulk_load [--rows 100000 1000000 10000000] [--chunk 5000] [--paths rest copy]
+"""
+
+import argparse
+import time
+import uuid
+from etl.config import Config
+from etl.db.connection import DatabaseConnection
+from etl.db.writer import ChunkedWriter
+from etl.extractors.changes import RAW_DATA_KEY
+
+# Representative order document (~1 KB, nested like the POS exports)
+DOCUMENT = {
+    "store_id": "str_bench", "order_status": "DELIVERED", "order_fulfillment_method": "MERCHANT_DELIVERY",
+    "created_at": "2025-01-01T10:00:00Z", "order_subtotal": 4200, "tax_amount": 378, "dasher_tip": 500,
+    "total_charged_to_consumer": 5078, "delivery_fee": 299, "service_fee": 150, "commission": 840,
+    "order_items": [{"item_id": f"itm_{i:03d}", "name": "Classic Burger", "quantity": 2, "unit_price": 1050,
+                     "special_instructions": "No onions"} for i in range(4)],
+}
+
+PATHS = ("rest", "copy")
+
+
+def _rows(run: str, start: int, n: int) -> list:
+    return [{"source_name": "bench", "entity_type": "order", "source_entity_id": f"{run}_{i}",
+             "data": {**DOCUMENT, "external_delivery_id": f"{run}_{i}"}} for i in range(start, start + n)]
+
+
+def load(path: str, rows: int, chunk: int) -> float:
+    """Writes `rows` synthetic raw orders through `path`. Returns seconds."""
+    conn = DatabaseConnection(backend="rest" if path == "rest" else "postgres")
+    run = f"bench_{path}_{uuid.uuid4().hex[:8]}"
+    start = time.perf_counter()
+    with ChunkedWriter(conn.client, chunk_size=chunk, on_conflict=RAW_DATA_KEY, label=f"raw_data[{path}]") as writer:
+        for offset in range(0, rows, chunk * 4):
+            writer.write(_rows(run, offset, min(chunk * 4, rows - offset)))
+    elapsed = time.perf_counter() - start
+    _cleanup(run)
+    return elapsed
+
+
+def _cleanup(run: str) -> None:
+    import psycopg
+    with psycopg.connect(Config.DATABASE_URL) as conn:
+        conn.execute("DELETE FROM raw_data WHERE source_name = 'bench' AND source_entity_id LIKE %s", (f"{run}\\_%",))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--chunk", type=int, default=5000, help="Rows per upsert request / COPY batch")
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    args = parser.parse_args()
+
+    print(f"chunk {args.chunk} | in flight {Config.UPSERT_MAX_IN_FLIGHT}")
+    print(f"{'rows':>10} | {'path':>5} | {'elapsed s':>9} | {'rows/s':>9}")
+    print("-" * 44)
+    for rows in args.rows:
+        for path in args.paths:
+            elapsed = load(path, rows, args.chunk)
+            print(f"{rows:>10} | {path:>5} | {elapsed:>9.2f} | {rows / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: peak extraction memory vs export file size.
+Compares json.load + full records list against the streaming reader (no DB writes).
+
+Usage: python -m etl.benchmarks.bench_extract_memory [--sizes 10 50 200]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from etl.extractors.stream import stream_batches
+from etl.extractors.extract_doordash import ENTITIES
+
+SOURCE_PATH = Path(__file__).parent.parent / "data" / "sources" / "doordash_orders.json"
+
+
+def write_synthetic_export(path: Path, target_mb: int) -> int:
+    """Writes a DoorDash-shaped export of ~target_mb by cloning real orders with unique IDs."""
+    with open(SOURCE_PATH, encoding="utf-8") as f:
+        base = json.load(f)
+    
+    target = target_mb * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"stores": ' + json.dumps(base["stores"]) + ', "orders": [')
+        written, n = 0, 0
+        while written < target:
+            order = dict(base["orders"][n % len(base["orders"])], external_delivery_id=f"syn_{n}")
+            chunk = ("," if n else "") + json.dumps(order)
+            f.write(chunk)
+            written += len(chunk)
+            n += 1
+        f.write("]}")
+    return n
+
+
+def _full_load(path: Path) -> int:
+    """Old path: json.load the export, then build the full records list."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    records = [
+        {"source_name": "doordash", "entity_type": entity_type, "source_entity_id": e[id_key], "data": e}
+        for key, (entity_type, id_key) in ENTITIES.items()
+        for e in data.get(key, []) if e.get(id_key)
+    ]
+    return len(records)
+
+
+def _streamed(path: Path) -> int:
+    """New path: stream entities and drop each batch once 'sent'."""
+    return sum(len(records) for _, records in stream_batches(path, "doordash", ENTITIES))
+
+
+def measure(func, path: Path) -> tuple[int, float, float]:
+    """Returns (rows, peak_mb, seconds) for func(path)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, peak / 1024 / 1024, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="Export sizes in MB")
+    args = parser.parse_args()
+    
+    print(f"{'file MB':>8} | {'rows':>8} | {'json.load peak MB':>18} | {'stream peak MB':>15} | {'load s':>7} | {'stream s':>8}")
+    print("-" * 80)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"doordash_{size}mb.json"
+            write_synthetic_export(path, size)
+            file_mb = path.stat().st_size / 1024 / 1024
+            rows, load_peak, load_s = measure(_full_load, path)
+            _, stream_peak, stream_s = measure(_streamed, path)
+            print(f"{file_mb:>8.1f} | {rows:>8} | {load_peak:>18.1f} | {stream_peak:>15.1f} | {load_s:>7.2f} | {stream_s:>8.2f}")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
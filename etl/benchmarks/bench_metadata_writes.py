@@ -0,0 +1,78 @@
+"""
+Benchmark: metadata writes, per-row UPDATE loop vs bulk RPC.
+Uses a simulated client that charges a fixed round-trip latency plus payload transfer time per request.
+
+Usage: python -m etl.benchmarks.bench_metadata_writes [--orders 2000] [--rtt-ms 20] [--mbps 50]
+"""
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+from etl.transformers.utils import batch_update_metadata, update_metadata_per_row
+
+
+class SimulatedClient:
+    """Counts requests and sleeps rtt + payload_bytes / bandwidth for each one."""
+    
+    def __init__(self, rtt_ms: float, mbps: float):
+        self.rtt = rtt_ms / 1000
+        self.bytes_per_s = mbps * 1024 * 1024 / 8
+        self.requests = 0
+        self.payload_bytes = 0
+    
+    def _send(self, payload) -> SimpleNamespace:
+        size = len(json.dumps(payload))
+        self.requests += 1
+        self.payload_bytes += size
+        time.sleep(self.rtt + size / self.bytes_per_s)
+        return SimpleNamespace(data=len(payload["updates"]) if "updates" in payload else [])
+    
+    def table(self, name):
+        client = self
+        
+        class _Update:
+            def update(self, values):
+                self.values = values
+                return self
+            
+            def eq(self, column, value):
+                self.key = {column: value}
+                return self
+            
+            def execute(self):
+                return client._send({**self.values, **self.key})
+        return _Update()
+    
+    def rpc(self, fn, params):
+        return SimpleNamespace(execute=lambda: self._send(params))
+
+
+def _updates(n: int) -> list:
+    return [
+        (f"00000000-0000-0000-0000-{i:012d}", {"payment_type": "CARD", "card_brand": "VISA", "business_date": 20250101})
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=20.0, help="Simulated round-trip latency")
+    parser.add_argument("--mbps", type=float, default=50.0, help="Simulated upload bandwidth")
+    args = parser.parse_args()
+    
+    updates = _updates(args.orders)
+    print(f"{args.orders} orders | RTT {args.rtt_ms:.0f} ms | {args.mbps:.0f} Mbit/s")
+    print(f"{'path':>10} | {'requests':>8} | {'payload KB':>10} | {'elapsed s':>9}")
+    print("-" * 48)
+    for name, func in (("per-row", update_metadata_per_row), ("bulk rpc", batch_update_metadata)):
+        client = SimulatedClient(args.rtt_ms, args.mbps)
+        start = time.perf_counter()
+        func(client, updates)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10} | {client.requests:>8} | {client.payload_bytes / 1024:>10.0f} | {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: item name normalization, sequential patterns vs one combined scan, with and without the memo.
+Synthetic names are real source names with random typos, abbreviations, symbols and piece counts;
+--distinct controls how often names repeat (POS exports repeat the same few names per line item).
+
+Usage: python -m etl.benchmarks.bench_normalize [--names 200000] [--distinct 5000]
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from etl.catalog.extract import extract_doordash, extract_toast
+from etl.catalog.normalize import normalize_item_name, normalize_many
+from etl.catalog.normalize.config import ABBREVIATIONS, NAME_TYPOS
+from etl.catalog.normalize.core import _normalize_item_name, normalize_item_name_sequential
+
+SOURCES_DIR = Path(__file__).parent.parent / "data" / "sources"
+DECORATIONS = [*NAME_TYPOS, *ABBREVIATIONS, "&", "-", "12pcs", "6PCS", "BBQ", "and", "of the", "  "]
+
+
+def _names(n: int, distinct: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    dd_names, _ = extract_doordash(SOURCES_DIR / "doordash_orders.json")
+    toast_names, _ = extract_toast(SOURCES_DIR / "toast_pos_export.json")
+    base = [*dd_names.values(), *toast_names.values()]
+    vocabulary = [
+        " ".join([rng.choice(base), *rng.sample(DECORATIONS, rng.randint(0, 3))]) + f" #{i}"
+        for i in range(distinct)
+    ]
+    return [rng.choice(vocabulary) for _ in range(n)]
+
+
+def _time(func, names: list) -> float:
+    start = time.perf_counter()
+    func(names)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--names", type=int, default=200000)
+    parser.add_argument("--distinct", type=int, default=5000, help="Distinct names among --names")
+    args = parser.parse_args()
+    
+    names = _names(args.names, args.distinct)
+    uncached = _normalize_item_name.__wrapped__
+    paths = [
+        ("sequential", lambda ns: [normalize_item_name_sequential(n) for n in ns]),
+        ("single-pass", lambda ns: [uncached(n) for n in ns]),
+        ("single+lru", lambda ns: [normalize_item_name(n) for n in ns]),
+        ("many", normalize_many),
+    ]
+    
+    print(f"{args.names} names | {args.distinct} distinct")
+    print(f"{'path':>12} | {'elapsed s':>9} | {'names/s':>10} | {'speedup':>7}")
+    print("-" * 48)
+    baseline = None
+    for name, func in paths:
+        _normalize_item_name.cache_clear()
+        elapsed = _time(func, names)
+        baseline = baseline or elapsed
+        print(f"{name:>12} | {elapsed:>9.2f} | {args.names / elapsed:>10.0f} | {baseline / elapsed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,145 @@
 """
 Builds item_catalog_generated.json from all POS sources.
 Uses hash maps for O(1) lookups during catalog assembly.
+--incremental keeps a state file of source fingerprints and seen item IDs per output file: unchanged sources
+are not parsed, only unseen IDs are normalized, and existing entries are never rewritten.
 """
 
+import argparse
+import hashlib
 import json
+import os
 import sys
 from pathlib import Path
 
 # Allow running as script
 if __name__ == "__main__":
     sys.path.insert(0, str(Path(__file__).parent))
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))  # etl.sources
 
 from extract import extract_doordash, extract_square, extract_toast
 from normalize import normalize_item_name, normalize_category_name, square_variation_suffix
+from etl.config import Config
 
 DATA_DIR = Path(__file__).parent.parent / "data" / "sources"
 OUTPUT_PATH = Path(__file__).parent / "item_catalog_generated.json"
+STATE_PATH = Config.STATE_DIR / "catalog_build.json"
 
+COMMENTS = {
+    "doordash": "Maps DoorDash item IDs to normalized names.",
+    "square": "Maps Square item IDs to normalized names.",
+    "toast": "Maps Toast item IDs to normalized names.",
+}
 
-def build_catalog():
-    """Runs the catalog build pipeline."""
-    
-    # Extract from sources
-    dd_names, dd_cats = extract_doordash(DATA_DIR / "doordash_orders.json")
-    sq_names, sq_cats, sq_vars, sq_used = extract_square(DATA_DIR / "square" / "catalog.json", DATA_DIR / "square" / "orders.json")
-    toast_names, toast_cats = extract_toast(DATA_DIR / "toast_pos_export.json")
-    
-    # Build catalog
-    catalog = {
-        "doordash": {"_comment": "Maps DoorDash item IDs to normalized names."},
-        "square": {"_comment": "Maps Square item IDs to normalized names."},
-        "toast": {"_comment": "Maps Toast item IDs to normalized names."},
-    }
-    
-    # DoorDash
-    for item_id, name in dd_names.items():
-        catalog["doordash"][item_id] = {
-            "name": normalize_item_name(name),
-            "category": normalize_category_name(dd_cats.get(item_id, ""))
-        }
-    
-    # Square (only items used in orders)
-    for var_id in sq_used:
-        if var_id in sq_names:
-            base = normalize_item_name(sq_names[var_id])
-            suffix = square_variation_suffix(sq_vars.get(var_id, ""), base)
-            catalog["square"][var_id] = {
-                "name": base + suffix,
-                "category": normalize_category_name(sq_cats.get(var_id, ""))
-            }
+
+def _entry(name: str, category: str) -> dict:
+    return {"name": normalize_item_name(name), "category": normalize_category_name(category)}
+
+
+def _doordash_entries(paths: tuple, skip: set) -> dict:
+    names, cats = extract_doordash(*paths)
+    return {item_id: _entry(name, cats.get(item_id, "")) for item_id, name in names.items() if item_id not in skip}
+
+
+def _square_entries(paths: tuple, skip: set) -> dict:
+    names, cats, variations, used = extract_square(*paths)
+    entries = {}
+    for var_id in used:  # Only items used in orders
+        if var_id in names and var_id not in skip:
+            entry = _entry(names[var_id], cats.get(var_id, ""))
+            entry["name"] += square_variation_suffix(variations.get(var_id, ""), entry["name"])
+            entries[var_id] = entry
+    return entries
+
+
+def _toast_entries(paths: tuple, skip: set) -> dict:
+    names, cats = extract_toast(*paths)
+    return {item_id: _entry(name, cats.get(item_id, "")) for item_id, name in names.items() if item_id not in skip}
+
+
+# Source -> (input files, entry builder); hash map for O(1) dispatch
+SOURCES = {
+    "doordash": ((DATA_DIR / "doordash_orders.json",), _doordash_entries),
+    "square": ((DATA_DIR / "square" / "catalog.json", DATA_DIR / "square" / "orders.json"), _square_entries),
+    "toast": ((DATA_DIR / "toast_pos_export.json",), _toast_entries),
+}
+
+
+def fingerprint(path: Path, previous: dict = None) -> dict:
+    """size/mtime_ns plus content hash; the hash is reused when size and mtime are unchanged."""
+    stat = path.stat()
+    if previous and previous["size"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+        return previous
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+
+def _load_json(path: Path, default: dict) -> dict:
+    if not path.exists():
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_json(path: Path, data: dict, indent: int = 2) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def build_catalog(incremental: bool = False, output_path: Path = OUTPUT_PATH, state_path: Path = STATE_PATH) -> dict:
+    """
+    Runs the catalog build pipeline. Returns new entries per source.
+    incremental=True keeps the existing output untouched (curated entries included), skips sources
+    whose files are unchanged, and normalizes only item IDs not seen before. State is kept per output
+    file; a missing output is rebuilt in full.
+    """
+    states = _load_json(state_path, {}).get("outputs", {})
+    key = str(output_path.resolve())
+    incremental = incremental and output_path.exists()
+    state = states.get(key, {"sources": {}}) if incremental else {"sources": {}}
+    catalog = _load_json(output_path, {}) if incremental else {}
+    added = {}
     
-    # Toast
-    for item_id, name in toast_names.items():
-        catalog["toast"][item_id] = {
-            "name": normalize_item_name(name),
-            "category": normalize_category_name(toast_cats.get(item_id, ""))
-        }
+    for source, (paths, build_entries) in SOURCES.items():
+        previous = state["sources"].get(source, {})
+        fingerprints = {str(p): fingerprint(p, previous.get("files", {}).get(str(p))) for p in paths}
+        items = catalog.setdefault(source, {"_comment": COMMENTS[source]})
+        digests = lambda files: {p: f["sha256"] for p, f in files.items()}
+        if incremental and digests(previous.get("files", {})) == digests(fingerprints):
+            state["sources"][source]["files"] = fingerprints  # Same content (e.g. touched): refresh mtimes
+            added[source] = None  # Unchanged: not parsed
+            continue
+        
+        seen = set(previous.get("seen", [])) | set(items)
+        entries = build_entries(paths, seen)
+        for item_id, entry in entries.items():
+            items.setdefault(item_id, entry)  # Never overwrite an existing (possibly curated) entry
+        added[source] = len(entries)
+        state["sources"][source] = {"files": fingerprints, "seen": sorted(seen | set(entries))}
     
-    # Save
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(catalog, f, indent=2, ensure_ascii=False)
+    _save_json(output_path, catalog)
+    states[key] = state
+    _save_json(state_path, {"outputs": states}, indent=None)
     
     # Summary
     counts = {k: len(v) - 1 for k, v in catalog.items()}
-    print(f"Catalog saved: {OUTPUT_PATH.name}")
-    print(f"  DoorDash: {counts['doordash']} | Square: {counts['square']} | Toast: {counts['toast']}")
+    print(f"Catalog saved: {output_path.name}" + (" (incremental)" if incremental else ""))
+    print("  " + " | ".join(
+        f"{source.title() if source != 'doordash' else 'DoorDash'}: {counts[source]}"
+        + (" (unchanged)" if added[source] is None else f" (+{added[source]})" if incremental else "")
+        for source in SOURCES
+    ))
     print(f"  Total: {sum(counts.values())} items")
+    return added
 
 
 if __name__ == "__main__":
-    build_catalog()
+    parser = argparse.ArgumentParser(description="Build the item catalog from all POS sources.")
+    parser.add_argument("--incremental", action="store_true", help="Only parse changed sources and add unseen item IDs")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args()
+    build_catalog(args.incremental, args.output)
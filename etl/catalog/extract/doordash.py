@@ -5,14 +5,13 @@ DSA: Uses hash map (dict) for O(1) deduplication - first occurrence wins.
 Single pass through all orders: O(n) time complexity.
 """
 
-import json
 from pathlib import Path
+from etl.sources import load_json
 
 
 def extract_items(path: Path) -> tuple[dict, dict]:
     """Returns (item_names, item_categories) from DoorDash orders."""
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(path)
     
     names, categories = {}, {}
     for order in data.get("orders", []):
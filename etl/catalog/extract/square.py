@@ -6,16 +6,14 @@ DSA: Uses hash maps (dict) for O(1) category lookups.
 Single pass through catalog objects and orders: O(n + m).
 """
 
-import json
 from pathlib import Path
+from etl.sources import load_json
 
 
 def extract_items(catalog_path: Path, orders_path: Path) -> tuple[dict, dict, dict, set]:
     """Returns (item_names, item_categories, variation_names, used_ids) from Square."""
-    with open(catalog_path, encoding="utf-8") as f:
-        catalog = json.load(f)
-    with open(orders_path, encoding="utf-8") as f:
-        orders = json.load(f)
+    catalog = load_json(catalog_path)
+    orders = load_json(orders_path)
     
     # Category lookup - O(1) access
     cat_lookup = {
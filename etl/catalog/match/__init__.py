@@ -0,0 +1,5 @@
+"""Cross-source item matching for item catalog."""
+
+from .core import match_items, catalog_records, NGramIndex, UnionFind
+
+__all__ = ["match_items", "catalog_records", "NGramIndex", "UnionFind"]
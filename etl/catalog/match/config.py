@@ -0,0 +1,28 @@
+"""Constants and pre-compiled patterns for cross-source matching."""
+
+import re
+import uuid
+
+# Character n-gram size for blocking and similarity
+NGRAM = 3
+
+# Grams in more postings than this are too common to block on (O(1) work per gram at any catalog size)
+MAX_POSTING = 500
+
+# Candidates scored per item (highest shared-gram counts)
+TOP_CANDIDATES = 20
+
+# Trigram Jaccard: merged at/above MATCH_THRESHOLD, listed for review at/above REVIEW_THRESHOLD
+MATCH_THRESHOLD = 0.85
+REVIEW_THRESHOLD = 0.5
+
+# Pairs at/above this similarity always share an indexed gram (prefix filtering); lower = more recall, more work
+BLOCKING_SIMILARITY = 0.7
+
+# Variant words: items only match if these agree ("Regular" is the default size)
+VARIANT_WORDS = {"large", "small", "medium", "double", "single", "triple"}
+DEFAULT_VARIANT_WORDS = {"regular"}
+PIECES_RE = re.compile(r'^\d+pc$')
+
+# Never change: canonical product IDs are derived from it
+PRODUCT_NAMESPACE = uuid.UUID("5b8e3f0c-6a1d-4c52-9a7e-2f4d1c0b9e63")
@@ -0,0 +1,211 @@
+"""
+Cross-source item matching: assigns canonical product IDs to (source, item_id) pairs.
+Blocks candidates with a character n-gram inverted index over each item's rarest grams (prefix filtering),
+so each item is compared to O(TOP_CANDIDATES) others instead of all n: sub-quadratic at hundreds of
+thousands of SKUs.
+Accepted pairs (mutual best per source, above threshold) are clustered with union-find.
+"""
+
+import math
+import uuid
+from collections import Counter, defaultdict
+from typing import NamedTuple
+try:
+    from ..normalize import normalize_item_name
+except ImportError:  # Imported as top-level `match` by the catalog scripts
+    from normalize import normalize_item_name
+from .config import (
+    NGRAM, MAX_POSTING, TOP_CANDIDATES, MATCH_THRESHOLD, REVIEW_THRESHOLD, BLOCKING_SIMILARITY,
+    VARIANT_WORDS, DEFAULT_VARIANT_WORDS, PIECES_RE, PRODUCT_NAMESPACE
+)
+
+
+class Record(NamedTuple):
+    source: str
+    item_id: str
+    name: str
+    base: str        # Name without variant words, lowercased
+    variant: tuple   # Sorted variant words ("large", "12pc", ...)
+
+
+def make_record(source: str, item_id: str, name: str) -> Record:
+    """Splits a normalized name into base name and variant words."""
+    words = normalize_item_name(name).lower().split()
+    variant = tuple(sorted(w for w in words if w in VARIANT_WORDS or PIECES_RE.match(w)))
+    base = " ".join(w for w in words if w not in VARIANT_WORDS and w not in DEFAULT_VARIANT_WORDS and not PIECES_RE.match(w))
+    return Record(source, item_id, normalize_item_name(name), base, variant)
+
+
+def catalog_records(catalog: dict) -> list[Record]:
+    """Records for a {source: {item_id: {name, category}}} catalog (skips "_comment" entries)."""
+    return [
+        make_record(source, item_id, info.get("name", ""))
+        for source, items in catalog.items()
+        for item_id, info in items.items() if isinstance(info, dict)
+    ]
+
+
+def ngrams(text: str, n: int = NGRAM) -> set:
+    """Character n-grams of the padded text: " classic burger " -> {" cl", "cla", ...}."""
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+def jaccard(a: set, b: set) -> float:
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if a or b else 1.0
+
+
+class NGramIndex:
+    """
+    Inverted index gram -> record positions over each record's prefix: its rarest grams, just enough
+    that any pair with Jaccard >= min_similarity shares one (prefix filtering). Rare grams have short
+    postings, and grams past MAX_POSTING are dropped as stop-grams.
+    """
+
+    def __init__(self, grams: list[set], min_similarity: float = BLOCKING_SIMILARITY, max_posting: int = MAX_POSTING):
+        frequency = Counter(g for gram_set in grams for g in gram_set)
+        self.min_similarity = min_similarity
+        self.prefixes = [self._prefix(gram_set, frequency) for gram_set in grams]
+        postings = defaultdict(list)
+        for i, prefix in enumerate(self.prefixes):
+            for gram in prefix:
+                postings[gram].append(i)
+        self.postings = {g: ids for g, ids in postings.items() if len(ids) <= max_posting}
+        self.stop_grams = len(postings) - len(self.postings)
+
+    def _prefix(self, gram_set: set, frequency: Counter) -> list:
+        size = len(gram_set) - math.ceil(self.min_similarity * len(gram_set)) + 1
+        return sorted(gram_set, key=lambda g: (frequency[g], g))[:size]
+
+    def candidates(self, i: int, limit: int = TOP_CANDIDATES) -> list[int]:
+        """Positions sharing the most prefix grams with record i (best first)."""
+        shared = Counter()
+        for gram in self.prefixes[i]:
+            shared.update(self.postings.get(gram, ()))
+        del shared[i]
+        return [j for j, _ in shared.most_common(limit)]  # Ties in insertion order: deterministic
+
+
+class UnionFind:
+    """Disjoint sets with path halving and union by size: near O(1) amortized per operation."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+
+def canonical_id(name: str) -> str:
+    """Stable product ID: UUIDv5 of the canonical name under PRODUCT_NAMESPACE."""
+    return str(uuid.uuid5(PRODUCT_NAMESPACE, name.casefold()))
+
+
+def _best_per_source(records: list, grams: list, index: NGramIndex, exact: dict) -> tuple[list, int]:
+    """For each record: {other source: (score, position)} of its best candidate. Returns (best, comparisons)."""
+    best, comparisons = [], 0
+    for i, record in enumerate(records):
+        by_source = {}
+        candidates = set(index.candidates(i)) | set(exact[(record.base, record.variant)])
+        for j in candidates:
+            other = records[j]
+            if other.source == record.source or other.variant != record.variant:
+                continue
+            comparisons += 1
+            score = 1.0 if other.base == record.base else jaccard(grams[i], grams[j])
+            if score > by_source.get(other.source, (-1.0, 0))[0] or (
+                    score == by_source[other.source][0] and j < by_source[other.source][1]):
+                by_source[other.source] = (score, j)
+        best.append(by_source)
+    return best, comparisons
+
+
+def match_items(records: list[Record]) -> tuple[dict, dict]:
+    """
+    Clusters records into products.
+    Returns (items, report): items maps (source, item_id) -> canonical product ID; the report has
+    stats, products (members, confidence = lowest merged score, conflict flag) and review pairs.
+    """
+    grams = [ngrams(r.base) for r in records]
+    index = NGramIndex(grams)
+    exact = defaultdict(list)  # Identical names always meet, even if all their grams are stop-grams
+    for i, r in enumerate(records):
+        exact[(r.base, r.variant)].append(i)
+
+    best, comparisons = _best_per_source(records, grams, index, exact)
+
+    clusters = UnionFind(len(records))
+    edge_scores, review = defaultdict(list), []
+    for i, by_source in enumerate(best):
+        for source, (score, j) in by_source.items():
+            mutual = best[j].get(records[i].source, (None, None))[1] == i
+            if score >= MATCH_THRESHOLD and mutual:
+                if i < j:
+                    clusters.union(i, j)
+                    edge_scores[(i, j)].append(score)
+            elif score >= REVIEW_THRESHOLD and (i < j or not mutual):
+                review.append((score, i, j))
+
+    members = defaultdict(list)
+    for i in range(len(records)):
+        members[clusters.find(i)].append(i)
+    confidence = defaultdict(lambda: 1.0)
+    for (i, _), scores in edge_scores.items():
+        root = clusters.find(i)
+        confidence[root] = min(confidence[root], *scores)
+
+    items, products = {}, {}
+    for root, positions in members.items():
+        names = Counter(records[i].name for i in positions)
+        name = min(names, key=lambda n: (-names[n], len(n), n))  # Most common, then shortest
+        product_id = canonical_id(name)
+        sources = Counter(records[i].source for i in positions)
+        # Clusters with the same canonical name are one product (e.g. several Square variations)
+        product = products.setdefault(product_id, {"name": name, "members": [], "confidence": 1.0, "conflict": False})
+        product["members"].extend([records[i].source, records[i].item_id] for i in positions)
+        product["confidence"] = round(min(product["confidence"], confidence[root]), 3)
+        product["conflict"] |= any(n > 1 for n in sources.values())  # Matching chained same-source items: check by hand
+        for i in positions:
+            items[(records[i].source, records[i].item_id)] = product_id
+
+    for product in products.values():
+        if len(product["members"]) == 1:
+            product["confidence"] = None  # Unmatched
+
+    seen, review_pairs = set(), []
+    key = lambda i: (records[i].source, records[i].item_id)
+    for score, i, j in sorted(review, key=lambda x: -x[0]):
+        pair = tuple(sorted((i, j)))
+        if pair in seen or items[key(i)] == items[key(j)]:
+            continue
+        seen.add(pair)
+        review_pairs.append({"score": round(score, 3), "a": list(records[i][:3]), "b": list(records[j][:3])})
+
+    report = {
+        "stats": {
+            "items": len(records),
+            "products": len(products),
+            "matched_products": sum(1 for p in products.values() if p["confidence"] is not None),
+            "conflicts": sum(1 for p in products.values() if p["conflict"]),
+            "review_pairs": len(review_pairs),
+            "comparisons": comparisons,
+            "stop_grams": index.stop_grams,
+        },
+        "products": products,
+        "review": review_pairs,
+    }
+    return items, report
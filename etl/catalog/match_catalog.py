@@ -0,0 +1,51 @@
+"""
+Matches catalog items across sources and assigns canonical product IDs.
+Writes item_matches.json: {source: {item_id: product_id}}, products with confidence, and pairs to review.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Allow running as script
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).parent))
+
+from match import match_items, catalog_records
+
+CATALOG_PATH = Path(__file__).parent / "item_catalog.json"
+OUTPUT_PATH = Path(__file__).parent / "item_matches.json"
+
+
+def match_catalog(catalog_path: Path = CATALOG_PATH, output_path: Path = OUTPUT_PATH) -> dict:
+    """Runs matching over a catalog file and writes the mapping + confidence report."""
+    with open(catalog_path, encoding="utf-8") as f:
+        catalog = json.load(f)
+    
+    start = time.perf_counter()
+    items, report = match_items(catalog_records(catalog))
+    elapsed = time.perf_counter() - start
+    
+    mapping = {}
+    for (source, item_id), product_id in items.items():
+        mapping.setdefault(source, {})[item_id] = product_id
+    
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"items": mapping, **report}, f, indent=2, ensure_ascii=False)
+    
+    # Summary
+    stats = report["stats"]
+    print(f"Matches saved: {output_path.name} ({elapsed:.2f}s)")
+    print(f"  Items: {stats['items']} | Products: {stats['products']} | Matched across sources: {stats['matched_products']}")
+    print(f"  Review: {stats['review_pairs']} pairs | Conflicts: {stats['conflicts']} | Comparisons: {stats['comparisons']}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Match catalog items across sources.")
+    parser.add_argument("--catalog", type=Path, default=CATALOG_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args()
+    match_catalog(args.catalog, args.output)
@@ -1,5 +1,5 @@
 """Normalization functions for item catalog."""
 
-from .core import normalize_item_name, normalize_category_name, square_variation_suffix
+from .core import normalize_item_name, normalize_many, normalize_category_name, square_variation_suffix
 
-__all__ = ["normalize_item_name", "normalize_category_name", "square_variation_suffix"]
+__all__ = ["normalize_item_name", "normalize_many", "normalize_category_name", "square_variation_suffix"]
@@ -35,3 +35,22 @@ TYPO_PATTERNS = [(re.compile(r'\b' + re.escape(k) + r'\b'), v)
 ABBREV_PATTERNS = [(re.compile(r'\b' + re.escape(k) + r'\b', re.IGNORECASE), v)
                    for k, v in sorted(ABBREVIATIONS.items(), key=lambda x: -len(x[0]))]
 
+
+# Typos and abbreviations in one alternation (single scan); group number -> replacement.
+# Longest first within each table, typos case-sensitive, abbreviations case-insensitive.
+# "12pcs" -> "12pc" rides along: its matches never overlap a whole-word typo/abbreviation.
+_WORD_TABLES = [
+    ("", sorted(NAME_TYPOS.items(), key=lambda x: -len(x[0]))),
+    ("i", sorted(ABBREVIATIONS.items(), key=lambda x: -len(x[0]))),
+]
+WORD_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(
+        f'(?{flags}:({re.escape(k)}))' if flags else f'({re.escape(k)})'
+        for flags, table in _WORD_TABLES for k, _ in table
+    ) + r')\b|(?i:(\d+)pcs\b)'
+)
+WORD_REPLACEMENTS = [None] + [v for _, table in _WORD_TABLES for _, v in table]  # Indexed by group number
+PCS_GROUP = len(WORD_REPLACEMENTS)
+
+# Distinct names memoized by normalize_item_name
+NORMALIZE_CACHE_SIZE = 65536
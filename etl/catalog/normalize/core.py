@@ -1,18 +1,104 @@
 """
 Normalization functions for item names and categories.
 Uses pre-compiled regex patterns from config for O(1) matching efficiency.
+Item names go through one combined typo/abbreviation scan and an LRU memo (source names repeat heavily).
 """
 
+from functools import lru_cache
+from typing import Iterable
 from .config import (
     TYPO_PATTERNS, ABBREV_PATTERNS, CATEGORY_FIXES, LOWERCASE_WORDS,
-    EMOJI_RE, SPACES_RE, AMPERSAND_RE, HYPHEN_RE, PCS_RE, NUM_LETTERS_RE, PIECE_RE
+    EMOJI_RE, SPACES_RE, AMPERSAND_RE, HYPHEN_RE, PCS_RE, NUM_LETTERS_RE, PIECE_RE,
+    WORD_PATTERN, WORD_REPLACEMENTS, PCS_GROUP, NORMALIZE_CACHE_SIZE
 )
 
 
+def _replace_word(match) -> str:
+    """Replacement for the alternative that matched: O(1) by group number."""
+    if match.lastindex == PCS_GROUP:
+        return match[PCS_GROUP] + "pc"
+    return WORD_REPLACEMENTS[match.lastindex]
+
+
+def _capitalize(words: list) -> str:
+    result = []
+    for i, word in enumerate(words):
+        if word.isupper() and len(word) > 1:
+            result.append(word)  # Keep acronyms (BBQ)
+        elif match := NUM_LETTERS_RE.match(word):
+            result.append(match[1] + match[2].lower())  # "12PC" -> "12pc"
+        elif word.lower() in LOWERCASE_WORDS and i > 0:
+            result.append(word.lower())  # Lowercase conjunctions (not first word)
+        else:
+            result.append(word.capitalize())
+    return ' '.join(result)
+
+
+def _known_corrections(name: str) -> str:
+    """Specific known corrections."""
+    if name.startswith("Fries ") or name == "Fries":
+        name = name.replace("Fries", "French Fries", 1)
+    
+    if "Coke" in name and "Coca Cola" not in name:
+        name = name.replace("Coke", "Coca Cola")
+        if name.startswith("Large "):
+            name = name.replace("Large ", "", 1) + " Large"
+    
+    if "Hashbrowns" in name:
+        name = name.replace("Hashbrowns", "Hash Browns")
+    
+    return name.strip()
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE, typed=True)
+def _normalize_item_name(name) -> str:
+    if not name:
+        return ""
+    
+    name = str(name).strip()
+    
+    # Normalize symbols first: typos and abbreviations are whole words, so their matches are unchanged
+    name = AMPERSAND_RE.sub(' and ', name)
+    name = HYPHEN_RE.sub(' ', name)
+    
+    # Typos, abbreviations and "12pcs" -> "12pc" in one scan
+    name = WORD_PATTERN.sub(_replace_word, name)
+    
+    # split() collapses whitespace runs like SPACES_RE
+    return _known_corrections(_capitalize(name.split()))
+
+
 def normalize_item_name(name: str) -> str:
     """
     Normalizes item name: fixes typos, expands abbreviations, standardizes formatting.
-    Uses pre-compiled patterns for O(1) regex matching.
+    Single combined regex scan; results memoized (LRU) per distinct name.
+    """
+    try:
+        return _normalize_item_name(name)
+    except TypeError:  # Unhashable input: normalize without the memo
+        return _normalize_item_name.__wrapped__(name)
+
+
+def normalize_many(names: Iterable) -> list:
+    """Normalizes a batch of names; each distinct name is normalized once."""
+    memo = {}
+    result = []
+    for name in names:
+        key = (type(name), name)
+        try:
+            value = memo[key]
+        except KeyError:
+            value = memo[key] = normalize_item_name(name)
+        except TypeError:
+            value = normalize_item_name(name)
+        result.append(value)
+    return result
+
+
+def normalize_item_name_sequential(name: str) -> str:
+    """
+    Reference normalizer: one pattern at a time. normalize_item_name must match it exactly
+    (tests/test_normalize.py); kept for that check and benchmarks/bench_normalize.py.
     """
     if not name:
         return ""
@@ -1,10 +1,17 @@
 """
 Verifies catalog items against source data for all POS systems.
-Uses hash maps for O(1) lookups during verification.
+Uses hash maps for O(1) lookups during verification; sources are checked concurrently on a thread pool.
+Prints failures only (--verbose for every item), optionally writes a JSON or CSV report, and exits
+non-zero when any check fails, so it can gate a catalog build.
+
+Usage: python etl/catalog/scripts/verify_all_items.py [--report verify.json|verify.csv] [--verbose]
 """
 
+import argparse
+import csv
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 if sys.platform == "win32":
@@ -15,30 +22,51 @@ SCRIPT_DIR = Path(__file__).parent
 CATALOG_DIR = SCRIPT_DIR.parent
 PROJECT_ROOT = CATALOG_DIR.parent.parent
 sys.path.insert(0, str(CATALOG_DIR))
+sys.path.insert(0, str(PROJECT_ROOT))
 
 from extract import extract_doordash, extract_square, extract_toast
 from normalize import normalize_category_name
+from etl.sources import load_json
 
 # Data paths
 DATA_DIR = PROJECT_ROOT / "etl" / "data" / "sources"
 CATALOG_PATH = CATALOG_DIR / "item_catalog.json"
 
+# Failure kinds, in report order
+KINDS = ("error", "category", "missing")
+
+
+def _doordash(data_dir: Path) -> tuple:
+    names, cats = extract_doordash(data_dir / "doordash_orders.json")
+    return names, cats, None
+
+
+def _square(data_dir: Path) -> tuple:
+    # Square entries are checked against variations used in orders
+    names, cats, _, in_orders = extract_square(data_dir / "square" / "catalog.json", data_dir / "square" / "orders.json")
+    return names, cats, in_orders
+
+
+def _toast(data_dir: Path) -> tuple:
+    names, cats = extract_toast(data_dir / "toast_pos_export.json")
+    return names, cats, None
+
 
-def verify_source(name: str, catalog_items: dict, source_items: dict, source_cats: dict, valid_ids: set = None):
+# source -> loader returning (item_names, item_categories, valid_ids or None)
+SOURCES = {"doordash": _doordash, "square": _square, "toast": _toast}
+
+
+def verify_source(catalog_items: dict, source_items: dict, source_cats: dict, valid_ids: set = None) -> dict:
     """
-    Verifies catalog entries against source data.
-    Uses set intersection for O(n) verification instead of nested loops O(n²).
-    Returns tuple of (errors, category_errors, missing).
+    Verifies catalog entries against source data in one pass over each side: O(n + m).
+    Returns {"checked", "errors": [(id, msg)], "category_errors": [(id, orig, cat)], "missing": [(id, name)], "ok": [...]}.
     """
-    errors, cat_errors, missing = [], [], []
-    
+    errors, cat_errors, missing, ok = [], [], [], []
+
     # Use valid_ids filter if provided (for Square orders filter)
-    check_ids = valid_ids if valid_ids else set(source_items.keys())
-    
+    check_ids = valid_ids if valid_ids else source_items.keys()
+
     for item_id, catalog_entry in catalog_items.items():
-        cat_name = catalog_entry.get("name", "")
-        cat_category = catalog_entry.get("category", "")
-        
         # Check if item exists in source
         if valid_ids and item_id not in valid_ids:
             errors.append((item_id, "NOT FOUND in orders"))
@@ -46,96 +74,97 @@ def verify_source(name: str, catalog_items: dict, source_items: dict, source_cat
         if item_id not in source_items:
             errors.append((item_id, "NOT FOUND in source"))
             continue
-        
-        original = source_items[item_id]
-        status = f"[OK] {item_id}: '{original}' -> '{cat_name}'"
-        
+
         # Verify category
-        if cat_category:
-            orig_cat = source_cats.get(item_id, "")
-            norm_cat = normalize_category_name(orig_cat)
-            if norm_cat != cat_category:
-                cat_errors.append((item_id, orig_cat, cat_category))
-                print(f"{status} | [CAT ERROR] '{orig_cat}' -> '{cat_category}'")
-            else:
-                print(f"{status} | [CAT OK] '{orig_cat}' -> '{cat_category}'")
+        cat_category = catalog_entry.get("category", "")
+        orig_cat = source_cats.get(item_id, "")
+        if cat_category and normalize_category_name(orig_cat) != cat_category:
+            cat_errors.append((item_id, orig_cat, cat_category))
         else:
-            print(status)
-    
+            ok.append((item_id, source_items[item_id], catalog_entry.get("name", "")))
+
     # Find items in source but not in catalog
-    for item_id in check_ids:
-        if item_id not in catalog_items:
-            missing.append((item_id, source_items.get(item_id, "UNKNOWN")))
-    
-    return errors, cat_errors, missing
-
-
-def print_results(errors: list, cat_errors: list, missing: list):
-    """Prints verification results."""
-if errors:
-    print("\nERRORS:")
-        for item_id, msg in errors:
-            print(f"  [ERROR] {item_id}: {msg}")
-    if cat_errors:
-    print("\nCATEGORY ERRORS:")
-        for item_id, orig, cat in cat_errors:
-            print(f"  [CAT ERROR] {item_id}: '{orig}' != catalog '{cat}'")
-if missing:
-    print("\nMISSING IN CATALOG:")
-        for item_id, name in missing:
-            print(f"  [MISSING] {item_id}: '{name}'")
-
-
-def main():
-    # Load catalog (hash map for O(1) lookups)
-    with open(CATALOG_PATH, encoding="utf-8") as f:
-        catalog = json.load(f)
-    
-    results = {}  # Accumulate results for summary
-    
-    # DoorDash
-    print("=" * 80 + "\nVERIFYING DOORDASH\n" + "=" * 80)
-    dd_items, dd_cats = extract_doordash(DATA_DIR / "doordash_orders.json")
-    dd_catalog = {k: v for k, v in catalog["doordash"].items() if k != "_comment"}
-    results["doordash"] = verify_source("doordash", dd_catalog, dd_items, dd_cats)
-    print_results(*results["doordash"])
-    
-    # Square (filter by items in orders)
-    print("\n" + "=" * 80 + "\nVERIFYING SQUARE\n" + "=" * 80)
-    sq_names, _, sq_cats, sq_in_orders = extract_square(
-        DATA_DIR / "square" / "catalog.json",
-        DATA_DIR / "square" / "orders.json"
-    )
-    sq_catalog = {k: v for k, v in catalog["square"].items() if k != "_comment"}
-    results["square"] = verify_source("square", sq_catalog, sq_names, sq_cats, sq_in_orders)
-    print_results(*results["square"])
-    
-    # Toast
-    print("\n" + "=" * 80 + "\nVERIFYING TOAST\n" + "=" * 80)
-    toast_items, toast_cats = extract_toast(DATA_DIR / "toast_pos_export.json")
-    toast_catalog = {k: v for k, v in catalog["toast"].items() if k != "_comment"}
-    results["toast"] = verify_source("toast", toast_catalog, toast_items, toast_cats)
-    print_results(*results["toast"])
-    
-    # Summary
-    print("\n" + "=" * 80 + "\nSUMMARY\n" + "=" * 80)
-    total_items = sum(len(catalog[s]) - 1 for s in ["doordash", "square", "toast"])
-    total_errors = sum(len(r[0]) for r in results.values())
-    total_cat_errors = sum(len(r[1]) for r in results.values())
-    total_missing = sum(len(r[2]) for r in results.values())
-    
-    print(f"Total items in catalog: {total_items}")
-print(f"Total errors (IDs not found): {total_errors}")
-    print(f"Total category errors: {total_cat_errors}")
-print(f"Total missing (IDs in data but not in catalog): {total_missing}")
-
-    if total_errors == 0 and total_missing == 0 and total_cat_errors == 0:
-    print("\n[SUCCESS] ALL IDs AND CATEGORIES ARE CORRECT AND COMPLETE!")
-elif total_errors == 0 and total_missing == 0:
-    print("\n[WARNING] IDs CORRECT, BUT THERE ARE CATEGORY ERRORS")
-else:
-    print("\n[WARNING] THERE ARE ISSUES TO FIX")
+    missing = [(item_id, source_items.get(item_id, "UNKNOWN")) for item_id in check_ids if item_id not in catalog_items]
+
+    return {"checked": len(catalog_items), "errors": errors, "category_errors": cat_errors, "missing": missing, "ok": ok}
+
+
+def verify_catalog(catalog: dict, data_dir: Path = DATA_DIR, workers: int = len(SOURCES)) -> dict:
+    """Verifies every source concurrently. Returns {source: verify_source result}."""
+    def run(source: str) -> dict:
+        names, cats, valid_ids = SOURCES[source](data_dir)
+        items = {k: v for k, v in catalog.get(source, {}).items() if isinstance(v, dict)}  # Skip "_comment"
+        return verify_source(items, names, cats, valid_ids)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(zip(SOURCES, pool.map(run, SOURCES)))
+
+
+def failures(results: dict) -> list[dict]:
+    """Flat failure rows: {source, kind, item_id, detail}."""
+    rows = []
+    for source, r in results.items():
+        rows += [{"source": source, "kind": "error", "item_id": i, "detail": msg} for i, msg in r["errors"]]
+        rows += [{"source": source, "kind": "category", "item_id": i, "detail": f"'{orig}' != catalog '{cat}'"}
+                 for i, orig, cat in r["category_errors"]]
+        rows += [{"source": source, "kind": "missing", "item_id": i, "detail": name} for i, name in r["missing"]]
+    return rows
+
+
+def summary(results: dict) -> dict:
+    totals = {kind: 0 for kind in KINDS}
+    for row in failures(results):
+        totals[row["kind"]] += 1
+    return {"checked": sum(r["checked"] for r in results.values()), **totals, "passed": not any(totals.values())}
+
+
+def write_report(results: dict, path: Path) -> Path:
+    """JSON (summary, per-source counts, failures) or CSV (one row per failure), by file suffix."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = failures(results)
+    if path.suffix.lower() == ".csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["source", "kind", "item_id", "detail"])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        report = {
+            "summary": summary(results),
+            "sources": {s: {"checked": r["checked"], "errors": len(r["errors"]), "category_errors": len(r["category_errors"]),
+                            "missing": len(r["missing"])} for s, r in results.items()},
+            "failures": rows,
+        }
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def print_results(results: dict, verbose: bool = False) -> None:
+    """Prints failures (and with `verbose`, every passing item), then a one-line summary."""
+    lines = []
+    if verbose:
+        lines += [f"[OK] {s} {i}: '{orig}' -> '{name}'" for s, r in results.items() for i, orig, name in r["ok"]]
+    labels = {"error": "ERROR", "category": "CAT ERROR", "missing": "MISSING"}
+    lines += [f"[{labels[row['kind']]}] {row['source']} {row['item_id']}: {row['detail']}" for row in failures(results)]
+    totals = summary(results)
+    lines.append(f"{'[SUCCESS]' if totals['passed'] else '[FAILED]'} {totals['checked']} items checked | "
+                 f"errors: {totals['error']} | category errors: {totals['category']} | missing: {totals['missing']}")
+    print("\n".join(lines))  # One write: console I/O stays off the hot path
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify item_catalog.json against the source exports.")
+    parser.add_argument("--catalog", type=Path, default=CATALOG_PATH, help="Catalog to verify")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="Source exports directory")
+    parser.add_argument("--report", type=Path, help="Write a .json or .csv report")
+    parser.add_argument("--verbose", action="store_true", help="Also print passing items")
+    args = parser.parse_args(argv)
+
+    results = verify_catalog(load_json(args.catalog), args.data_dir)
+    print_results(results, args.verbose)
+    if args.report:
+        print(f"Report: {write_report(results, args.report)}")
+    return 0 if summary(results)["passed"] else 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
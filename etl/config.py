@@ -12,6 +12,8 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
+ETL_DIR = Path(__file__).parent
+
 
 class Config:
     """Configuration class for Supabase connection."""
@@ -19,6 +21,51 @@ class Config:
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
     
+    # Direct Postgres connection (ELT mode: transformers/elt.py; ETL_DB_BACKEND=postgres)
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    
+    # Backend: "rest" (Supabase REST), "postgres" (binary COPY + merge for bulk upserts) or "sqlite" (offline)
+    DB_BACKEND: str = os.getenv("ETL_DB_BACKEND", "rest")
+    
+    # Entities buffered per raw_data batch while streaming source exports
+    EXTRACT_BATCH_SIZE: int = int(os.getenv("ETL_EXTRACT_BATCH_SIZE", "500"))
+    
+    # Rows per upsert request and upsert requests in flight at once
+    UPSERT_CHUNK_SIZE: int = int(os.getenv("ETL_UPSERT_CHUNK_SIZE", "500"))
+    UPSERT_MAX_IN_FLIGHT: int = int(os.getenv("ETL_UPSERT_MAX_IN_FLIGHT", "4"))
+    
+    # Retries of a request that failed transiently (timeout, 5xx, dropped connection); backoff doubles from the base
+    UPSERT_RETRIES: int = int(os.getenv("ETL_UPSERT_RETRIES", "4"))
+    UPSERT_RETRY_BACKOFF: float = float(os.getenv("ETL_UPSERT_RETRY_BACKOFF", "0.5"))
+    
+    # Rows per keyset-paginated read (keep <= PostgREST max-rows)
+    READ_PAGE_SIZE: int = int(os.getenv("ETL_READ_PAGE_SIZE", "1000"))
+    
+    # Primary key strategy: "lookup" (DB-generated UUIDs + lookups) or "uuid5" (derived from source IDs)
+    KEY_STRATEGY: str = os.getenv("ETL_KEY_STRATEGY", "lookup")
+    
+    # Keep location/order key lookups in a snapshot under STATE_DIR, refreshed by updated_at watermark ("0" disables)
+    LOOKUP_CACHE: bool = os.getenv("ETL_LOOKUP_CACHE", "1") != "0"
+    
+    # Keep marshal snapshots of decoded source exports under STATE_DIR ("0" disables); decoded exports stay
+    # in memory up to SOURCE_MEMO_MB of file size (least recently used evicted first)
+    SOURCE_CACHE: bool = os.getenv("ETL_SOURCE_CACHE", "1") != "0"
+    SOURCE_MEMO_MB: int = int(os.getenv("ETL_SOURCE_MEMO_MB", "64"))
+    
+    # Count request/response payload bytes in the run metrics (re-serializes every payload: off by default)
+    METRICS_BYTES: bool = os.getenv("ETL_METRICS_BYTES", "0") != "0"
+    
+    # Local run state (caches, snapshots) kept between runs
+    STATE_DIR: Path = Path(os.getenv("ETL_STATE_DIR", str(ETL_DIR / ".state")))
+    
+    # Database file of the sqlite backend
+    SQLITE_PATH: Path = Path(os.getenv("ETL_SQLITE_PATH", str(STATE_DIR / "local.db")))
+    
+    @classmethod
+    def database_id(cls) -> str:
+        """Identifies the database the pipeline writes to (keys local caches of its contents)."""
+        return f"sqlite:{cls.SQLITE_PATH.resolve()}" if cls.DB_BACKEND == "sqlite" else cls.SUPABASE_URL
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate that required configuration is present."""
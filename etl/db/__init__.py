@@ -1,6 +1,8 @@
 """Database connection module."""
 
 from .connection import db, DatabaseConnection
+from .writer import ChunkedWriter
+from .reader import iter_pages, iter_rows, iter_raw_data, iter_raw_projected
 
-__all__ = ["db", "DatabaseConnection"]
+__all__ = ["db", "DatabaseConnection", "ChunkedWriter", "iter_pages", "iter_rows", "iter_raw_data", "iter_raw_projected"]
 
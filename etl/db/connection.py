@@ -3,37 +3,65 @@ Database connection module for Supabase.
 
 Provides Supabase client for data operations.
 Tables are created manually via Supabase dashboard.
+With ETL_DB_BACKEND=postgres, bulk upserts go straight to Postgres over COPY (db/postgres.py);
+with ETL_DB_BACKEND=sqlite, a local file stands in for Supabase (db/sqlite.py).
+The client is created (and configuration validated) on first use, not at import.
 """
 
-from supabase import create_client, Client
+from pathlib import Path
 from typing import Optional
 from ..config import Config
+from ..metrics import instrument
+from .postgres import CopyLoader, PostgresClient
+from .sqlite import SQLiteClient
+
+
+def _rest(conn: "DatabaseConnection"):
+    from supabase import create_client  # Only the REST-backed backends need the Supabase SDK
+    if not (conn.url and conn.key):
+        Config.validate()
+    return create_client(conn.url, conn.key)
+
+
+# Backend name -> client factory; every client exposes table().select/upsert/update().execute() and rpc()
+BACKENDS = {
+    "rest": _rest,
+    "postgres": lambda conn: PostgresClient(_rest(conn), CopyLoader(conn.dsn)),
+    "sqlite": lambda conn: SQLiteClient(conn.path),
+}
 
 
 class DatabaseConnection:
-    """Manages Supabase client connection."""
-    
-    def __init__(self, url: Optional[str] = None, key: Optional[str] = None):
+    """Manages the database client (Supabase, Supabase + Postgres COPY, or local SQLite)."""
+
+    def __init__(self, url: Optional[str] = None, key: Optional[str] = None,
+                 backend: Optional[str] = None, dsn: Optional[str] = None, path: Optional[Path] = None):
         """
-        Initialize Supabase client.
-        
+        Initialize connection settings (no client is created yet).
+
         Args:
             url: Optional Supabase URL. If not provided, uses Config.
             key: Optional service role key. If not provided, uses Config.
+            backend: "rest", "postgres" (COPY bulk loads) or "sqlite" (offline). If not provided, uses Config.
+            dsn: Postgres connection string for the postgres backend. If not provided, uses Config.
+            path: Database file for the sqlite backend. If not provided, uses Config.
         """
-        Config.validate()
         self.url = url or Config.SUPABASE_URL
         self.key = key or Config.SUPABASE_KEY
-        self._client: Optional[Client] = None
-    
+        self.backend = backend or Config.DB_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{self.backend}' (expected one of {', '.join(BACKENDS)})")
+        self.dsn = dsn or Config.DATABASE_URL
+        self.path = path or Config.SQLITE_PATH
+        self._client = None
+
     @property
-    def client(self) -> Client:
-        """Get or create Supabase client."""
+    def client(self):
+        """Get or create the client (instrumented: every request is recorded in the run metrics)."""
         if self._client is None:
-            self._client = create_client(self.url, self.key)
+            self._client = instrument(BACKENDS[self.backend](self))
         return self._client
 
 
-# Global instance
+# Global instance (lazy: importing the pipeline needs no credentials)
 db = DatabaseConnection()
-
@@ -0,0 +1,83 @@
+"""
+Classifies errors raised by the database clients (Supabase REST, psycopg, sqlite3).
+Transient errors (timeouts, dropped connections, 5xx, serialization failures) are worth retrying;
+a missing server-side function is worth a fallback; anything else is a problem with the request or its rows.
+"""
+
+try:
+    import httpx
+except ImportError:  # Optional: only the REST backends need it
+    httpx = None
+
+try:
+    import psycopg
+except ImportError:  # Optional: only the postgres backend needs it
+    psycopg = None
+
+# SQLSTATE / PostgREST code prefixes of failures that may succeed on retry
+TRANSIENT_CODES = (
+    "08",       # connection exception
+    "40001",    # serialization_failure
+    "40P01",    # deadlock_detected
+    "53",       # insufficient resources
+    "55P03",    # lock_not_available
+    "57014",    # query_canceled (statement timeout)
+    "57P0",     # admin/crash shutdown, cannot_connect_now
+    "PGRST000", "PGRST001", "PGRST002", "PGRST003",  # PostgREST: database unreachable, pool timeout
+)
+
+# "Function does not exist": PostgREST schema cache miss, Postgres undefined_function
+MISSING_FUNCTION_CODES = {"PGRST202", "42883"}
+
+# foreign_key_violation: a row references a parent that does not exist
+FOREIGN_KEY_VIOLATION = "23503"
+
+# HTTP statuses (PostgREST reports them as the code when the body is not JSON, e.g. from a gateway)
+TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# sqlite3 result codes
+TRANSIENT_SQLITE = {"SQLITE_BUSY", "SQLITE_LOCKED"}
+
+
+class RetriesExhausted(RuntimeError):
+    """A request kept failing transiently after every retry."""
+
+
+class MissingFunction(ValueError):
+    """Raised by the local clients (sqlite, tests) for an rpc() to a function they don't implement."""
+    
+    code = "PGRST202"
+    
+    def __init__(self, fn: str):
+        super().__init__(f"Could not find the function {fn}")
+
+
+def error_code(exc: Exception):
+    """SQLSTATE, PostgREST code or HTTP status of a client error (None if it carries none)."""
+    return getattr(exc, "sqlstate", None) or getattr(exc, "code", None)
+
+
+def is_transient(exc: Exception) -> bool:
+    """True if `exc` says nothing about the request itself (retrying it may succeed)."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if httpx is not None and isinstance(exc, httpx.TransportError):
+        return True
+    if psycopg is not None and isinstance(exc, psycopg.OperationalError) and exc.sqlstate is None:
+        return True  # Connection lost or refused (no server response)
+    if getattr(exc, "sqlite_errorname", None) in TRANSIENT_SQLITE:
+        return True
+    code = error_code(exc)
+    if isinstance(code, int):
+        return code in TRANSIENT_STATUSES
+    return isinstance(code, str) and code.startswith(TRANSIENT_CODES)
+
+
+def is_missing_function(exc: Exception) -> bool:
+    """True if an rpc() failed only because the function is not installed."""
+    return error_code(exc) in MISSING_FUNCTION_CODES
+
+
+def is_foreign_key_violation(exc: Exception) -> bool:
+    """True if a write failed because a row references a missing parent row."""
+    return error_code(exc) == FOREIGN_KEY_VIOLATION or getattr(exc, "sqlite_errorname", None) == "SQLITE_CONSTRAINT_FOREIGNKEY"
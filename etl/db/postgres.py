@@ -0,0 +1,183 @@
+"""
+Direct Postgres backend (ETL_DB_BACKEND=postgres, DATABASE_URL).
+Bulk upserts into raw_data, orders and order_items skip PostgREST: rows are streamed with binary COPY
+into a temp staging table, then merged with one INSERT ... SELECT ... ON CONFLICT DO UPDATE, committed per upsert.
+Same semantics as a PostgREST upsert: conflict target on_conflict (default the primary key), every sent
+column updated on conflict, columns missing from a row written as NULL, omitted columns defaulted.
+Written rows are returned (RETURNING *) except for raw_data, whose upsert response is never read.
+Reads, updates, RPCs and other tables keep going through the REST client.
+"""
+
+import threading
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+
+try:
+    import psycopg
+    from psycopg import sql
+    from psycopg.rows import dict_row
+except ImportError:  # Optional: only the postgres backend needs it
+    psycopg = None
+
+# Tables whose upserts are loaded with COPY + merge
+COPY_TABLES = {"raw_data", "orders", "order_items"}
+
+# Upserts whose written rows nobody reads (ChunkedWriter): merged without RETURNING, documents aren't sent back
+UNRETURNED_TABLES = {"raw_data"}
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if isinstance(value, str) else value
+
+
+def _date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _uuid(value):
+    return uuid.UUID(value) if isinstance(value, str) else value
+
+
+# Postgres type -> converter from the JSON-shaped values the transformers produce (binary COPY wants Python types)
+ADAPTERS = {
+    "timestamp with time zone": _timestamp,
+    "timestamp without time zone": _timestamp,
+    "date": _date,
+    "uuid": _uuid,
+}
+
+
+def _jsonable(value):
+    """RETURNING values as PostgREST would serialize them."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class CopyLoader:
+    """COPY + merge upserts. One connection per thread (ChunkedWriter sends chunks from a pool)."""
+
+    def __init__(self, dsn: str):
+        if psycopg is None:
+            raise RuntimeError("The postgres backend needs psycopg: pip install 'psycopg[binary]'")
+        if not dsn:
+            raise ValueError("DATABASE_URL is required for ETL_DB_BACKEND=postgres")
+        self.dsn = dsn
+        self._local = threading.local()
+        self._schema = {}  # table -> ({column: type}, primary key columns)
+        self._schema_lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            # Autocommit: the catalog reads don't open a transaction, so each upsert's transaction() commits
+            conn = self._local.conn = psycopg.connect(self.dsn, autocommit=True)
+        return conn
+
+    def table_schema(self, conn, table: str) -> tuple:
+        """({column: type}, primary key columns) of `table`, read from the catalog once."""
+        with self._schema_lock:
+            if table not in self._schema:
+                types = dict(conn.execute(
+                    "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+                    "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped ORDER BY attnum", (table,)
+                ).fetchall())
+                pk = [r[0] for r in conn.execute(
+                    "SELECT a.attname FROM pg_index i JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+                    "WHERE i.indrelid = %s::regclass AND i.indisprimary", (table,)
+                ).fetchall()]
+                self._schema[table] = (types, pk)
+            return self._schema[table]
+
+    def upsert(self, table: str, records: list, on_conflict: str = None) -> list:
+        """
+        Upserts `records` in one transaction. Returns the written rows (like PostgREST's representation),
+        or [] for UNRETURNED_TABLES.
+        """
+        if not records:
+            return []
+        conn = self._connection()
+        types, pk = self.table_schema(conn, table)
+        columns = list(dict.fromkeys(column for record in records for column in record))
+        unknown = [c for c in columns if c not in types]
+        if unknown:
+            raise ValueError(f"Could not find column(s) {', '.join(unknown)} of '{table}'")
+        conflict = [c.strip() for c in on_conflict.split(",")] if on_conflict else pk
+        convert = [(c, ADAPTERS.get(types[c])) for c in columns]
+
+        stage = sql.Identifier(f"_stage_{table}")
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        updates = [c for c in columns if c not in conflict]
+        merge = sql.SQL("INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage} ON CONFLICT ({conflict}) ").format(
+            table=sql.Identifier(table), columns=column_list, stage=stage,
+            conflict=sql.SQL(", ").join(map(sql.Identifier, conflict)),
+        ) + (sql.SQL("DO UPDATE SET ") + sql.SQL(", ").join(
+            sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in updates
+        ) if updates else sql.SQL("DO NOTHING"))
+        returning = table not in UNRETURNED_TABLES
+        if returning:
+            merge += sql.SQL(" RETURNING *")
+
+        try:
+            with conn.transaction(), conn.cursor(row_factory=dict_row) as cur:
+                # Staging has the target's column types but no constraints or defaults
+                cur.execute(sql.SQL("CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA").format(
+                    stage=stage, columns=column_list, table=sql.Identifier(table)))
+                with cur.copy(sql.SQL("COPY {stage} ({columns}) FROM STDIN (FORMAT BINARY)").format(stage=stage, columns=column_list)) as copy:
+                    copy.set_types([types[c] for c in columns])
+                    for record in records:
+                        copy.write_row([
+                            adapt(record.get(c)) if adapt and record.get(c) is not None else record.get(c)
+                            for c, adapt in convert
+                        ])
+                cur.execute(merge)
+                return [{k: _jsonable(v) for k, v in row.items()} for row in cur.fetchall()] if returning else []
+        except psycopg.errors.UndefinedTable:
+            with self._schema_lock:
+                self._schema.pop(table, None)
+            raise
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+
+
+class _CopyUpsert:
+    def __init__(self, loader: CopyLoader, table: str, records: list, on_conflict: str = None):
+        self.loader, self.table, self.records, self.on_conflict = loader, table, records, on_conflict
+
+    def execute(self):
+        return SimpleNamespace(data=self.loader.upsert(self.table, self.records, self.on_conflict))
+
+
+class _CopyTable:
+    """REST query builder for one table, except upsert()."""
+
+    def __init__(self, loader: CopyLoader, table: str, rest_query):
+        self._loader, self._table, self._rest = loader, table, rest_query
+
+    def upsert(self, json, on_conflict: str = None, **kwargs) -> _CopyUpsert:
+        records = json if isinstance(json, list) else [json]
+        return _CopyUpsert(self._loader, self._table, records, on_conflict or None)
+
+    def __getattr__(self, name):
+        return getattr(self._rest, name)
+
+
+class PostgresClient:
+    """Supabase client whose upserts into COPY_TABLES go through a CopyLoader; everything else is the REST client's."""
+
+    def __init__(self, rest, loader: CopyLoader):
+        self.rest = rest
+        self.loader = loader
+
+    def table(self, name: str):
+        query = self.rest.table(name)
+        return _CopyTable(self.loader, name, query) if name in COPY_TABLES else query
+
+    def __getattr__(self, name):
+        return getattr(self.rest, name)
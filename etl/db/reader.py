@@ -0,0 +1,131 @@
+"""
+Keyset-paginated streaming reads.
+Pages through a table ordered by a unique key (WHERE key > last ORDER BY key LIMIT n): O(page) memory,
+no OFFSET rescans, and no silent truncation at PostgREST's max-rows cap.
+The next page is prefetched on a background thread while the caller processes the current one.
+raw_data reads can be projected to the JSON paths a transform declares (PostgREST data->a->b selects),
+so only those fields are serialized, sent and decoded.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+from ..config import Config
+from ..metrics import submit
+
+
+def _fetch(client, table: str, columns: str, key: str, filters: tuple, page_size: int, after) -> list:
+    query = client.table(table).select(columns)
+    for op, column, value in filters:
+        query = getattr(query, op)(column, value)
+    if after is not None:
+        query = query.gt(key, after)
+    return query.order(key).limit(page_size).execute().data
+
+
+def iter_pages(client, table: str, columns: str, key: str, filters: tuple = (),
+               page_size: Optional[int] = None, prefetch: bool = True) -> Iterator[list]:
+    """
+    Yields pages (lists of rows) of `table` ordered by unique `key`.
+    
+    Args:
+        client: Supabase client.
+        table: Table to read.
+        columns: Select list; must include `key`.
+        key: Unique, stable column used for keyset pagination.
+        filters: (op, column, value) tuples applied server-side, e.g. ("eq", "entity_type", "order").
+        page_size: Rows per request. Defaults to Config.READ_PAGE_SIZE.
+        prefetch: Fetch page n+1 while page n is being processed.
+    """
+    page_size = page_size or Config.READ_PAGE_SIZE
+    fetch = lambda after: _fetch(client, table, columns, key, tuple(filters), page_size, after)
+    
+    if not prefetch:
+        page = fetch(None)
+        while page:  # Stop on an empty page: correct even if the server caps rows below page_size
+            yield page
+            page = fetch(page[-1][key])
+        return
+    
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"read-{table}") as pool:
+        page = fetch(None)
+        while page:
+            pending = submit(pool, fetch, page[-1][key])
+            yield page
+            page = pending.result()
+
+
+def iter_rows(client, table: str, columns: str, key: str, filters: tuple = (),
+              page_size: Optional[int] = None) -> Iterator[dict]:
+    """Yields rows one by one from iter_pages."""
+    for page in iter_pages(client, table, columns, key, filters, page_size):
+        yield from page
+
+
+def iter_raw_data(client, entity_type: str, source: Optional[str] = None,
+                  columns: str = "raw_id, source_name, data", page_size: Optional[int] = None,
+                  filters: tuple = ()) -> Iterator[list]:
+    """
+    Yields pages of raw_data rows for one entity type (optionally one source), keyset on raw_id.
+    Extra `filters` may target JSON paths, e.g. ("gte", "data->>created_at", "2025-01-01").
+    """
+    filters = [("eq", "entity_type", entity_type), *filters]
+    if source:
+        filters.append(("eq", "source_name", source))
+    return iter_pages(client, "raw_data", columns, "raw_id", tuple(filters), page_size)
+
+
+def _split(path: str) -> list:
+    """"checks.0.payments.0" -> ["checks", 0, "payments", 0] (digit segments index arrays)."""
+    return [int(part) if part.isdigit() else part for part in path.split(".")]
+
+
+def json_columns(paths, column: str = "data") -> str:
+    """PostgREST select items for dotted JSON paths: "address.city" -> p0:data->address->city (jsonb: types kept)."""
+    return ", ".join(f"p{i}:{column}->" + "->".join(str(part) for part in _split(path)) for i, path in enumerate(paths))
+
+
+def merge_paths(*path_sets) -> tuple:
+    """Union of path sets without paths already covered by a shorter one ("checks" covers "checks.0.payments.0")."""
+    paths = dict.fromkeys(path for paths in path_sets for path in paths)  # Ordered, deduplicated
+    return tuple(path for path in paths if not any(path.startswith(other + ".") for other in paths))
+
+
+def _child(node, key, empty):
+    if isinstance(key, int):
+        while len(node) <= key:
+            node.append(type(empty)())
+        return node[key]
+    return node.setdefault(key, empty)
+
+
+def unflatten(row: dict, paths) -> dict:
+    """
+    Rebuilds the sparse document from projected p{i} columns. NULLs are dropped: a projection can't tell
+    null from missing, and the extractors read optional fields with .get().
+    """
+    data = {}
+    for i, path in enumerate(paths):
+        value = row.get(f"p{i}")
+        if value is None:
+            continue
+        parts = _split(path)
+        node = data
+        for part, following in zip(parts, parts[1:]):
+            node = _child(node, part, [] if isinstance(following, int) else {})
+        if isinstance(parts[-1], int):
+            _child(node, parts[-1], {})
+        node[parts[-1]] = value
+    return data
+
+
+def iter_raw_projected(client, entity_type: str, paths: dict, page_size: Optional[int] = None,
+                       filters: tuple = ()) -> Iterator[list]:
+    """
+    Pages of raw_data rows per source ({source: paths}): server-side source_name filter, and `data` rebuilt
+    from only that source's JSON paths. Sources are read one after another.
+    """
+    for source, source_paths in paths.items():
+        source_paths = tuple(source_paths)
+        columns = f"raw_id, source_name, {json_columns(source_paths)}"
+        for page in iter_raw_data(client, entity_type, source, columns, page_size, filters):
+            yield [{"raw_id": r["raw_id"], "source_name": r["source_name"], "data": unflatten(r, source_paths)} for r in page]
@@ -0,0 +1,331 @@
+"""
+Local SQLite stand-in for Supabase (ETL_DB_BACKEND=sqlite, ETL_SQLITE_PATH): the same
+table().select/eq/gt/gte/lt/order/limit/upsert/update().execute() and rpc() surface the pipeline uses,
+so extraction, transforms, profiling and benchmarks run offline on a laptop or CI box.
+JSON columns are stored as text and queried with SQLite's -> / ->> operators (PostgREST-style paths
+like data->>created_at and p0:data->checks->0 are translated). Primary keys and updated_at columns are
+filled as the Postgres defaults and touch triggers would. Needs SQLite 3.38+ (JSON operators, RETURNING).
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from etl.schemas.core import SOURCE_KEYS_SQL
+from .errors import MissingFunction
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS raw_data (
+    raw_id TEXT PRIMARY KEY, source_name TEXT NOT NULL, entity_type TEXT NOT NULL, source_entity_id TEXT NOT NULL,
+    data TEXT NOT NULL, content_hash TEXT, created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    UNIQUE (source_name, entity_type, source_entity_id)
+);
+CREATE INDEX IF NOT EXISTS idx_raw_data_source_entity_raw_id ON raw_data (source_name, entity_type, raw_id);
+
+CREATE TABLE IF NOT EXISTS locations (
+    location_id TEXT PRIMARY KEY, account_id TEXT, source_name TEXT NOT NULL, source_location_id TEXT NOT NULL,
+    name TEXT, address_line_1 TEXT, city TEXT, state TEXT, postal_code TEXT, country TEXT, timezone TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')), updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS items (
+    item_key INTEGER PRIMARY KEY, source_name TEXT NOT NULL, source_item_id TEXT NOT NULL,
+    item_name TEXT NOT NULL, category TEXT NOT NULL DEFAULT 'Unknown', updated_at TEXT,
+    UNIQUE (source_name, source_item_id)
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY, location_id TEXT REFERENCES locations, source_name TEXT NOT NULL, source_order_id TEXT NOT NULL,
+    created_at TEXT, closed_at TEXT, status TEXT, fulfillment_method TEXT,
+    subtotal INTEGER, tax_amount INTEGER, tip_amount INTEGER, total_amount INTEGER, metadata TEXT,
+    record_created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')), record_updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_orders_location_created_at ON orders (location_id, created_at);
+
+CREATE TABLE IF NOT EXISTS order_items (
+    order_item_id TEXT PRIMARY KEY, order_id TEXT REFERENCES orders, source_name TEXT NOT NULL, source_order_item_id TEXT NOT NULL,
+    item_key INTEGER REFERENCES items, quantity INTEGER, unit_price INTEGER, total_price INTEGER,
+    record_created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')), record_updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items (order_id);
+
+CREATE TABLE IF NOT EXISTS sales_daily (
+    day TEXT, location_id TEXT, source_name TEXT, fulfillment_method TEXT, status TEXT, payment_type TEXT,
+    orders INTEGER, subtotal INTEGER, tax_amount INTEGER, tip_amount INTEGER, total_amount INTEGER
+);
+CREATE TABLE IF NOT EXISTS sales_hourly (
+    hour TEXT, location_id TEXT, source_name TEXT, fulfillment_method TEXT, status TEXT, orders INTEGER, total_amount INTEGER
+);
+CREATE TABLE IF NOT EXISTS item_sales_daily (
+    day TEXT, location_id TEXT, source_name TEXT, item_key INTEGER, order_status TEXT,
+    order_lines INTEGER, quantity INTEGER, total_price INTEGER
+);
+"""
+
+# Primary keys; the ones in UUID_KEYS default to a random UUID (gen_random_uuid), items' is an integer identity
+PRIMARY_KEYS = {"raw_data": "raw_id", "locations": "location_id", "items": "item_key", "orders": "order_id",
+                "order_items": "order_item_id"}
+UUID_KEYS = {"raw_data", "locations", "orders", "order_items"}
+
+# Timestamp columns stamped on every write (the touch_updated_at trigger)
+UPDATED_AT = {"locations": "updated_at", "items": "updated_at", "orders": "record_updated_at", "order_items": "record_updated_at"}
+
+# jsonb columns (stored as JSON text)
+JSON_COLUMNS = {"data", "metadata"}
+
+# PostgREST filter method -> SQL operator
+OPERATORS = {"eq": "=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_PATH_PART = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _touch(stamp: str, columns: list, new_values: list, now: str) -> str:
+    """SET item for an updated_at column: bumped only if one of `columns` changes (the change-guarded trigger)."""
+    changed = " OR ".join(f"{_identifier(c)} IS NOT {v}" for c, v in zip(columns, new_values))
+    return f"{_identifier(stamp)} = CASE WHEN {changed} THEN {now} ELSE {_identifier(stamp)} END"
+
+
+def _identifier(name: str) -> str:
+    if not _IDENTIFIER.fullmatch(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return f'"{name}"'
+
+
+def column_sql(expr: str) -> tuple:
+    """
+    (SQL, decode_json) for a PostgREST column expression: col, data->a->0 (JSON) or data->a->>b (text).
+    """
+    expr = expr.strip()
+    if "->" not in expr:
+        return _identifier(expr), expr in JSON_COLUMNS
+    as_text = "->>" in expr
+    root, *parts = expr.replace("->>", "->").split("->")
+    if not parts or not all(_PATH_PART.fullmatch(p) for p in parts):
+        raise ValueError(f"Invalid JSON path: {expr!r}")
+    path = "$" + "".join(f"[{p}]" if p.isdigit() else f".{p}" for p in parts)
+    return f"{_identifier(root)} {'->>' if as_text else '->'} '{path}'", not as_text
+
+
+def _decode(row: sqlite3.Row, json_columns: set) -> dict:
+    return {k: json.loads(row[k]) if k in json_columns and row[k] is not None else row[k] for k in row.keys()}
+
+
+class SQLiteClient:
+    """One connection shared by the writer threads (serialized by a lock); tables created on open."""
+
+    def __init__(self, path=":memory:"):
+        if sqlite3.sqlite_version_info < (3, 38):
+            raise RuntimeError(f"The sqlite backend needs SQLite 3.38+ (found {sqlite3.sqlite_version})")
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.execute("PRAGMA foreign_keys = ON")  # References are enforced, as in Postgres
+            self.conn.executescript(SCHEMA_SQL)
+            self.conn.executescript(SOURCE_KEYS_SQL)  # Natural keys: on_conflict targets by source ID
+
+    def table(self, name: str) -> "_Query":
+        if name not in PRIMARY_KEYS and name not in ("sales_daily", "sales_hourly", "item_sales_daily"):
+            raise ValueError(f"Could not find the table '{name}'")
+        return _Query(self, name)
+
+    def rpc(self, fn: str, params: dict = None) -> SimpleNamespace:
+        if fn not in RPCS:
+            raise MissingFunction(fn)
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=RPCS[fn](self, params or {})))
+
+    def run(self, sql: str, params=(), json_columns: set = frozenset()) -> list:
+        """Executes one statement in a transaction; returns decoded rows."""
+        with self.lock, self.conn:
+            return [_decode(row, json_columns) for row in self.conn.execute(sql, params).fetchall()]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class _Query:
+    def __init__(self, client: SQLiteClient, name: str):
+        self.client, self.name = client, name
+        self.op, self.payload, self.on_conflict = "select", None, None
+        self.columns, self.filters, self.key, self.n = "*", [], None, None
+
+    def select(self, columns: str = "*"):
+        self.columns = columns
+        return self
+
+    def _filter(self, op: str, column: str, value):
+        self.filters.append((op, column, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter("eq", column, value)
+
+    def gt(self, column, value):
+        return self._filter("gt", column, value)
+
+    def gte(self, column, value):
+        return self._filter("gte", column, value)
+
+    def lt(self, column, value):
+        return self._filter("lt", column, value)
+
+    def lte(self, column, value):
+        return self._filter("lte", column, value)
+
+    def order(self, column: str):
+        self.key = column
+        return self
+
+    def limit(self, n: int):
+        self.n = n
+        return self
+
+    def upsert(self, json, on_conflict: str = None, **kwargs):
+        self.op, self.payload, self.on_conflict = "upsert", json if isinstance(json, list) else [json], on_conflict
+        return self
+
+    def update(self, json: dict):
+        self.op, self.payload = "update", json
+        return self
+
+    def _where(self) -> tuple:
+        if not self.filters:
+            return "", []
+        clauses = [f"{column_sql(column)[0]} {OPERATORS[op]} ?" for op, column, _ in self.filters]
+        return " WHERE " + " AND ".join(clauses), [value for _, _, value in self.filters]
+
+    def _encode(self, column: str, value):
+        return json.dumps(value) if column in JSON_COLUMNS and value is not None else value
+
+    def execute(self) -> SimpleNamespace:
+        return SimpleNamespace(data={"select": self._select, "upsert": self._upsert, "update": self._update}[self.op]())
+
+    def _select(self) -> list:
+        items, decode = [], set()
+        for item in self.columns.split(","):
+            alias, _, expr = item.strip().rpartition(":") if ":" in item else ("", "", item.strip())
+            if expr == "*":
+                items.append("*")
+                decode |= JSON_COLUMNS
+                continue
+            sql, is_json = column_sql(expr)
+            name = alias or expr.strip()
+            items.append(f'{sql} AS "{name}"')
+            if is_json:
+                decode.add(name)
+        where, params = self._where()
+        query = f"SELECT {', '.join(items)} FROM {_identifier(self.name)}{where}"
+        if self.key:
+            query += f" ORDER BY {column_sql(self.key)[0]}"
+        if self.n is not None:
+            query += f" LIMIT {int(self.n)}"
+        return self.client.run(query, params, decode)
+
+    def _upsert(self) -> list:
+        """
+        INSERT ... ON CONFLICT (on_conflict or primary key) DO UPDATE SET <sent columns>: a PostgREST upsert.
+        A generated primary key is only a default: it is inserted but never overwrites the existing row's key.
+        """
+        if not self.payload:
+            return []
+        pk, stamp = PRIMARY_KEYS.get(self.name), UPDATED_AT.get(self.name)
+        now = _now()
+        generated = [self.name in UUID_KEYS and not r.get(pk) for r in self.payload]
+        records = [
+            {**r, **({pk: str(uuid.uuid4())} if gen else {}), **({stamp: now} if stamp else {})}
+            for r, gen in zip(self.payload, generated)
+        ]
+        columns = list(dict.fromkeys(c for r in records for c in r))
+        conflict = [c.strip() for c in self.on_conflict.split(",")] if self.on_conflict else [pk]
+        updates = [c for c in columns if c not in conflict]
+        statements = {gen: self._upsert_sql(columns, conflict, [c for c in updates if not (gen and c == pk)]) for gen in (False, True)}
+        with self.client.lock, self.client.conn:
+            cursor = self.client.conn.cursor()
+            written = []
+            for record, gen in zip(records, generated):
+                written += cursor.execute(statements[gen], [self._encode(c, record.get(c)) for c in columns]).fetchall()
+        return [_decode(row, JSON_COLUMNS) for row in written]
+
+    def _upsert_sql(self, columns: list, conflict: list, updates: list) -> str:
+        stamp = UPDATED_AT.get(self.name)
+        changes = [c for c in updates if c != stamp]
+        sets = [f"{_identifier(c)} = excluded.{_identifier(c)}" for c in changes]
+        if stamp in updates and changes:
+            sets.append(_touch(stamp, changes, [f"excluded.{_identifier(c)}" for c in changes], f"excluded.{_identifier(stamp)}"))
+        return (
+            f"INSERT INTO {_identifier(self.name)} ({', '.join(map(_identifier, columns))}) "
+            f"VALUES ({', '.join('?' * len(columns))}) ON CONFLICT ({', '.join(map(_identifier, conflict))}) "
+            + (f"DO UPDATE SET {', '.join(sets)}" if sets else "DO NOTHING")
+            + " RETURNING *"
+        )
+
+    def _update(self) -> list:
+        values = [self._encode(c, v) for c, v in self.payload.items()]
+        sets = [f"{_identifier(c)} = ?" for c in self.payload]
+        if self.name in UPDATED_AT and self.payload:
+            sets.append(_touch(UPDATED_AT[self.name], list(self.payload), ["?"] * len(values), "?"))
+            values += values + [_now()]
+        where, params = self._where()
+        return self.client.run(
+            f"UPDATE {_identifier(self.name)} SET {', '.join(sets)}{where} RETURNING *", values + params, JSON_COLUMNS,
+        )
+
+
+# Server-side functions (schemas/functions.py, schemas/rollups.py)
+def _bulk_update_order_metadata(client: SQLiteClient, params: dict) -> int:
+    now = _now()
+    with client.lock, client.conn:
+        cursor = client.conn.executemany(
+            f"UPDATE orders SET metadata = ?, {_touch('record_updated_at', ['metadata'], ['?'], '?')} WHERE order_id = ?",
+            [(json.dumps(u["metadata"]), json.dumps(u["metadata"]), now, u["order_id"]) for u in params["updates"]],
+        )
+        return cursor.rowcount
+
+
+def _refresh_gold_views(client: SQLiteClient, params: dict) -> dict:
+    return {}  # No materialized views locally: the core tables are queried directly
+
+
+def _refresh_sales_rollups(client: SQLiteClient, params: dict) -> dict:
+    """Rebuilds every rollup (locally a full recompute is cheap; partition refresh is the Postgres function's job)."""
+    statements = {
+        "sales_daily": """INSERT INTO sales_daily
+            SELECT date(created_at), location_id, source_name, fulfillment_method, status,
+                   COALESCE(metadata ->> '$.payment_type', ''), count(*), sum(subtotal), sum(tax_amount), sum(tip_amount), sum(total_amount)
+            FROM orders GROUP BY 1, 2, 3, 4, 5, 6""",
+        "sales_hourly": """INSERT INTO sales_hourly
+            SELECT strftime('%Y-%m-%dT%H:00:00Z', created_at), location_id, source_name, fulfillment_method, status, count(*), sum(total_amount)
+            FROM orders GROUP BY 1, 2, 3, 4, 5""",
+        "item_sales_daily": """INSERT INTO item_sales_daily
+            SELECT date(o.created_at), o.location_id, o.source_name, oi.item_key, o.status, count(*), sum(oi.quantity), sum(oi.total_price)
+            FROM orders o JOIN order_items oi ON oi.order_id = o.order_id GROUP BY 1, 2, 3, 4, 5""",
+    }
+    result = {"full": True}
+    with client.lock, client.conn:
+        result["partitions"] = client.conn.execute(
+            "SELECT count(*) FROM (SELECT DISTINCT location_id, date(created_at) FROM orders)").fetchone()[0]
+        for table, insert in statements.items():
+            client.conn.execute(f"DELETE FROM {table}")
+            result[table] = client.conn.execute(insert).rowcount
+    return result
+
+
+RPCS = {
+    "bulk_update_order_metadata": _bulk_update_order_metadata,
+    "refresh_gold_views": _refresh_gold_views,
+    "refresh_sales_rollups": _refresh_sales_rollups,
+}
@@ -0,0 +1,147 @@
+"""
+Chunked, pipelined upsert writer.
+Splits records into fixed-size chunks and keeps up to N upsert requests in flight.
+Transient failures (timeouts, 5xx, dropped connections) are retried with exponential backoff; chunks failing on
+their data are bisected so only the bad rows are rejected: O(k log n) extra requests for k bad rows.
+"""
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Iterable, Optional
+from ..config import Config
+from ..metrics import submit
+from .errors import RetriesExhausted, is_transient
+
+
+class ChunkedWriter:
+    """Upserts records into one table in chunks with bounded in-flight requests."""
+    
+    def __init__(self, client, table: str = "raw_data", chunk_size: Optional[int] = None,
+                 max_in_flight: Optional[int] = None, count_by: str = "entity_type", verbose: bool = False,
+                 label: Optional[str] = None, on_conflict: Optional[str] = None):
+        """
+        Args:
+            client: Supabase client (or anything exposing table().upsert().execute()).
+            table: Target table.
+            chunk_size: Rows per upsert request. Defaults to Config.UPSERT_CHUNK_SIZE.
+            max_in_flight: Concurrent upsert requests. Defaults to Config.UPSERT_MAX_IN_FLIGHT.
+            count_by: Record field used to tally written/rejected rows.
+            verbose: Print latency and rows/sec for every chunk.
+            label: Name shown in log lines (defaults to table); distinguishes concurrent writers.
+            on_conflict: Comma-separated conflict columns; defaults to the primary key.
+        """
+        self.client = client
+        self.table = table
+        self.chunk_size = chunk_size or Config.UPSERT_CHUNK_SIZE
+        self.max_in_flight = max_in_flight or Config.UPSERT_MAX_IN_FLIGHT
+        self.count_by = count_by
+        self.verbose = verbose
+        self.label = label or table
+        self.on_conflict = on_conflict
+        
+        self.written = Counter()
+        self.rejected = Counter()
+        self.chunk_stats = []  # (rows, seconds) per successful request
+        
+        self._buffer = []
+        self._futures = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix=f"upsert-{table}")
+        self._started = time.perf_counter()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def write(self, records: Iterable[dict]) -> None:
+        """Buffers records and dispatches every full chunk. Blocks while max_in_flight chunks are pending."""
+        self._buffer.extend(records)
+        while len(self._buffer) >= self.chunk_size:
+            chunk, self._buffer = self._buffer[:self.chunk_size], self._buffer[self.chunk_size:]
+            self._dispatch(chunk)
+    
+    def flush(self) -> None:
+        """Dispatches the partial chunk and waits for every in-flight request."""
+        if self._buffer:
+            self._dispatch(self._buffer)
+            self._buffer = []
+        wait(self._futures)
+        for future in self._futures:
+            future.result()
+        self._futures = []
+    
+    def close(self) -> Counter:
+        """Flushes, stops the worker pool and prints a throughput summary. Returns written rows per count_by value."""
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown()
+        self._print_summary()
+        return self.written
+    
+    def _dispatch(self, chunk: list) -> None:
+        self._slots.acquire()  # Bounded in-flight: backpressure on the producer
+        future = submit(self._pool, self._send, chunk)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures = [f for f in self._futures if not f.done()] + [future]
+    
+    def _send(self, chunk: list) -> None:
+        """Upserts chunk; on a data error bisects until only the failing rows remain."""
+        start = time.perf_counter()
+        try:
+            self._upsert(chunk)
+        except RetriesExhausted:
+            raise  # The database is unavailable: bisecting would only multiply the failing requests
+        except Exception as e:
+            if len(chunk) == 1:
+                with self._lock:
+                    self.rejected[chunk[0].get(self.count_by)] += 1
+                print(f"[WARNING] Rejected {self.table} row {chunk[0].get('source_entity_id', '?')}: {e}")
+                return
+            mid = len(chunk) // 2
+            self._send(chunk[:mid])
+            self._send(chunk[mid:])
+            return
+        
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.written.update(r.get(self.count_by) for r in chunk)
+            self.chunk_stats.append((len(chunk), elapsed))
+        if self.verbose:
+            print(f"  [CHUNK] {self.label}: {len(chunk)} rows in {elapsed * 1000:.0f} ms ({len(chunk) / max(elapsed, 1e-9):.0f} rows/s)")
+    
+    def _upsert(self, chunk: list) -> None:
+        """One upsert request, retried with backoff while it fails transiently; then the error is raised as is."""
+        for attempt in range(Config.UPSERT_RETRIES + 1):
+            try:
+                query = self.client.table(self.table)
+                query = query.upsert(chunk, on_conflict=self.on_conflict) if self.on_conflict else query.upsert(chunk)
+                query.execute()
+                return
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                if attempt == Config.UPSERT_RETRIES:
+                    raise RetriesExhausted(f"{self.label}: gave up after {attempt + 1} attempts: {e}") from e
+                delay = Config.UPSERT_RETRY_BACKOFF * 2 ** attempt
+                print(f"[RETRY] {self.label}: {e} (retrying in {delay:.1f}s)")
+                time.sleep(delay)
+    
+    def _print_summary(self) -> None:
+        if not self.chunk_stats and not self.rejected:
+            return
+        elapsed = time.perf_counter() - self._started
+        latencies = sorted(s for _, s in self.chunk_stats)
+        rows = sum(self.written.values())
+        p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+        print(
+            f"  [WRITER] {self.label}: {rows} rows in {len(latencies)} chunks | "
+            f"p50 {p50:.0f} ms | p95 {p95:.0f} ms | {rows / max(elapsed, 1e-9):.0f} rows/s"
+            + (f" | rejected: {sum(self.rejected.values())}" if self.rejected else "")
+        )
@@ -0,0 +1,64 @@
+"""
+Content-hash change detection for raw_data.
+Hashes each entity's canonical JSON and compares against hashes already stored per
+(source_name, entity_type, source_entity_id): O(1) hash map check per entity, only new/changed rows are sent.
+"""
+
+import hashlib
+import json
+import threading
+from collections import Counter, defaultdict
+from typing import Optional
+from etl.db.reader import iter_rows
+
+RAW_DATA_KEY = "source_name,entity_type,source_entity_id"
+
+
+def content_hash(entity: dict) -> str:
+    """Hash of canonical JSON (sorted keys, compact separators). Key order in the export doesn't matter."""
+    canonical = json.dumps(entity, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_stored_hashes(client, source: str, entity_type: str) -> dict:
+    """Build hash map: source_entity_id -> content_hash. Keyset-paginated read."""
+    filters = (("eq", "source_name", source), ("eq", "entity_type", entity_type))
+    rows = iter_rows(client, "raw_data", "source_entity_id, content_hash", "source_entity_id", filters)
+    return {r["source_entity_id"]: r["content_hash"] for r in rows}
+
+
+class ChangeTracker:
+    """Filters unchanged raw_data records, counting the skipped ones per (source, entity_type). Thread-safe."""
+
+    def __init__(self, client, known: Optional[dict] = None):
+        """
+        Args:
+            client: Supabase client used to load stored hashes lazily, once per (source, entity_type).
+            known: Optional preloaded {(source, entity_type): {source_entity_id: content_hash}}.
+        """
+        self.client = client
+        self.known = dict(known or {})
+        self.unchanged = Counter()
+        self._lock = threading.Lock()
+        self._load_locks = defaultdict(threading.Lock)  # One per key: sources load their hashes concurrently
+
+    def _hashes(self, key: tuple) -> dict:
+        with self._lock:
+            load_lock = self._load_locks[key]
+        with load_lock:
+            if key not in self.known:
+                self.known[key] = load_stored_hashes(self.client, *key)
+            return self.known[key]
+
+    def filter(self, records: list) -> list:
+        """Drops the records whose stored hash matches their content_hash (stamped here if missing)."""
+        kept = []
+        for record in records:
+            key = (record["source_name"], record["entity_type"])
+            digest = record.get("content_hash") or content_hash(record["data"])
+            if self._hashes(key).get(record["source_entity_id"]) == digest:
+                with self._lock:
+                    self.unchanged[key] += 1
+                continue
+            kept.append({**record, "content_hash": digest})
+        return kept
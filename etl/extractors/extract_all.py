@@ -1,13 +1,21 @@
 """
 Extracts all source data and loads into raw_data table.
 Uses hash map for O(1) result aggregation across sources.
+Sources share nothing, so --workers > 1 extracts them concurrently: wall time ~ slowest source.
 """
 
+import argparse
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from .extract_doordash import extract_doordash
 from .extract_square import extract_square
 from .extract_toast import extract_toast
+from .changes import ChangeTracker
+from etl.db.connection import db
+from etl.metrics import start_run, submit
 
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8')
@@ -20,20 +28,46 @@ SOURCES = [
 ]
 
 
-def extract_all(sources_dir: Path) -> dict:
-    """Extracts all source data. Returns dict with counts per source."""
+def _extract_source(name: str, path: Path, extractor) -> tuple[dict, float]:
+    """Runs one extractor. Returns (counts, seconds)."""
+    if not path.exists():
+        print(f"  [WARNING] Not found: {path}")
+        return {}, 0.0
+    start = time.perf_counter()
+    counts = extractor(path)
+    return counts, time.perf_counter() - start
+
+
+def extract_all(sources_dir: Path, workers: int = 1, incremental: bool = False, prometheus: Path = None) -> dict:
+    """
+    Extracts all source data. Returns dict with counts per source.
+    incremental=True sends only new/changed entities (content hash).
+    Writes a run report (etl.metrics) and, with `prometheus`, a Prometheus text file.
+    """
     print("=" * 60 + "\nEXTRACTING ALL SOURCE DATA\n" + "=" * 60)
     
-    results = {}
-    for i, (name, get_path, extractor) in enumerate(SOURCES, 1):
-        path = get_path(sources_dir)
-        print(f"\n[{i}/{len(SOURCES)}] {name.title()}...")
-        
-        if path.exists():
-            results[name] = extractor(path)
-        else:
-            print(f"  [WARNING] Not found: {path}")
-            results[name] = {}
+    start = time.perf_counter()
+    run = start_run("extract")
+    tracker = ChangeTracker(db.client) if incremental else None
+    jobs = []
+    for name, get_path, extractor in SOURCES:
+        if extractor is extract_square:
+            extractor = partial(extract_square, workers=workers)  # Square files in parallel too
+        jobs.append((name, get_path(sources_dir), run.wrap(name, partial(extractor, tracker=tracker))))
+    
+    if workers > 1:
+        print(f"\nExtracting {len(jobs)} sources with {workers} workers...")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = [f.result() for f in [submit(pool, _extract_source, *job) for job in jobs]]
+    else:
+        outcomes = []
+        for i, job in enumerate(jobs, 1):
+            print(f"\n[{i}/{len(jobs)}] {job[0].title()}...")
+            outcomes.append(_extract_source(*job))
+    
+    results = {name: counts for (name, _, _), (counts, _) in zip(jobs, outcomes)}
+    timings = {name: seconds for (name, _, _), (_, seconds) in zip(jobs, outcomes)}
+    wall = time.perf_counter() - start
     
     # Summary using dict comprehension for aggregation
     print("\n" + "=" * 60 + "\nEXTRACTION SUMMARY\n" + "=" * 60)
@@ -43,14 +77,25 @@ def extract_all(sources_dir: Path) -> dict:
     
     for name, counts in results.items():
         stats = " | ".join(f"{m}: {counts.get(m, 0)}" for m in metrics if m in counts)
-        print(f"  {name.upper()}: {stats}")
+        print(f"  {name.upper()}: {stats} ({timings[name]:.2f}s)")
     
     print(f"\n  TOTAL: " + " | ".join(f"{m}: {v}" for m, v in totals.items() if v))
+    print(f"  TIME: {wall:.2f}s wall | {sum(timings.values()):.2f}s summed across sources")
+    if tracker:
+        print(f"  UNCHANGED (skipped): {sum(tracker.unchanged.values())}")
+    print("\n".join(run.summary_lines()))
+    print(f"  Run report: {run.save(prometheus=prometheus)}")
     print("=" * 60)
     
     return results
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract all source data into raw_data.")
+    parser.add_argument("--workers", type=int, default=1, help="Sources/files extracted concurrently (1 = sequential)")
+    parser.add_argument("--incremental", action="store_true", help="Skip entities whose content hash is unchanged")
+    parser.add_argument("--prometheus", type=Path, metavar="PATH", help="Also write run metrics in Prometheus text format")
+    args = parser.parse_args()
+    
     sources_dir = Path(__file__).parent.parent.parent / "etl" / "data" / "sources"
-    extract_all(sources_dir)
+    extract_all(sources_dir, workers=args.workers, incremental=args.incremental, prometheus=args.prometheus)
@@ -1,50 +1,44 @@
 """
 Extracts Square data and loads into raw_data table.
-Uses batch upsert for O(n) processing with single DB round-trip per file.
+Streams each file through a chunked writer: O(chunk) memory regardless of file size.
+Files share nothing, so they can be read and uploaded in parallel.
 """
 
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from etl.db.connection import db
+from etl.db.writer import ChunkedWriter
+from etl.metrics import submit
+from .stream import stream_batches
+from .changes import ChangeTracker, RAW_DATA_KEY
 
+# File -> (top-level array, entity_type)
+FILES = {
+    "locations.json": ("locations", "location"),
+    "orders.json": ("orders", "order"),
+    "payments.json": ("payments", "payment"),
+}
 
-def _load_and_batch_upsert(client, file_path: Path, data_key: str, entity_type: str) -> int:
-    """Loads JSON and batch upserts entities. Single round-trip vs n round-trips."""
+
+def _load_and_write(file_path: Path, data_key: str, entity_type: str, tracker: ChangeTracker = None) -> int:
+    """Streams entities from one file into its own writer. Returns rows written."""
     if not file_path.exists():
         return 0
-    
-    with open(file_path, encoding="utf-8") as f:
-        data = json.load(f)
-    
-    records = [
-        {
-            "source_name": "square",
-            "entity_type": entity_type,
-            "source_entity_id": entity["id"],
-            "data": entity
-        }
-        for entity in data.get(data_key, []) if entity.get("id")
-    ]
-    
-    if not records:
-        return 0
-    
-    try:
-        client.table("raw_data").upsert(records).execute()
-        return len(records)
-    except Exception as e:
-        print(f"[WARNING] Batch upsert failed for {entity_type}: {e}")
-        return 0
+    with ChunkedWriter(db.client, label=f"raw_data[square/{file_path.name}]", on_conflict=RAW_DATA_KEY) as writer:
+        for _, records in stream_batches(file_path, "square", {data_key: (entity_type, "id")}):
+            writer.write(tracker.filter(records) if tracker else records)
+    return writer.written[entity_type]
 
 
-def extract_square(sources_dir: Path) -> dict[str, int]:
-    """Extracts Square locations, orders, and payments from JSON files into raw_data table."""
-    client = db.client
-    return {
-        "locations": _load_and_batch_upsert(client, sources_dir / "locations.json", "locations", "location"),
-        "orders": _load_and_batch_upsert(client, sources_dir / "orders.json", "orders", "order"),
-        "payments": _load_and_batch_upsert(client, sources_dir / "payments.json", "payments", "payment"),
-    }
+def extract_square(sources_dir: Path, workers: int = 1, tracker: ChangeTracker = None) -> dict[str, int]:
+    """Extracts Square locations, orders, and payments from JSON files into raw_data table. With a tracker, only new/changed entities are sent."""
+    jobs = [(sources_dir / name, data_key, entity_type, tracker) for name, (data_key, entity_type) in FILES.items()]
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            counts = [f.result() for f in [submit(pool, _load_and_write, *job) for job in jobs]]
+    else:
+        counts = [_load_and_write(*job) for job in jobs]
+    return {f"{entity_type}s": n for (_, _, entity_type, _), n in zip(jobs, counts)}
 
 
 if __name__ == "__main__":
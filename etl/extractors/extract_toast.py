@@ -1,46 +1,27 @@
 """
 Extracts Toast data and loads into raw_data table.
-Uses batch upsert for O(n) processing with single DB round-trip.
+Streams the export through a chunked writer: O(chunk) memory regardless of file size.
 """
 
-import json
 from pathlib import Path
 from etl.db.connection import db
+from etl.db.writer import ChunkedWriter
+from .stream import stream_batches
+from .changes import ChangeTracker, RAW_DATA_KEY
 
+# Top-level array -> (entity_type, id_key)
+ENTITIES = {
+    "locations": ("location", "guid"),
+    "orders": ("order", "guid"),
+}
 
-def _batch_upsert(client, entities: list, entity_type: str) -> int:
-    """Batch upserts entities into raw_data using 'guid' as ID. Single round-trip."""
-    records = [
-        {
-            "source_name": "toast",
-            "entity_type": entity_type,
-            "source_entity_id": entity["guid"],
-            "data": entity
-        }
-        for entity in entities if entity.get("guid")
-    ]
-    
-    if not records:
-        return 0
-    
-    try:
-        client.table("raw_data").upsert(records).execute()
-        return len(records)
-    except Exception as e:
-        print(f"[WARNING] Batch upsert failed for {entity_type}: {e}")
-        return 0
 
-
-def extract_toast(file_path: Path) -> dict[str, int]:
-    """Extracts Toast locations and orders from JSON into raw_data table."""
-    with open(file_path, encoding="utf-8") as f:
-        data = json.load(f)
-    
-    client = db.client
-    return {
-        "locations": _batch_upsert(client, data.get("locations", []), "location"),
-        "orders": _batch_upsert(client, data.get("orders", []), "order"),
-    }
+def extract_toast(file_path: Path, tracker: ChangeTracker = None) -> dict[str, int]:
+    """Extracts Toast locations and orders from JSON into raw_data table. With a tracker, only new/changed entities are sent."""
+    with ChunkedWriter(db.client, label="raw_data[toast]", on_conflict=RAW_DATA_KEY) as writer:
+        for _, records in stream_batches(file_path, "toast", ENTITIES):
+            writer.write(tracker.filter(records) if tracker else records)
+    return {"locations": writer.written["location"], "orders": writer.written["order"]}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""
+Incremental reader for large source exports.
+Uses ijson parse events so only one entity is held in memory at a time: O(1) memory vs O(file) for json.load.
+An export some other step already decoded in this process (etl/sources.py memo) is read from memory instead.
+"""
+
+from pathlib import Path
+from typing import Iterable, Iterator
+import ijson
+from etl.config import Config
+from etl.sources import cached
+from .changes import content_hash
+
+
+def iter_entities(file_path: Path, keys: Iterable[str]) -> Iterator[tuple[str, dict]]:
+    """
+    Yields (key, entity) for every object in the top-level `keys` arrays.
+    One C-backed ijson.items pass per key: faster than building objects from Python-level parse events.
+    """
+    data = cached(file_path)
+    if data is not None:  # Already in memory: iterating it costs nothing extra
+        for key in keys:
+            for entity in data.get(key, ()) if isinstance(data, dict) else ():
+                if isinstance(entity, dict):
+                    yield key, entity
+        return
+    for key in keys:
+        with open(file_path, "rb") as f:
+            for entity in ijson.items(f, f"{key}.item", use_float=True):
+                if isinstance(entity, dict):
+                    yield key, entity
+
+
+def stream_batches(file_path: Path, source: str, entities: dict, batch_size: int = None) -> Iterator[tuple[str, list]]:
+    """
+    Streams raw_data records in batches as they fill, each stamped with its content_hash (every write keeps
+    the stored hash in step with data, so a later incremental run compares against what is stored).
+    `entities` maps array key -> (entity_type, id_key). Yields (entity_type, records).
+    """
+    batch_size = batch_size or Config.EXTRACT_BATCH_SIZE
+    for key, (entity_type, id_key) in entities.items():
+        batch = []  # O(batch_size) memory
+        for _, entity in iter_entities(file_path, (key,)):
+            if not entity.get(id_key):
+                continue
+            batch.append({
+                "source_name": source,
+                "entity_type": entity_type,
+                "source_entity_id": entity[id_key],
+                "data": entity,
+                "content_hash": content_hash(entity),
+            })
+            if len(batch) >= batch_size:
+                yield entity_type, batch
+                batch = []
+        if batch:
+            yield entity_type, batch
@@ -0,0 +1,250 @@
+"""
+Pipeline instrumentation: per-step wall/CPU time, rows, DB round trips, peak memory and, with
+ETL_METRICS_BYTES=1, payload bytes (measured by re-serializing each payload, so off by default).
+The DB client is wrapped in a proxy that times every execute(); the active step is a ContextVar, so
+requests made from writer/reader threads are attributed to the step that submitted them (see submit()).
+Each run writes a JSON report and, optionally, a Prometheus text file.
+"""
+
+import contextvars
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+from .config import Config
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+RUNS_DIR = Config.STATE_DIR / "runs"
+
+# Builder methods whose first argument is the request payload
+WRITE_METHODS = {"insert", "upsert", "update"}
+
+_step = contextvars.ContextVar("etl_step", default="-")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process peak resident set size in MB (None where `resource` is unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)  # bytes on macOS, KB on Linux
+
+
+def _json_size(payload) -> int:
+    return len(json.dumps(payload, default=str, separators=(",", ":"))) if payload is not None else 0
+
+
+def _rows(payload) -> int:
+    if isinstance(payload, list):
+        return len(payload)
+    if isinstance(payload, dict):  # RPC params: count rows in list-valued arguments
+        return sum(len(v) for v in payload.values() if isinstance(v, list)) or 1
+    return 0
+
+
+def _empty_stats(count_bytes: bool = True) -> dict:
+    zero = 0 if count_bytes else None  # None: not measured
+    return {"wall_s": 0.0, "cpu_s": 0.0, "rows_in": 0, "rows_out": 0, "requests": 0, "errors": 0,
+            "request_s": 0.0, "bytes_sent": zero, "bytes_received": zero, "peak_rss_mb": None}
+
+
+class RunMetrics:
+    """Collects stats per step and per table for one pipeline run. Thread-safe."""
+
+    def __init__(self, name: str, count_bytes: Optional[bool] = None):
+        self.name = name
+        self.count_bytes = Config.METRICS_BYTES if count_bytes is None else count_bytes
+        self.started_at = datetime.now(timezone.utc)
+        self.steps = defaultdict(lambda: _empty_stats(self.count_bytes))
+        zero = 0 if self.count_bytes else None
+        self.tables = defaultdict(lambda: {"requests": 0, "request_s": 0.0, "bytes_sent": zero, "bytes_received": zero})
+        self._began = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, name: str):
+        """Attributes everything inside (including threads started via submit()) to `name`."""
+        token = _step.set(name)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            with self._lock:
+                stats = self.steps[name]
+                stats["wall_s"] += time.perf_counter() - wall
+                stats["cpu_s"] += time.thread_time() - cpu  # Step thread only: parsing/transform work
+                stats["peak_rss_mb"] = peak_rss_mb()      # Process high-water mark at step end
+            _step.reset(token)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """func run inside step(name)."""
+        def run(*args, **kwargs):
+            with self.step(name):
+                return func(*args, **kwargs)
+        return run
+
+    def record_request(self, table: str, method: str, seconds: float, payload, data, failed: bool = False) -> None:
+        if self.count_bytes:
+            sent, received = _json_size(payload), _json_size(data)
+        with self._lock:
+            stats = self.steps[_step.get()]
+            stats["requests"] += 1
+            stats["errors"] += failed
+            stats["request_s"] += seconds
+            if self.count_bytes:
+                stats["bytes_sent"] += sent
+                stats["bytes_received"] += received
+            if method in WRITE_METHODS or method == "rpc":
+                stats["rows_out"] += _rows(payload)
+            else:
+                stats["rows_in"] += _rows(data)
+
+            totals = self.tables[table]
+            totals["requests"] += 1
+            totals["request_s"] += seconds
+            if self.count_bytes:
+                totals["bytes_sent"] += sent
+                totals["bytes_received"] += received
+
+    def report(self) -> dict:
+        with self._lock:
+            steps = {name: {k: round(v, 4) if isinstance(v, float) else v for k, v in s.items()} for name, s in self.steps.items()}
+            tables = {name: dict(t, request_s=round(t["request_s"], 4)) for name, t in self.tables.items()}
+        return {
+            "run": self.name,
+            "started_at": self.started_at.isoformat(),
+            "wall_s": round(time.perf_counter() - self._began, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "steps": steps,
+            "tables": tables,
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition of the step stats: etl_step_<stat>{run=..., step=...}."""
+        report = self.report()
+        lines = []
+        for stat in _empty_stats():
+            metric = f"etl_step_{stat}"
+            lines.append(f"# TYPE {metric} gauge")
+            for name, stats in report["steps"].items():
+                if stats[stat] is not None:
+                    lines.append(f'{metric}{{run="{self.name}",step="{name}"}} {stats[stat]}')
+        lines.append("# TYPE etl_run_wall_s gauge")
+        lines.append(f'etl_run_wall_s{{run="{self.name}"}} {report["wall_s"]}')
+        return "\n".join(lines) + "\n"
+
+    def save(self, directory: Optional[Path] = None, prometheus: Optional[Path] = None) -> Path:
+        """Writes <run>-<timestamp>.json (and <run>-latest.json) to `directory` (RUNS_DIR); optionally a .prom file."""
+        directory = directory or RUNS_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        report = json.dumps(self.report(), indent=2)
+        path = directory / f"{self.name}-{self.started_at:%Y%m%dT%H%M%S}.json"
+        path.write_text(report, encoding="utf-8")
+        (directory / f"{self.name}-latest.json").write_text(report, encoding="utf-8")
+        if prometheus:
+            prometheus.parent.mkdir(parents=True, exist_ok=True)
+            prometheus.write_text(self.prometheus(), encoding="utf-8")
+        return path
+
+    def summary_lines(self) -> list[str]:
+        """One line per step for console summaries."""
+        lines = []
+        for name, s in self.report()["steps"].items():
+            if name == "-" and not s["requests"]:
+                continue
+            lines.append(f"  {name}: {s['wall_s']:.2f}s wall | {s['cpu_s']:.2f}s cpu | {s['requests']} requests "
+                         f"({s['request_s']:.2f}s) | rows in {s['rows_in']} / out {s['rows_out']}"
+                         + (f" | {(s['bytes_sent'] + s['bytes_received']) / 1e6:.1f} MB" if self.count_bytes else ""))
+        return lines
+
+
+_run = RunMetrics("adhoc")
+
+
+def start_run(name: str, count_bytes: Optional[bool] = None) -> RunMetrics:
+    """Starts collecting into a fresh RunMetrics; DB requests from now on are recorded there."""
+    global _run
+    _run = RunMetrics(name, count_bytes)
+    return _run
+
+
+def current_run() -> RunMetrics:
+    return _run
+
+
+def step(name: str):
+    """Sub-step of the active step ("orders/lookups") in the current run, e.g. to separate lookup builds."""
+    parent = _step.get()
+    return _run.step(name if parent == "-" else f"{parent}/{name}")
+
+
+def submit(pool, fn, *args):
+    """pool.submit that carries the caller's step attribution into the worker thread."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+class _TracedQuery:
+    """Proxies a query builder chain; times execute() and records its payload/response sizes."""
+
+    def __init__(self, query, table: str, method: str = "select", payload=None):
+        self._query = query
+        self._table = table
+        self._method = method
+        self._payload = payload
+
+    def __getattr__(self, name):
+        attr = getattr(self._query, name)
+        if name == "execute":
+            return self._execute
+        if not callable(attr):  # e.g. the `not_` property returns a builder
+            return self._wrap(attr, self._method, self._payload)
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if name in WRITE_METHODS:
+                return self._wrap(result, name, args[0] if args else kwargs.get("json"))
+            return self._wrap(result, self._method, self._payload)
+        return call
+
+    def _wrap(self, result, method: str, payload):
+        return _TracedQuery(result, self._table, method, payload) if hasattr(result, "execute") else result
+
+    def _execute(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self._query.execute(*args, **kwargs)
+        except Exception:
+            _run.record_request(self._table, self._method, time.perf_counter() - start, self._payload, None, failed=True)
+            raise
+        _run.record_request(self._table, self._method, time.perf_counter() - start, self._payload, getattr(response, "data", None))
+        return response
+
+
+class InstrumentedClient:
+    """Wraps a Supabase client: table() and rpc() return traced builders, everything else passes through."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str) -> _TracedQuery:
+        return _TracedQuery(self._client.table(name), name)
+
+    def rpc(self, fn: str, params: dict = None, *args, **kwargs) -> _TracedQuery:
+        return _TracedQuery(self._client.rpc(fn, params, *args, **kwargs), f"rpc:{fn}", "rpc", params)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def instrument(client):
+    """Wraps `client` once."""
+    return client if isinstance(client, InstrumentedClient) else InstrumentedClient(client)
@@ -74,6 +74,21 @@ class Order(BaseModel):
     record_updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+# ============================================================================
+# ITEMS (DIMENSION)
+# ============================================================================
+
+class Item(BaseModel):
+    """Item dimension - one row per catalog item, loaded from item_catalog.json."""
+    
+    item_key: int = Field(..., description="Primary key (identity); referenced by order_items")
+    source_name: str = Field(..., description="Source: doordash, square, or toast")
+    source_item_id: str = Field(..., description="Catalog item ID from source (DoorDash item_id, Square variation ID, Toast item guid)")
+    item_name: str = Field(..., description="Normalized item name from internal catalog")
+    category: str = Field(..., description="Item category")
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 # ============================================================================
 # ORDER ITEMS
 # ============================================================================
@@ -85,10 +100,39 @@ class OrderItem(BaseModel):
     order_id: UUID = Field(..., description="Foreign key to orders")
     source_name: str = Field(..., description="Source: doordash, square, or toast")
     source_order_item_id: str = Field(..., description="Original item ID from source")
-    item_name: str = Field(..., description="Normalized item name from internal catalog")
+    item_key: Optional[int] = Field(None, description="Foreign key to items (NULL if the item is not in the catalog)")
     quantity: int = Field(..., description="Quantity ordered")
     unit_price: int = Field(..., description="Unit price in cents")
     total_price: int = Field(..., description="Total price in cents")
-    category: str = Field(..., description="Item category")
     record_created_at: datetime = Field(default_factory=datetime.utcnow)
     record_updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# SQL for the items dimension: order_items keep a 4-byte item_key instead of name/category strings.
+# Upserts target (source_name, source_item_id), so keys survive catalog reloads and renames.
+
+ITEMS_DIMENSION_SQL = """
+CREATE TABLE IF NOT EXISTS items (
+    item_key integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    source_name text NOT NULL,
+    source_item_id text NOT NULL,
+    item_name text NOT NULL,
+    category text NOT NULL DEFAULT 'Unknown',
+    updated_at timestamptz NOT NULL DEFAULT now(),
+    UNIQUE (source_name, source_item_id)
+);
+
+ALTER TABLE order_items ADD COLUMN IF NOT EXISTS item_key integer REFERENCES items (item_key);
+
+CREATE INDEX IF NOT EXISTS idx_order_items_item_key ON order_items (item_key);
+"""
+
+
+# Natural-key unique indexes: the ON CONFLICT targets of the ELT engine (etl/transformers/elt.py), which
+# upserts by source ID. Creation fails if duplicates already exist; dedupe those first.
+
+SOURCE_KEYS_SQL = """
+CREATE UNIQUE INDEX IF NOT EXISTS locations_source_key ON locations (source_name, source_location_id);
+CREATE UNIQUE INDEX IF NOT EXISTS orders_source_key ON orders (source_name, source_order_id);
+CREATE UNIQUE INDEX IF NOT EXISTS order_items_source_key ON order_items (source_name, source_order_item_id);
+"""
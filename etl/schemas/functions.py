@@ -0,0 +1,120 @@
+"""
+Server-side SQL functions called by the ETL via RPC.
+
+Set-based statements replace per-row HTTP round trips.
+Functions are created via Supabase dashboard SQL editor.
+"""
+
+from .views import MATERIALIZED_VIEWS
+
+# SQL to create ETL functions in Supabase:
+
+BULK_UPDATE_ORDER_METADATA = """
+CREATE OR REPLACE FUNCTION bulk_update_order_metadata(updates jsonb)
+RETURNS integer
+LANGUAGE sql
+AS $$
+    WITH u AS (
+        SELECT (e->>'order_id')::uuid AS order_id, e->'metadata' AS metadata
+        FROM jsonb_array_elements(updates) AS e
+    ),
+    updated AS (
+        UPDATE orders o
+        SET metadata = u.metadata
+        FROM u
+        WHERE o.order_id = u.order_id
+        RETURNING 1
+    )
+    SELECT count(*)::integer FROM updated;
+$$;
+"""
+
+# Bumps the watermark columns read by the lookup cache (transformers/lookup_cache.py) on every UPDATE that
+# changes the row, so upserts that change a row (or cascaded key changes) are picked up by the next incremental
+# refresh. Re-upserting identical rows (every transform run) leaves them alone: no-op updates aren't re-read.
+# order_items' column is the watermark of the rollup refresh (schemas/rollups.py): item-only edits count as changes.
+TOUCH_UPDATED_AT = """
+CREATE OR REPLACE FUNCTION touch_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW := jsonb_populate_record(NEW, jsonb_build_object(TG_ARGV[0], now()));
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS locations_touch_updated_at ON locations;
+CREATE TRIGGER locations_touch_updated_at
+BEFORE UPDATE ON locations
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION touch_updated_at('updated_at');
+
+DROP TRIGGER IF EXISTS items_touch_updated_at ON items;
+CREATE TRIGGER items_touch_updated_at
+BEFORE UPDATE ON items
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION touch_updated_at('updated_at');
+
+DROP TRIGGER IF EXISTS orders_touch_updated_at ON orders;
+CREATE TRIGGER orders_touch_updated_at
+BEFORE UPDATE ON orders
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION touch_updated_at('record_updated_at');
+
+DROP TRIGGER IF EXISTS order_items_touch_updated_at ON order_items;
+CREATE TRIGGER order_items_touch_updated_at
+BEFORE UPDATE ON order_items
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION touch_updated_at('record_updated_at');
+
+CREATE INDEX IF NOT EXISTS idx_locations_updated_at ON locations (updated_at);
+CREATE INDEX IF NOT EXISTS idx_orders_record_updated_at ON orders (record_updated_at);
+"""
+
+# Refreshes the materialized gold views (schemas/views.py) after a transform run. CONCURRENTLY uses each
+# view's unique index: the new contents are diffed in, so dashboard queries keep reading while it runs.
+# Returns {view: seconds}. Runs under the caller's statement_timeout (see ETL_ROLE_TIMEOUT).
+REFRESH_GOLD_VIEWS = f"""
+CREATE OR REPLACE FUNCTION refresh_gold_views()
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    view_name text;
+    started timestamptz;
+    timings jsonb := '{{}}'::jsonb;
+BEGIN
+    FOREACH view_name IN ARRAY ARRAY[{", ".join(f"'{name}'" for name in MATERIALIZED_VIEWS)}] LOOP
+        started := clock_timestamp();
+        EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %I', view_name);
+        timings := timings || jsonb_build_object(
+            view_name, round(extract(epoch FROM clock_timestamp() - started)::numeric, 3)
+        );
+    END LOOP;
+    RETURN timings;
+END;
+$$;
+"""
+
+# A function's own SET statement_timeout can't lift the timeout of the statement calling it, so the refresh
+# RPCs would be cancelled by the API role's short default. PostgREST applies role settings per request:
+# raise the limit for the service role the ETL connects as (dashboard roles keep theirs).
+ETL_ROLE_TIMEOUT = """
+ALTER ROLE service_role SET statement_timeout = '15min';
+NOTIFY pgrst, 'reload config';
+"""
+
+# Combined SQL for easy copy-paste
+ALL_FUNCTIONS_SQL = f"""
+-- ETL Functions
+-- Run this in Supabase SQL Editor
+
+{BULK_UPDATE_ORDER_METADATA}
+
+{TOUCH_UPDATED_AT}
+
+{REFRESH_GOLD_VIEWS}
+
+{ETL_ROLE_TIMEOUT}
+"""
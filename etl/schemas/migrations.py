@@ -0,0 +1,76 @@
+"""
+One-off migrations for existing data.
+
+Migrations are run via Supabase dashboard SQL editor.
+"""
+
+from etl.transformers.keys import KEY_NAMESPACE, KEY_COLUMNS
+from .views import AI_ORDER_ITEMS_MATERIALIZED
+
+
+def _rekey(table: str) -> str:
+    pk, kind, source_column = KEY_COLUMNS[table]
+    return (
+        f"UPDATE {table} SET {pk} = extensions.uuid_generate_v5("
+        f"'{KEY_NAMESPACE}'::uuid, '{kind}:' || source_name || ':' || {source_column});"
+    )
+
+
+# Re-keys existing rows to the ETL_KEY_STRATEGY=uuid5 keys (same namespace and name format as
+# etl/transformers/keys.py). Foreign keys are recreated with ON UPDATE CASCADE so children follow.
+# Adjust constraint names if yours differ from the Postgres defaults.
+DETERMINISTIC_KEYS_MIGRATION = f"""
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp" WITH SCHEMA extensions;
+
+ALTER TABLE orders DROP CONSTRAINT IF EXISTS orders_location_id_fkey;
+ALTER TABLE orders ADD CONSTRAINT orders_location_id_fkey
+    FOREIGN KEY (location_id) REFERENCES locations (location_id) ON UPDATE CASCADE;
+
+ALTER TABLE order_items DROP CONSTRAINT IF EXISTS order_items_order_id_fkey;
+ALTER TABLE order_items ADD CONSTRAINT order_items_order_id_fkey
+    FOREIGN KEY (order_id) REFERENCES orders (order_id) ON UPDATE CASCADE;
+
+{_rekey("locations")}
+{_rekey("orders")}
+{_rekey("order_items")}
+
+COMMIT;
+"""
+
+
+# Moves existing order_items onto the items dimension (schemas/core.py ITEMS_DIMENSION_SQL). Load the
+# catalog first (python -m etl.transformers.transform_items), then run this. Rows are matched on
+# (source_name, item_name, category): the view output is unchanged even where several catalog IDs share
+# a name. ai_order_items is recreated (materialized, schemas/views.py) on the items join once the string columns are dropped.
+ITEMS_DIMENSION_MIGRATION = f"""
+BEGIN;
+
+UPDATE order_items oi SET item_key = i.item_key
+FROM (
+    SELECT DISTINCT ON (source_name, item_name, category) item_key, source_name, item_name, category
+    FROM items
+    ORDER BY source_name, item_name, category, item_key
+) i
+WHERE oi.item_key IS NULL
+  AND oi.source_name = i.source_name AND oi.item_name = i.item_name AND oi.category = i.category;
+
+DO $$
+BEGIN
+    CASE (SELECT relkind FROM pg_class WHERE relname = 'ai_order_items')
+        WHEN 'v' THEN DROP VIEW ai_order_items;
+        WHEN 'm' THEN DROP MATERIALIZED VIEW ai_order_items;
+        ELSE NULL;
+    END CASE;
+END $$;
+
+ALTER TABLE order_items DROP COLUMN IF EXISTS item_name, DROP COLUMN IF EXISTS category;
+{AI_ORDER_ITEMS_MATERIALIZED}
+COMMIT;
+"""
+
+
+if __name__ == "__main__":
+    print(DETERMINISTIC_KEYS_MIGRATION)
+    print(ITEMS_DIMENSION_MIGRATION)
@@ -8,7 +8,7 @@ Tables are created manually via Supabase dashboard SQL editor.
 """
 
 from pydantic import BaseModel, Field
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 from uuid import UUID, uuid4
 
@@ -25,5 +25,21 @@ class RawData(BaseModel):
     entity_type: str = Field(..., description="Entity type: location, order, payment, catalog_item, etc.")
     source_entity_id: str = Field(..., description="Original entity ID from source")
     data: Dict[str, Any] = Field(..., description="Complete original JSON data")
+    content_hash: Optional[str] = Field(None, description="Hash of canonical JSON data, used to skip unchanged re-exports")
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+
+
+# SQL for extraction: every extract upserts on the natural key, so a re-exported entity replaces its
+# previous row instead of duplicating it (content_hash lets incremental runs skip unchanged ones).
+
+RAW_DATA_CHANGE_TRACKING_SQL = """
+ALTER TABLE raw_data ADD COLUMN IF NOT EXISTS content_hash text;
+
+CREATE UNIQUE INDEX IF NOT EXISTS raw_data_source_entity_key
+    ON raw_data (source_name, entity_type, source_entity_id);
+
+-- Projected reads page one source at a time (source_name, entity_type filter, keyset on raw_id)
+CREATE INDEX IF NOT EXISTS idx_raw_data_source_entity_raw_id
+    ON raw_data (source_name, entity_type, raw_id);
+"""
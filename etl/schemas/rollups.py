@@ -0,0 +1,247 @@
+"""
+Sales rollups (Gold Layer) - Pre-aggregated tables maintained by the ETL.
+
+Typical dashboard questions (sales by day, hour, location, item, category, source, channel) are sums
+over a few dimensions. Daily and hourly rollup tables hold those sums, one row per combination of
+dimensions, so queries touch thousands of rows instead of scanning every order.
+
+refresh_sales_rollups() (called by transformers/transform_rollups.py after metadata is written) only
+recomputes the (location, day) partitions that contain orders or order items changed since its last
+run (record_updated_at watermark, kept in rollup_state; bumped on real changes by the touch triggers of
+schemas/functions.py). ai_* views join location and item names back.
+
+Tables, function and views are created via Supabase dashboard SQL editor.
+"""
+
+# Rollup tables refreshed by refresh_sales_rollups, in refresh order
+ROLLUP_TABLES = ("sales_daily", "sales_hourly", "item_sales_daily")
+
+# Rows written within this window before the watermark are re-read: transactions that commit late
+# keep their earlier timestamp (same overlap as the lookup cache)
+REFRESH_OVERLAP = "5 minutes"
+
+ROLLUP_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS rollup_state (
+    name text PRIMARY KEY,
+    watermark timestamptz NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sales_daily (
+    day date NOT NULL,
+    location_id uuid NOT NULL,
+    source_name text NOT NULL,
+    fulfillment_method text NOT NULL,
+    status text NOT NULL,
+    payment_type text NOT NULL,
+    orders integer NOT NULL,
+    subtotal bigint NOT NULL,
+    tax_amount bigint NOT NULL,
+    tip_amount bigint NOT NULL,
+    total_amount bigint NOT NULL,
+    PRIMARY KEY (day, location_id, source_name, fulfillment_method, status, payment_type)
+);
+
+CREATE TABLE IF NOT EXISTS sales_hourly (
+    hour timestamptz NOT NULL,
+    location_id uuid NOT NULL,
+    source_name text NOT NULL,
+    fulfillment_method text NOT NULL,
+    status text NOT NULL,
+    orders integer NOT NULL,
+    total_amount bigint NOT NULL,
+    PRIMARY KEY (hour, location_id, source_name, fulfillment_method, status)
+);
+
+CREATE TABLE IF NOT EXISTS item_sales_daily (
+    day date NOT NULL,
+    location_id uuid NOT NULL,
+    source_name text NOT NULL,
+    item_key integer,  -- NULL: items missing from the catalog
+    order_status text NOT NULL,
+    order_lines integer NOT NULL,
+    quantity bigint NOT NULL,
+    total_price bigint NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_sales_hourly_location_hour ON sales_hourly (location_id, hour);
+CREATE INDEX IF NOT EXISTS idx_item_sales_daily_day_location ON item_sales_daily (day, location_id);
+CREATE INDEX IF NOT EXISTS idx_item_sales_daily_item_key ON item_sales_daily (item_key);
+
+-- Partition recompute reads one location's orders for one day; the watermark scans read changed rows only
+CREATE INDEX IF NOT EXISTS idx_orders_location_created_at ON orders (location_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items (order_id);
+CREATE INDEX IF NOT EXISTS idx_order_items_record_updated_at ON order_items (record_updated_at);
+"""
+
+# Days and hours are UTC (the same DATE(created_at) the dashboard agent uses on the views), whatever the session TimeZone.
+# An order moved to another location/day leaves its old partition stale until a full refresh.
+# Runs under the caller's statement_timeout (see schemas/functions.py ETL_ROLE_TIMEOUT).
+REFRESH_SALES_ROLLUPS = f"""
+CREATE OR REPLACE FUNCTION refresh_sales_rollups(full_refresh boolean DEFAULT false)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    last_run timestamptz;
+    since timestamptz;
+    partitions integer;
+    daily integer;
+    hourly integer;
+    item_rows integer;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_sales_rollups'));  -- One refresh at a time
+    SELECT watermark INTO last_run FROM rollup_state WHERE name = 'sales';
+    full_refresh := full_refresh OR last_run IS NULL;
+    since := last_run - interval '{REFRESH_OVERLAP}';
+
+    DROP TABLE IF EXISTS rollup_partitions;
+    CREATE TEMP TABLE rollup_partitions ON COMMIT DROP AS
+    SELECT DISTINCT o.location_id, (o.created_at AT TIME ZONE 'UTC')::date AS day
+    FROM orders o
+    WHERE full_refresh OR o.record_updated_at >= since
+    UNION
+    SELECT o.location_id, (o.created_at AT TIME ZONE 'UTC')::date
+    FROM order_items oi
+    JOIN orders o ON o.order_id = oi.order_id
+    WHERE NOT full_refresh AND oi.record_updated_at >= since;
+    GET DIAGNOSTICS partitions = ROW_COUNT;
+
+    IF full_refresh THEN
+        TRUNCATE sales_daily, sales_hourly, item_sales_daily;
+    ELSE
+        DELETE FROM sales_daily s USING rollup_partitions p
+        WHERE s.location_id = p.location_id AND s.day = p.day;
+        DELETE FROM sales_hourly s USING rollup_partitions p
+        WHERE s.location_id = p.location_id
+          AND s.hour >= p.day::timestamp AT TIME ZONE 'UTC' AND s.hour < (p.day + 1)::timestamp AT TIME ZONE 'UTC';
+        DELETE FROM item_sales_daily s USING rollup_partitions p
+        WHERE s.location_id = p.location_id AND s.day = p.day;
+    END IF;
+
+    -- Orders of the affected partitions (range predicate: uses idx_orders_location_created_at)
+    DROP TABLE IF EXISTS rollup_orders;
+    CREATE TEMP TABLE rollup_orders ON COMMIT DROP AS
+    SELECT p.day, o.*
+    FROM rollup_partitions p
+    JOIN orders o ON o.location_id = p.location_id
+     AND o.created_at >= p.day::timestamp AT TIME ZONE 'UTC'
+     AND o.created_at < (p.day + 1)::timestamp AT TIME ZONE 'UTC';
+
+    INSERT INTO sales_daily
+    SELECT day, location_id, source_name, fulfillment_method, status, COALESCE(metadata->>'payment_type', ''),
+           count(*), sum(subtotal), sum(tax_amount), sum(tip_amount), sum(total_amount)
+    FROM rollup_orders
+    GROUP BY 1, 2, 3, 4, 5, 6;
+    GET DIAGNOSTICS daily = ROW_COUNT;
+
+    INSERT INTO sales_hourly
+    SELECT date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', location_id, source_name, fulfillment_method, status,
+           count(*), sum(total_amount)
+    FROM rollup_orders
+    GROUP BY 1, 2, 3, 4, 5;
+    GET DIAGNOSTICS hourly = ROW_COUNT;
+
+    INSERT INTO item_sales_daily
+    SELECT o.day, o.location_id, o.source_name, oi.item_key, o.status,
+           count(*), sum(oi.quantity), sum(oi.total_price)
+    FROM rollup_orders o
+    JOIN order_items oi ON oi.order_id = o.order_id
+    GROUP BY 1, 2, 3, 4, 5;
+    GET DIAGNOSTICS item_rows = ROW_COUNT;
+
+    DROP TABLE rollup_orders;
+
+    INSERT INTO rollup_state (name, watermark) VALUES ('sales', now())
+    ON CONFLICT (name) DO UPDATE SET watermark = EXCLUDED.watermark;
+
+    RETURN jsonb_build_object(
+        'full', full_refresh, 'partitions', partitions,
+        'sales_daily', daily, 'sales_hourly', hourly, 'item_sales_daily', item_rows
+    );
+END;
+$$;
+"""
+
+AI_SALES_DAILY_VIEW = """
+CREATE OR REPLACE VIEW ai_sales_daily AS
+SELECT
+    s.day,
+    s.source_name,
+    s.fulfillment_method,
+    s.status,
+    s.payment_type,
+    s.orders,
+    s.subtotal,
+    s.tax_amount,
+    s.tip_amount,
+    s.total_amount,
+
+    -- Location context (pre-joined)
+    l.name AS location_name,
+    l.city AS location_city
+
+FROM sales_daily s
+JOIN locations l ON s.location_id = l.location_id;
+"""
+
+AI_SALES_HOURLY_VIEW = """
+CREATE OR REPLACE VIEW ai_sales_hourly AS
+SELECT
+    s.hour,
+    (s.hour AT TIME ZONE 'UTC')::date AS day,
+    EXTRACT(HOUR FROM s.hour AT TIME ZONE 'UTC')::integer AS hour_of_day,
+    s.source_name,
+    s.fulfillment_method,
+    s.status,
+    s.orders,
+    s.total_amount,
+
+    -- Location context (pre-joined)
+    l.name AS location_name,
+    l.city AS location_city
+
+FROM sales_hourly s
+JOIN locations l ON s.location_id = l.location_id;
+"""
+
+AI_ITEM_SALES_DAILY_VIEW = """
+CREATE OR REPLACE VIEW ai_item_sales_daily AS
+SELECT
+    s.day,
+    s.source_name,
+    s.item_key,
+    COALESCE(i.item_name, '') AS item_name,
+    COALESCE(i.category, 'Unknown') AS category,
+    s.order_status,
+    s.order_lines,
+    s.quantity,
+    s.total_price,
+
+    -- Location context (pre-joined)
+    l.name AS location_name,
+    l.city AS location_city
+
+FROM item_sales_daily s
+LEFT JOIN items i ON s.item_key = i.item_key
+JOIN locations l ON s.location_id = l.location_id;
+"""
+
+# Combined SQL for easy copy-paste
+ALL_ROLLUPS_SQL = f"""
+-- Sales Rollups (Gold Layer)
+-- Run this in Supabase SQL Editor
+
+{ROLLUP_TABLES_SQL}
+
+{REFRESH_SALES_ROLLUPS}
+
+{AI_SALES_DAILY_VIEW}
+
+{AI_SALES_HOURLY_VIEW}
+
+{AI_ITEM_SALES_DAILY_VIEW}
+"""
+
+
+if __name__ == "__main__":
+    print(ALL_ROLLUPS_SQL)
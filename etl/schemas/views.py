@@ -4,13 +4,17 @@ AI Views (Gold Layer) - Flattened views optimized for AI queries.
 These PostgreSQL VIEWs flatten JSONB metadata and pre-resolve JOINs,
 making data easily queryable by AI without complex syntax.
 
+The gold layer is deployed as MATERIALIZED VIEWs: queries read precomputed rows instead of
+re-running the joins and JSONB extraction over the whole history. Each has a unique index, so
+refresh_gold_views() (schemas/functions.py) refreshes them CONCURRENTLY - readers are never blocked.
+The ETL calls it when transform_all finishes. The plain VIEW definitions are kept for reference.
+
 VIEWs are created via Supabase dashboard SQL editor.
 """
 
 # SQL to create AI views in Supabase:
 
-AI_ORDERS_VIEW = """
-CREATE OR REPLACE VIEW ai_orders AS
+AI_ORDERS_SELECT = """
 SELECT
     -- Core fields
     o.order_id,
@@ -41,21 +45,20 @@ SELECT
     o.metadata->>'revenue_center' AS revenue_center
     
 FROM orders o
-JOIN locations l ON o.location_id = l.location_id;
-"""
+JOIN locations l ON o.location_id = l.location_id"""
 
-AI_ORDER_ITEMS_VIEW = """
-CREATE OR REPLACE VIEW ai_order_items AS
+AI_ORDER_ITEMS_SELECT = """
 SELECT
     -- Core fields
     oi.order_item_id,
     oi.order_id,
     oi.source_name,
-    oi.item_name,
+    oi.item_key,
+    COALESCE(i.item_name, '') AS item_name,
     oi.quantity,
     oi.unit_price,
     oi.total_price,
-    oi.category,
+    COALESCE(i.category, 'Unknown') AS category,
     
     -- Order context (pre-joined)
     o.created_at AS order_created_at,
@@ -67,17 +70,57 @@ SELECT
     l.city AS location_city
     
 FROM order_items oi
+LEFT JOIN items i ON oi.item_key = i.item_key  -- Items dimension: names/categories stored once
 JOIN orders o ON oi.order_id = o.order_id
-JOIN locations l ON o.location_id = l.location_id;
+JOIN locations l ON o.location_id = l.location_id"""
+
+AI_ORDERS_VIEW = f"CREATE OR REPLACE VIEW ai_orders AS{AI_ORDERS_SELECT};"
+AI_ORDER_ITEMS_VIEW = f"CREATE OR REPLACE VIEW ai_order_items AS{AI_ORDER_ITEMS_SELECT};"
+
+# Materialized gold views: name -> (SELECT, unique key column, indexed column lists)
+# The unique index is what REFRESH MATERIALIZED VIEW CONCURRENTLY requires; the others serve
+# the dashboard's usual filters (date ranges, per location/source, per item/category).
+MATERIALIZED_VIEWS = {
+    "ai_orders": (AI_ORDERS_SELECT, "order_id", (
+        "created_at", "location_name, created_at", "source_name, created_at", "status",
+    )),
+    "ai_order_items": (AI_ORDER_ITEMS_SELECT, "order_item_id", (
+        "order_created_at", "order_id", "item_key", "item_name", "category", "location_name, order_created_at",
+    )),
+}
+
+
+def _materialize(name: str) -> str:
+    select, unique, indexes = MATERIALIZED_VIEWS[name]
+    index_sql = "\n".join(
+        f"CREATE INDEX IF NOT EXISTS {name}_{columns.replace(', ', '_')} ON {name} ({columns});" for columns in indexes
+    )
+    return f"""
+-- Replaces the plain view of the same name (DROP VIEW fails on a materialized view, so check the kind)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = '{name}' AND relkind = 'v') THEN
+        DROP VIEW {name};
+    END IF;
+END $$;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS{select};
+
+CREATE UNIQUE INDEX IF NOT EXISTS {name}_{unique} ON {name} ({unique});
+{index_sql}
 """
 
-# Combined SQL for easy copy-paste
+
+AI_ORDERS_MATERIALIZED = _materialize("ai_orders")
+AI_ORDER_ITEMS_MATERIALIZED = _materialize("ai_order_items")
+
+# Combined SQL for easy copy-paste (materialized gold layer; also install refresh_gold_views from functions.py)
 ALL_VIEWS_SQL = f"""
 -- AI Views (Gold Layer)
 -- Run this in Supabase SQL Editor
 
-{AI_ORDERS_VIEW}
+{AI_ORDERS_MATERIALIZED}
 
-{AI_ORDER_ITEMS_VIEW}
+{AI_ORDER_ITEMS_MATERIALIZED}
 """
 
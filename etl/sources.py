@@ -0,0 +1,137 @@
+"""
+Shared parsed-source cache for the POS exports under data/sources.
+Decoded files stay in an in-process memo (keyed by path, size and mtime; least recently used evicted once
+their file sizes pass Config.SOURCE_MEMO_MB), and a marshal copy of the decoded form is kept under
+STATE_DIR keyed by size/mtime and SHA-256: a cold start reads the snapshot (several times faster than
+json) instead of decoding the export again.
+The catalog build, verification, transform price lookup and test fixtures share it; the extractors stream
+exports with ijson instead (extractors/stream.py) unless one is already decoded.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+from etl.config import Config
+
+CACHE_DIR = Config.STATE_DIR / "sources"
+SNAPSHOT_VERSION = 1
+
+_memo = OrderedDict()  # resolved path -> (size, mtime_ns, data), least recently used first
+_memo_guard = threading.Lock()
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def snapshot_path(path: Path, directory: Path = CACHE_DIR) -> Path:
+    """Snapshot file for `path`: named by a digest of the absolute path, so same-named files don't collide."""
+    return directory / f"{hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:16]}-{path.stem}.marshal"
+
+
+def _read_snapshot(snapshot: Path, size: int, mtime_ns: int, read_bytes) -> Optional[tuple]:
+    """(data, sha256) if the snapshot matches; the header is checked before the payload is decoded."""
+    try:
+        with open(snapshot, "rb") as f:
+            header = marshal.load(f)
+            if header.get("version") != SNAPSHOT_VERSION or header.get("size") != size:
+                return None
+            # Same size but touched (checkout, copy): still valid if the content hash matches
+            if header.get("mtime_ns") != mtime_ns and header.get("sha256") != hashlib.sha256(read_bytes()).hexdigest():
+                return None
+            return marshal.load(f), header["sha256"]
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def _write_snapshot(snapshot: Path, size: int, mtime_ns: int, sha256: str, data) -> None:
+    """Header then payload, atomic replace: concurrent processes never read a partial snapshot."""
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            marshal.dump({"version": SNAPSHOT_VERSION, "size": size, "mtime_ns": mtime_ns, "sha256": sha256}, f)
+            marshal.dump(data, f)
+        os.replace(tmp, snapshot)
+    except (OSError, ValueError):  # Read-only state dir or unmarshallable data: the memo still serves this process
+        pass
+
+
+def _remember(key: str, size: int, mtime_ns: int, data) -> None:
+    """Memoizes `data`, evicting least recently used files past the SOURCE_MEMO_MB budget (file sizes)."""
+    budget = Config.SOURCE_MEMO_MB * 1024 * 1024
+    with _memo_guard:
+        _memo.pop(key, None)
+        if size > budget:
+            return  # Would evict everything else: callers hold it only as long as they need it
+        _memo[key] = (size, mtime_ns, data)
+        while sum(entry[0] for entry in _memo.values()) > budget:
+            _memo.popitem(last=False)
+
+
+def _recall(key: str, size: int, mtime_ns: int):
+    with _memo_guard:
+        cached = _memo.get(key)
+        if cached and cached[:2] == (size, mtime_ns):
+            _memo.move_to_end(key)
+            return cached
+        return None
+
+
+def load_json(path: Path, directory: Optional[Path] = None) -> Any:
+    """
+    Parsed JSON at `path`, shared by every caller in the process: treat it as read-only.
+    Memo -> on-disk snapshot (under `directory`, default CACHE_DIR) -> json decode (which refreshes
+    the snapshot unless ETL_SOURCE_CACHE=0).
+    """
+    path = Path(path).resolve()
+    key = str(path)
+    with _lock(key):
+        stat = path.stat()
+        cached = _recall(key, stat.st_size, stat.st_mtime_ns)
+        if cached:
+            return cached[2]
+
+        raw = None
+
+        def read_bytes() -> bytes:
+            nonlocal raw
+            if raw is None:
+                raw = path.read_bytes()
+            return raw
+
+        snapshot = snapshot_path(path, directory or CACHE_DIR)
+        found = _read_snapshot(snapshot, stat.st_size, stat.st_mtime_ns, read_bytes) if Config.SOURCE_CACHE else None
+        if found is None:
+            data = json.loads(read_bytes())
+            if Config.SOURCE_CACHE:
+                _write_snapshot(snapshot, stat.st_size, stat.st_mtime_ns, hashlib.sha256(raw).hexdigest(), data)
+        else:
+            data, sha256 = found
+            if raw is not None:  # Touched but unchanged: restamp so the next start skips the hash
+                _write_snapshot(snapshot, stat.st_size, stat.st_mtime_ns, sha256, data)
+
+        _remember(key, stat.st_size, stat.st_mtime_ns, data)
+        return data
+
+
+def cached(path: Path) -> Any:
+    """Parsed JSON at `path` if it is already decoded in this process, else None (never decodes)."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    entry = _recall(str(path), stat.st_size, stat.st_mtime_ns)
+    return entry[2] if entry else None
+
+
+def clear() -> None:
+    """Drops the in-process memo (snapshots on disk stay)."""
+    with _memo_guard:
+        _memo.clear()
@@ -1,4 +1,20 @@
 """Pytest configuration - Auto-loads fixtures."""
 
+import pytest
+from etl import sources
+from etl.transformers import lookup_cache
 from .fixtures import *
 
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_source_snapshots(tmp_path_factory):
+    """Source snapshots go to a session temp dir (never the real STATE_DIR/sources)."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(sources, "CACHE_DIR", tmp_path_factory.mktemp("sources"))
+        yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_lookup_cache(tmp_path, monkeypatch):
+    """Each test gets an empty lookup cache under tmp_path (never the real STATE_DIR snapshot)."""
+    monkeypatch.setattr(lookup_cache, "_shared", lookup_cache.LookupCache(tmp_path / "lookups"))
@@ -0,0 +1,174 @@
+"""In-memory stand-in for the Supabase client (table().select/eq/gt/order/limit/upsert/update/execute, rpc)."""
+
+import threading
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from etl.db.errors import MissingFunction
+from etl.schemas.rollups import ROLLUP_TABLES
+from etl.schemas.views import MATERIALIZED_VIEWS
+
+# Generated primary keys, as the real tables default them
+PRIMARY_KEYS = {"raw_data": "raw_id", "locations": "location_id", "orders": "order_id", "order_items": "order_item_id",
+                "items": "item_key"}
+
+# Identity (integer) primary keys; the others are UUIDs
+IDENTITY_KEYS = {"items"}
+
+# Timestamp columns defaulted on insert and bumped on update (the touch_updated_at trigger)
+UPDATED_AT = {"locations": "updated_at", "orders": "record_updated_at", "order_items": "record_updated_at",
+              "items": "updated_at"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _apply(table: str, row: dict, changes: dict) -> None:
+    """row.update(changes), bumping its updated_at column only if a value changed (the change-guarded trigger)."""
+    changed = any(row.get(c) != v for c, v in changes.items())
+    row.update(changes)
+    if changed and table in UPDATED_AT:
+        row[UPDATED_AT[table]] = _now()
+
+
+class FakeClient:
+    """Tables are lists of dicts; counts every executed request. max_rows mimics PostgREST's row cap."""
+    
+    def __init__(self, tables: dict = None, max_rows: int = None):
+        self.tables = {name: list(rows) for name, rows in (tables or {}).items()}
+        self.max_rows = max_rows
+        self.requests = []
+        self.lock = threading.RLock()  # Requests are atomic, as in the database (writers and extractors run in threads)
+    
+    def table(self, name: str):
+        return _Query(self, name)
+    
+    def rpc(self, fn: str, params: dict):
+        return _Rpc(self, fn, params)
+
+
+class _Rpc:
+    """Implements the ETL's server-side functions (schemas/functions.py)."""
+    
+    def __init__(self, client, fn, params):
+        self.client, self.fn, self.params = client, fn, params
+    
+    def execute(self):
+        self.client.requests.append(("rpc", self.fn))
+        if self.fn == "refresh_gold_views":
+            return SimpleNamespace(data={name: 0.0 for name in MATERIALIZED_VIEWS})
+        if self.fn == "refresh_sales_rollups":
+            full = bool(self.params.get("full_refresh"))
+            return SimpleNamespace(data={"full": full, "partitions": 0, **{table: 0 for table in ROLLUP_TABLES}})
+        if self.fn != "bulk_update_order_metadata":
+            raise MissingFunction(self.fn)
+        metadata = {u["order_id"]: u["metadata"] for u in self.params["updates"]}
+        updated = 0
+        for order in self.client.tables.get("orders", []):
+            if order["order_id"] in metadata:
+                _apply("orders", order, {"metadata": metadata[order["order_id"]]})
+                updated += 1
+        return SimpleNamespace(data=updated)
+
+
+def _value(row: dict, column: str):
+    """Column value, following PostgREST JSON paths like data->>store_id."""
+    if "->" not in column:
+        return row.get(column)
+    root, *path = column.replace("->>", "->").split("->")
+    value = row.get(root)
+    for part in path:
+        if isinstance(value, list) and part.isdigit():
+            value = value[int(part)] if int(part) < len(value) else None
+        else:
+            value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+class _Query:
+    def __init__(self, client, name):
+        self.client, self.name = client, name
+        self.op, self.payload, self.filters, self.key, self.n = "select", None, [], None, None
+        self.on_conflict = None
+    
+    def select(self, columns):
+        self.columns = [c.strip() for c in columns.split(",")]
+        return self
+    
+    def eq(self, column, value):
+        self.filters.append(lambda r: _value(r, column) == value)
+        return self
+    
+    def gt(self, column, value):
+        self.filters.append(lambda r: _value(r, column) is not None and _value(r, column) > value)
+        return self
+    
+    def gte(self, column, value):
+        self.filters.append(lambda r: _value(r, column) is not None and _value(r, column) >= value)
+        return self
+    
+    def lt(self, column, value):
+        self.filters.append(lambda r: _value(r, column) is not None and _value(r, column) < value)
+        return self
+    
+    def order(self, column):
+        self.key = column
+        return self
+    
+    def limit(self, n):
+        self.n = n
+        return self
+    
+    def upsert(self, records, on_conflict=None):
+        self.op, self.payload, self.on_conflict = "upsert", records, on_conflict
+        return self
+    
+    def _new_key(self, rows: list):
+        if self.name in IDENTITY_KEYS:
+            return max((r[PRIMARY_KEYS[self.name]] for r in rows), default=0) + 1
+        return str(uuid.uuid4())
+    
+    def update(self, values):
+        self.op, self.payload = "update", values
+        return self
+    
+    def execute(self):
+        with self.client.lock:
+            return self._execute()
+    
+    def _execute(self):
+        self.client.requests.append((self.op, self.name))
+        rows = self.client.tables.setdefault(self.name, [])
+        if self.op == "upsert":
+            key = PRIMARY_KEYS.get(self.name)
+            conflict = [c.strip() for c in self.on_conflict.split(",")] if self.on_conflict else None
+            existing = {tuple(r.get(c) for c in conflict): r for r in rows} if conflict else {}
+            written = []
+            for record in self.payload:
+                match = existing.get(tuple(record.get(c) for c in conflict)) if conflict else None
+                if match is not None:  # ON CONFLICT DO UPDATE: keeps the generated key
+                    _apply(self.name, match, record)
+                    written.append(match)
+                    continue
+                r = dict(record) if key is None or record.get(key) else {**record, key: self._new_key(rows)}
+                if self.name in UPDATED_AT:
+                    r.setdefault(UPDATED_AT[self.name], _now())
+                rows.append(r)
+                if conflict:
+                    existing[tuple(r.get(c) for c in conflict)] = r
+                written.append(r)
+            return SimpleNamespace(data=[dict(r) for r in written])
+        matched = [r for r in rows if all(f(r) for f in self.filters)]
+        if self.op == "update":
+            for r in matched:
+                _apply(self.name, r, self.payload)
+            return SimpleNamespace(data=matched)
+        if self.key:
+            matched.sort(key=lambda r: r[self.key])
+        for cap in (self.n, self.client.max_rows):
+            if cap is not None:
+                matched = matched[:cap]
+        # "alias:data->a->b" selects a JSON path under an alias
+        columns = [c.split(":", 1) if ":" in c else (c, c) for c in self.columns]
+        return SimpleNamespace(data=[{alias: _value(r, expr) for alias, expr in columns} for r in matched])
@@ -2,33 +2,25 @@
 Pytest fixtures - Loads REAL data from data/sources/*.json
 """
 
-import json
 import pytest
 from pathlib import Path
+from etl.sources import load_json
 
 # Path to source data (etl/data/sources)
 SOURCES_DIR = Path(__file__).parent.parent / "data" / "sources"
 
 
-def _load_json(path: Path) -> dict:
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
-
-
-# Lazy-loaded data cache (load once per test session)
-_data_cache = {}
+# Shared parsed-source cache (etl/sources.py): decoded once per session, snapshot reused across sessions
+SOURCE_FILES = {
+    "doordash": SOURCES_DIR / "doordash_orders.json",
+    "square_locations": SOURCES_DIR / "square" / "locations.json",
+    "square_orders": SOURCES_DIR / "square" / "orders.json",
+    "square_payments": SOURCES_DIR / "square" / "payments.json",
+    "toast": SOURCES_DIR / "toast_pos_export.json",
+}
 
 def _get_data(key: str):
-    if key not in _data_cache:
-        loaders = {
-            "doordash": lambda: _load_json(SOURCES_DIR / "doordash_orders.json"),
-            "square_locations": lambda: _load_json(SOURCES_DIR / "square" / "locations.json"),
-            "square_orders": lambda: _load_json(SOURCES_DIR / "square" / "orders.json"),
-            "square_payments": lambda: _load_json(SOURCES_DIR / "square" / "payments.json"),
-            "toast": lambda: _load_json(SOURCES_DIR / "toast_pos_export.json"),
-        }
-        _data_cache[key] = loaders[key]()
-    return _data_cache[key]
+    return load_json(SOURCE_FILES[key])
 
 
 # Location fixtures (first location from each source)
@@ -107,13 +99,21 @@ def mock_order_lookup():
 def mock_item_catalog():
     """Loads the real item catalog."""
     catalog_path = SOURCES_DIR.parent.parent / "catalog" / "item_catalog.json"
-    return _load_json(catalog_path)
+    return load_json(catalog_path)
+
+
+@pytest.fixture
+def mock_item_keys(mock_item_catalog):
+    """Item key lookup as build_item_lookup returns it, keyed in real catalog order."""
+    ids = [(source, item_id) for source, items in mock_item_catalog.items()
+           for item_id, info in items.items() if isinstance(info, dict)]
+    return {key: i for i, key in enumerate(ids, 1)}
 
 
 @pytest.fixture
 def mock_square_prices():
     """Builds price lookup from real Square catalog."""
-    catalog = _load_json(SOURCES_DIR / "square" / "catalog.json")
+    catalog = load_json(SOURCES_DIR / "square" / "catalog.json")
     return {
         var["id"]: var.get("item_variation_data", {}).get("price_money", {}).get("amount", 0)
         for obj in catalog.get("objects", []) if obj["type"] == "ITEM"
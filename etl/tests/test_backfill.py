@@ -0,0 +1,63 @@
+"""Tests for transformers.backfill - Partitioning and inline runs on REAL data."""
+
+from datetime import date
+import pytest
+from etl.db.connection import db
+from etl.transformers import backfill as backfill_module
+from etl.transformers.backfill import Partition, backfill, date_ranges, list_partitions
+from etl.transformers.transform_fused import transform_orders_fused
+from etl.transformers.transform_locations import transform_locations
+from etl.transformers.transform_items import transform_items
+from etl.transformers.lookup_cache import shared_cache
+from .fakes import FakeClient
+from .test_transform_fused import _raw_rows
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    client = FakeClient({"raw_data": _raw_rows()}, max_rows=10)
+    monkeypatch.setattr(db, "_client", client)
+    monkeypatch.setattr(backfill_module, "_lookups", None)
+    transform_locations()
+    return client
+
+
+class TestDateRanges:
+    """Test date range splitting."""
+    
+    def test_covers_interval_without_gaps(self):
+        ranges = date_ranges(date(2025, 1, 1), date(2025, 1, 10), 4)
+        assert ranges == [("2025-01-01", "2025-01-05"), ("2025-01-05", "2025-01-09"), ("2025-01-09", "2025-01-10")]
+    
+    def test_empty_interval(self):
+        assert date_ranges(date(2025, 1, 1), date(2025, 1, 1), 7) == []
+
+
+class TestPartitions:
+    """Test partitions cover every raw location and filter server-side."""
+    
+    def test_one_partition_per_location_and_range(self, fake_db):
+        partitions = list_partitions(fake_db, date(2025, 1, 1), date(2025, 1, 8), 7)
+        assert len(partitions) == 12  # 4 locations x 3 sources x 1 range
+        assert {p.source for p in partitions} == {"doordash", "square", "toast"}
+    
+    def test_filters_use_source_json_paths(self):
+        filters = Partition("toast", "loc_1", "2025-01-01", "2025-02-01").filters()
+        assert filters == (
+            ("eq", "data->>restaurantGuid", "loc_1"),
+            ("gte", "data->>openedDate", "2025-01-01"),
+            ("lt", "data->>openedDate", "2025-02-01"),
+        )
+
+
+class TestBackfill:
+    """Test an inline backfill matches the fused full scan."""
+    
+    def test_counts_match_full_scan(self, fake_db, monkeypatch):
+        totals = backfill(date(2024, 12, 1), date(2025, 2, 1), days=10, workers=1)
+        
+        monkeypatch.setattr(db, "_client", FakeClient({"raw_data": _raw_rows()}))
+        shared_cache().invalidate()  # Cached keys belong to the other database
+        transform_locations()
+        transform_items()
+        assert totals == transform_orders_fused()
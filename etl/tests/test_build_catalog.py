@@ -0,0 +1,108 @@
+"""Tests for catalog.build_catalog - Incremental builds on copies of the REAL sources."""
+
+import json
+import shutil
+import pytest
+from .fixtures import SOURCES_DIR
+
+CATALOG_DIR = SOURCES_DIR.parent.parent / "catalog"
+
+
+@pytest.fixture
+def build(tmp_path, monkeypatch):
+    """build_catalog module (imported like the script does) reading copies of the sources in tmp_path."""
+    monkeypatch.syspath_prepend(str(CATALOG_DIR))
+    import build_catalog
+    
+    sources = tmp_path / "sources"
+    shutil.copytree(SOURCES_DIR, sources)
+    calls = []
+    
+    def counted(source, builder):
+        def run(paths, skip):
+            calls.append(source)
+            return builder(paths, skip)
+        return run
+    
+    monkeypatch.setattr(build_catalog, "SOURCES", {
+        source: (tuple(sources / p.relative_to(SOURCES_DIR) for p in paths), counted(source, builder))
+        for source, (paths, builder) in build_catalog.SOURCES.items()
+    })
+    output, state = tmp_path / "catalog.json", tmp_path / "state.json"
+    run = lambda incremental=True, path=output: build_catalog.build_catalog(incremental, path, state_path=state)
+    return run, output, sources, calls
+
+
+def _add_toast_item(sources) -> None:
+    path = sources / "toast_pos_export.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    selection = json.loads(json.dumps(data["orders"][0]["checks"][0]["selections"][0]))
+    selection["displayName"] = "Griled Chiken Wrap"
+    selection["item"] = {**selection["item"], "guid": "itm_new_001", "name": "Griled Chiken Wrap"}
+    data["orders"][0]["checks"][0]["selections"].append(selection)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestIncrementalBuild:
+    """Test unchanged sources are skipped and curated entries survive."""
+    
+    def test_full_build_then_nothing_to_do(self, build):
+        run, output, _, calls = build
+        assert run(incremental=False) == {"doordash": 47, "square": 39, "toast": 42}
+        calls.clear()
+        assert run() == {"doordash": None, "square": None, "toast": None}
+        assert calls == []
+    
+    def test_only_changed_source_and_new_ids(self, build):
+        run, output, sources, calls = build
+        run(incremental=False)
+        calls.clear()
+        _add_toast_item(sources)
+        
+        assert run() == {"doordash": None, "square": None, "toast": 1}
+        assert calls == ["toast"]
+        assert json.loads(output.read_text(encoding="utf-8"))["toast"]["itm_new_001"]["name"] == "Grilled Chicken Wrap"
+    
+    def test_curated_entries_untouched(self, build):
+        run, output, sources, _ = build
+        run(incremental=False)
+        catalog = json.loads(output.read_text(encoding="utf-8"))
+        catalog["toast"]["itm_burger_001"] = {"name": "Signature Burger", "category": "House Specials"}
+        output.write_text(json.dumps(catalog), encoding="utf-8")
+        _add_toast_item(sources)
+        
+        run()
+        toast = json.loads(output.read_text(encoding="utf-8"))["toast"]
+        assert toast["itm_burger_001"] == {"name": "Signature Burger", "category": "House Specials"}
+        assert "itm_new_001" in toast
+    
+    def test_touched_file_not_reparsed(self, build):
+        run, _, sources, calls = build
+        run(incremental=False)
+        calls.clear()
+        (sources / "doordash_orders.json").touch()
+        assert run()["doordash"] is None
+        assert calls == []
+
+
+class TestStatePerOutput:
+    """Test state recorded for one output never skips items in another."""
+    
+    def test_other_output_built_in_full(self, build, tmp_path):
+        run, _, _, calls = build
+        full = run(incremental=False)
+        calls.clear()
+        other = tmp_path / "other" / "catalog.json"
+        other.parent.mkdir()
+        other.write_text("{}", encoding="utf-8")
+        
+        assert run(path=other) == full
+        assert sorted(calls) == ["doordash", "square", "toast"]
+        assert run() == {"doordash": None, "square": None, "toast": None}  # First output's state kept
+    
+    def test_missing_output_rebuilt(self, build):
+        run, output, _, calls = build
+        full = run(incremental=False)
+        output.unlink()
+        assert run() == full
+        assert sum(len(v) - 1 for v in json.loads(output.read_text(encoding="utf-8")).values()) == sum(full.values())
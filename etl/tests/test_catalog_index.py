@@ -0,0 +1,71 @@
+"""Tests for catalog.index - Compiled index must answer exactly like the REAL JSON catalog."""
+
+import json
+import os
+import pytest
+from etl.catalog.index import MISSING, CatalogIndex, build_index, compile_index, open_index
+from etl.transformers.utils import get_item_info
+from .fixtures import SOURCES_DIR
+
+CATALOG_PATH = SOURCES_DIR.parent.parent / "catalog" / "item_catalog.json"
+
+
+@pytest.fixture
+def catalog_copy(tmp_path):
+    path = tmp_path / "item_catalog.json"
+    path.write_bytes(CATALOG_PATH.read_bytes())
+    return path
+
+
+@pytest.fixture
+def index(catalog_copy):
+    return CatalogIndex(build_index(catalog_copy, catalog_copy.with_suffix(".idx")))
+
+
+class TestCatalogIndex:
+    """Test lookups match the JSON catalog."""
+    
+    def test_every_item_matches_json(self, index, mock_item_catalog):
+        items = [(s, i) for s, entries in mock_item_catalog.items() for i, v in entries.items() if isinstance(v, dict)]
+        assert len(index) == len(items)
+        for source, item_id in items:
+            assert get_item_info(index, source, item_id) == get_item_info(mock_item_catalog, source, item_id)
+    
+    def test_missing_item_and_source(self, index):
+        assert index.item_info("doordash", "nonexistent_item_xyz") == MISSING
+        assert index.item_info("invalid_source", "itm_001") == MISSING
+    
+    def test_strings_are_interned(self, index, mock_item_catalog):
+        item_ids = [i for i, v in mock_item_catalog["toast"].items() if isinstance(v, dict)][:2]
+        categories = [index.item_info("toast", i)[1] for i in item_ids * 2]
+        assert categories[0] is categories[2]
+    
+    def test_collisions_and_unicode(self, tmp_path):
+        catalog = {"s": {f"id{i}": {"name": f"Café {i} ☕", "category": f"c{i % 7}"} for i in range(5000)}}
+        index = CatalogIndex(compile_index(catalog, tmp_path / "big.idx"))
+        assert all(index.item_info("s", f"id{i}") == (f"Café {i} ☕", f"c{i % 7}") for i in range(5000))
+        assert index.item_info("s", "id5000") == MISSING
+
+
+class TestFreshness:
+    """Test a stale index is rebuilt from the JSON."""
+    
+    def test_reuses_fresh_index(self, catalog_copy):
+        idx = catalog_copy.with_suffix(".idx")
+        open_index(catalog_copy, idx)
+        built = idx.stat().st_mtime_ns
+        assert open_index(catalog_copy, idx).is_fresh(catalog_copy)
+        assert idx.stat().st_mtime_ns == built
+    
+    def test_rebuilds_after_catalog_edit(self, catalog_copy):
+        idx = catalog_copy.with_suffix(".idx")
+        assert open_index(catalog_copy, idx).item_info("doordash", "itm_new") == MISSING
+        catalog = json.loads(catalog_copy.read_text(encoding="utf-8"))
+        catalog["doordash"]["itm_new"] = {"name": "New Item", "category": "Sides"}
+        catalog_copy.write_text(json.dumps(catalog), encoding="utf-8")
+        os.utime(catalog_copy, ns=(1, 1))
+        
+        assert open_index(catalog_copy, idx).item_info("doordash", "itm_new") == ("New Item", "Sides")
+    
+    def test_no_index_without_build(self, catalog_copy):
+        assert open_index(catalog_copy, catalog_copy.with_suffix(".idx"), build=False) is None
@@ -0,0 +1,211 @@
+"""Tests for transformers.elt - Generated SQL, and ELT output identical to the Python transformers on REAL data."""
+
+import os
+from datetime import datetime
+import pytest
+from etl import metrics
+from etl.config import Config
+from etl.db import postgres
+from etl.db.connection import db
+from etl.schemas.core import SOURCE_KEYS_SQL
+from etl.transformers import elt, transform_locations, transform_items, transform_orders, transform_order_items, transform_enriched_orders
+from etl.transformers.keys import KEY_COLUMNS
+from etl.transformers.utils import STATUS_MAP, FULFILLMENT_MAP, PAYMENT_TYPE_MAP, upsert_rows
+from .fakes import FakeClient
+from .test_transform_fused import _raw_rows, _snapshot
+
+# Local Postgres for the comparison tests, e.g. postgresql://postgres@localhost/postgres
+TEST_DSN = os.getenv("ETL_TEST_DATABASE_URL", "")
+
+needs_postgres = pytest.mark.skipif(elt.psycopg is None or not TEST_DSN, reason="needs psycopg and ETL_TEST_DATABASE_URL")
+
+# Core tables as the pipeline writes them, natural keys from SOURCE_KEYS_SQL (raw_id is text so "last payment wins" follows the fake's order)
+SCHEMA_SQL = """
+CREATE TABLE raw_data (raw_id text PRIMARY KEY, source_name text, entity_type text, source_entity_id text, data jsonb, content_hash text);
+CREATE TABLE locations (location_id uuid PRIMARY KEY DEFAULT gen_random_uuid(), account_id uuid, source_name text, source_location_id text,
+    name text NOT NULL, address_line_1 text, city text, state text, postal_code text, country text, timezone text,
+    updated_at timestamptz NOT NULL DEFAULT now());
+CREATE TABLE items (item_key integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, source_name text NOT NULL, source_item_id text NOT NULL,
+    item_name text NOT NULL, category text NOT NULL, updated_at timestamptz NOT NULL DEFAULT now(), UNIQUE (source_name, source_item_id));
+CREATE TABLE orders (order_id uuid PRIMARY KEY DEFAULT gen_random_uuid(), location_id uuid REFERENCES locations, source_name text,
+    source_order_id text, created_at timestamptz, closed_at timestamptz, status text, fulfillment_method text,
+    subtotal bigint, tax_amount bigint, tip_amount bigint, total_amount bigint, metadata jsonb, record_updated_at timestamptz NOT NULL DEFAULT now());
+CREATE TABLE order_items (order_item_id uuid PRIMARY KEY DEFAULT gen_random_uuid(), order_id uuid REFERENCES orders, source_name text,
+    source_order_item_id text, item_key integer REFERENCES items, quantity integer, unit_price bigint, total_price bigint,
+    record_updated_at timestamptz NOT NULL DEFAULT now());
+"""
+
+
+class TestGeneratedSql:
+    """Test the statements carry the Python mappings."""
+
+    def test_statement_per_table_and_source(self):
+        names = [(table, source) for table, source, _ in elt.statements()]
+        assert names[0] == ("items", None)
+        assert names[1:] == [(t, s) for t in elt.TABLES for s in ("doordash", "square", "toast")]
+
+    def test_value_maps_rendered(self):
+        sql = "\n".join(sql for _, _, sql in elt.statements())
+        for maps in (STATUS_MAP, FULFILLMENT_MAP, PAYMENT_TYPE_MAP):
+            for mapping in maps.values():
+                for key, value in mapping.items():
+                    assert f"WHEN '{key}' THEN '{value}'" in sql
+
+    def test_upserts_on_source_keys(self):
+        sql = elt.build_statement("order_items", "toast")
+        assert "ON CONFLICT (source_name, source_order_item_id) DO UPDATE" in sql
+        assert "JOIN orders o ON o.source_name = r.source_name" in sql
+        assert "LEFT JOIN items i" in sql
+        assert "r.entity_type = 'order'" in sql
+
+    def test_lookup_keys_left_to_database(self, monkeypatch):
+        monkeypatch.setattr(Config, "KEY_STRATEGY", "lookup")
+        assert "uuid_generate_v5" not in elt.build_statement("orders", "square")
+
+    def test_deterministic_keys(self, monkeypatch):
+        monkeypatch.setattr(Config, "KEY_STRATEGY", "uuid5")
+        sql = elt.build_statement("orders", "square")
+        assert sql.startswith("INSERT INTO orders (order_id, ")
+        assert "'order:' || r.source_name || ':' || r.data->>'id'" in sql
+
+    def test_literals_escaped(self):
+        assert elt._literal("O'Brien") == "'O''Brien'"
+        assert elt._literal(0) == "0"
+        assert elt._literal(None) == "NULL"
+
+
+@pytest.fixture
+def databases(monkeypatch, tmp_path):
+    """The Python pipeline on a fake database and the ELT engine on a scratch Postgres schema, same raw rows."""
+    import psycopg
+
+    raw = _raw_rows()
+    monkeypatch.setattr(metrics, "RUNS_DIR", tmp_path / "runs")
+    python_db = FakeClient({"raw_data": raw}, max_rows=10)
+    monkeypatch.setattr(db, "_client", python_db)
+    for step in (transform_locations, transform_items, transform_orders, transform_order_items, transform_enriched_orders):
+        step()
+
+    with psycopg.connect(TEST_DSN, autocommit=True) as conn:
+        dsn = _elt_schema(conn, f"elt_test_{os.getpid()}", raw)
+        counts = elt.run_elt(dsn, refresh=False)
+        elt_db = _tables(conn)
+        conn.execute(f"DROP SCHEMA elt_test_{os.getpid()} CASCADE")
+    yield python_db, elt_db, counts
+
+
+def _elt_schema(conn, schema: str, raw: list) -> str:
+    """Scratch schema with the core tables, their natural keys and `raw` loaded. Returns its DSN."""
+    from psycopg.conninfo import make_conninfo
+    from psycopg.types.json import Jsonb
+
+    conn.execute(f"CREATE SCHEMA {schema}")
+    conn.execute(f"SET search_path = {schema}, public")
+    conn.execute(SCHEMA_SQL)
+    conn.execute(SOURCE_KEYS_SQL)
+    with conn.cursor() as cur:
+        cur.executemany(
+            "INSERT INTO raw_data VALUES (%s, %s, %s, %s, %s, %s)",
+            [(r["raw_id"], r["source_name"], r["entity_type"], r["source_entity_id"], Jsonb(r["data"]), r.get("content_hash")) for r in raw],
+        )
+    return make_conninfo(TEST_DSN, options=f"-csearch_path={schema},public")
+
+
+def _tables(conn) -> FakeClient:
+    """Core tables of the connection's schema as plain rows (IDs as strings)."""
+    import psycopg
+
+    return FakeClient({
+        table: [{k: str(v) if k.endswith("_id") and v is not None else v for k, v in row.items()}
+                for row in conn.cursor(row_factory=psycopg.rows.dict_row).execute(f"SELECT * FROM {table}")]
+        for table in ("locations", "items", "orders", "order_items")
+    })
+
+
+def _timestamps(orders: dict) -> dict:
+    """Python rows keep ISO strings; Postgres returns datetimes."""
+    parse = lambda v: datetime.fromisoformat(v.replace("Z", "+00:00")) if isinstance(v, str) else v
+    return {key: {**o, "created_at": parse(o["created_at"]), "closed_at": parse(o["closed_at"])} for key, o in orders.items()}
+
+
+@needs_postgres
+class TestMatchesPython:
+    """Test the ELT engine writes the same core rows as the Python transformers."""
+
+    def test_same_locations(self, databases):
+        python_db, elt_db, _ = databases
+        key = lambda rows: {(l["source_name"], l["source_location_id"]): {k: v for k, v in l.items() if k not in ("location_id", "updated_at")} for l in rows}
+        assert key(elt_db.tables["locations"]) == key(python_db.tables["locations"])
+
+    def test_same_orders_and_metadata(self, databases):
+        python_db, elt_db, _ = databases
+        python_orders, _ = _snapshot(python_db)
+        for order in python_orders.values():
+            order.setdefault("metadata", None)
+        assert _timestamps(_snapshot(elt_db)[0]) == _timestamps(python_orders)
+
+    def test_same_order_items(self, databases):
+        python_db, elt_db, _ = databases
+        assert _snapshot(elt_db)[1] == _snapshot(python_db)[1]
+
+    def test_counts(self, databases):
+        python_db, _, counts = databases
+        assert sum(v for k, v in counts["orders"].items() if k != "errors") == len(python_db.tables["orders"])
+
+
+def _source_ids(client: FakeClient) -> dict:
+    """{table: {primary key: (source_name, source id)}} of the keyed tables and items."""
+    ids = {table: {r[pk]: (r["source_name"], r[source_column]) for r in client.tables[table]}
+           for table, (pk, _, source_column) in KEY_COLUMNS.items()}
+    ids["items"] = {i["item_key"]: (i["source_name"], i["source_item_id"]) for i in client.tables["items"]}
+    return ids
+
+
+@needs_postgres
+class TestSharedDatabase:
+    """Test the Python transformers' upserts and the ELT engine write to one database with SOURCE_KEYS_SQL installed."""
+
+    def test_python_rerun_after_elt(self, monkeypatch, tmp_path):
+        import psycopg
+
+        raw = _raw_rows()
+        monkeypatch.setattr(metrics, "RUNS_DIR", tmp_path / "runs")
+        python_db = FakeClient({"raw_data": raw}, max_rows=10)
+        monkeypatch.setattr(db, "_client", python_db)
+        for step in (transform_locations, transform_items, transform_orders, transform_order_items, transform_enriched_orders):
+            step()
+        python_ids = _source_ids(python_db)
+
+        schema = f"shared_test_{os.getpid()}"
+        with psycopg.connect(TEST_DSN, autocommit=True) as conn:
+            dsn = _elt_schema(conn, schema, raw)
+            elt.run_elt(dsn, refresh=False)
+            before = _tables(conn)
+            keys = {table: {source_id: key for key, source_id in ids.items()} for table, ids in _source_ids(before).items()}
+
+            # The rows the Python transformers write (lookup mode: no primary key), parents resolved in this database
+            stamped = {"updated_at", "record_updated_at"}
+            rows = {table: [{k: v for k, v in r.items() if k not in stamped and k != KEY_COLUMNS[table][0]} for r in python_db.tables[table]]
+                    for table in KEY_COLUMNS}
+            for order in rows["orders"]:
+                order["location_id"] = keys["locations"][python_ids["locations"][order["location_id"]]]
+            for item in rows["order_items"]:
+                item["order_id"] = keys["orders"][python_ids["orders"][item["order_id"]]]
+                item["item_key"] = keys["items"].get(python_ids["items"].get(item["item_key"]))
+
+            # Every upsert through COPY + merge (PostgREST sends the same ON CONFLICT target)
+            monkeypatch.setattr(postgres, "COPY_TABLES", set(KEY_COLUMNS))
+            loader = postgres.CopyLoader(dsn)
+            client = postgres.PostgresClient(FakeClient(), loader)
+            for table in ("locations", "orders", "order_items"):
+                _, rejected = upsert_rows(client, table, rows[table])
+                assert rejected == []
+            loader.close()
+            after = _tables(conn)
+
+            elt.run_elt(dsn, refresh=False)  # And the ELT engine again on top
+            again = _tables(conn)
+            conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+        for table in KEY_COLUMNS:  # Updated in place: same rows, same keys
+            assert _source_ids(after)[table] == _source_ids(before)[table] == _source_ids(again)[table]
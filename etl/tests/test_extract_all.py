@@ -0,0 +1,73 @@
+"""Tests for extractors.extract_all - Concurrent extraction of the REAL data/sources exports."""
+
+import threading
+import pytest
+from etl import metrics
+from etl.db.connection import db
+from etl.extractors.extract_all import extract_all
+from etl.extractors.extract_square import extract_square
+from .fakes import FakeClient
+from .fixtures import SOURCES_DIR
+
+
+class BarrierClient(FakeClient):
+    """FakeClient whose first `parties` requests wait for each other: only concurrent writers get past them."""
+    
+    def __init__(self, parties: int):
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5)
+        self.calls = 0
+    
+    def table(self, name):
+        with self.lock:
+            self.calls += 1
+            first = self.calls <= self.barrier.parties
+        if first:
+            self.barrier.wait()
+        return super().table(name)
+
+
+def _keys(client: FakeClient) -> list:
+    return [(r["source_name"], r["entity_type"], r["source_entity_id"]) for r in client.tables.get("raw_data", [])]
+
+
+@pytest.fixture
+def run_extract(monkeypatch, tmp_path):
+    """Runs extract_all against a fresh fake client; returns (results, client)."""
+    monkeypatch.setattr(metrics, "RUNS_DIR", tmp_path / "runs")
+    
+    def run(workers):
+        client = FakeClient()
+        monkeypatch.setattr(db, "_client", client)
+        return extract_all(SOURCES_DIR, workers=workers), client
+    return run
+
+
+class TestConcurrentExtract:
+    """Test workers > 1 writes every entity exactly once, like the sequential run."""
+    
+    def test_parallel_counts_match_sequential(self, run_extract):
+        sequential, _ = run_extract(1)
+        parallel, _ = run_extract(4)
+        assert parallel == sequential
+        assert all(parallel.values())
+    
+    def test_no_duplicate_raw_rows(self, run_extract):
+        results, client = run_extract(4)
+        keys = _keys(client)
+        assert len(keys) == len(set(keys))
+        assert len(keys) == sum(sum(counts.values()) for counts in results.values())
+    
+    def test_same_raw_rows_as_sequential(self, run_extract):
+        _, sequential = run_extract(1)
+        _, parallel = run_extract(4)
+        assert sorted(_keys(parallel)) == sorted(_keys(sequential))
+    
+    def test_square_files_in_parallel(self, monkeypatch):
+        client = BarrierClient(parties=3)  # Deadlocks (times out) unless all three files are written at once
+        monkeypatch.setattr(db, "_client", client)
+        counts = extract_square(SOURCES_DIR / "square", workers=3)
+        keys = _keys(client)
+        assert len(keys) == len(set(keys)) == sum(counts.values())
+        assert {entity for _, entity, _ in keys} == {"location", "order", "payment"}
+        assert not client.barrier.broken
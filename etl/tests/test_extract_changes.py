@@ -0,0 +1,80 @@
+"""Tests for extractors.changes - Uses REAL data from data/sources/*.json"""
+
+import json
+import pytest
+from etl.db.connection import db
+from etl.extractors.changes import ChangeTracker, content_hash
+from etl.extractors.extract_doordash import extract_doordash
+from .fakes import FakeClient
+from .fixtures import SOURCES_DIR
+
+
+def _record(entity_id, data):
+    return {"source_name": "doordash", "entity_type": "order", "source_entity_id": entity_id, "data": data}
+
+
+class TestContentHash:
+    """Test canonical hashing."""
+    
+    def test_key_order_does_not_matter(self):
+        assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    
+    def test_value_change_changes_hash(self):
+        assert content_hash({"a": 1}) != content_hash({"a": 2})
+    
+    def test_real_order_hash_is_stable(self, doordash_order):
+        assert content_hash(doordash_order) == content_hash(json.loads(json.dumps(doordash_order)))
+
+
+class TestChangeTracker:
+    """Test unchanged entities are filtered."""
+    
+    def test_skips_unchanged_and_keeps_new_or_changed(self, doordash_order):
+        known = {("doordash", "order"): {"same": content_hash(doordash_order), "changed": "stale-hash"}}
+        tracker = ChangeTracker(client=None, known=known)
+        
+        kept = tracker.filter([
+            _record("same", doordash_order),
+            _record("changed", doordash_order),
+            _record("new", doordash_order),
+        ])
+        
+        assert [r["source_entity_id"] for r in kept] == ["changed", "new"]
+        assert all(r["content_hash"] == content_hash(doordash_order) for r in kept)
+        assert tracker.unchanged[("doordash", "order")] == 1
+
+
+class TestReExtract:
+    """Test a full (non-incremental) re-extract replaces rows instead of duplicating them."""
+    
+    def test_default_extract_upserts_on_natural_key(self, monkeypatch):
+        client = FakeClient()
+        monkeypatch.setattr(db, "_client", client)
+        first = extract_doordash(SOURCES_DIR / "doordash_orders.json")
+        raw_ids = {(r["entity_type"], r["source_entity_id"]): r["raw_id"] for r in client.tables["raw_data"]}
+        second = extract_doordash(SOURCES_DIR / "doordash_orders.json")
+        
+        assert first == second
+        assert len(client.tables["raw_data"]) == len(raw_ids) == sum(first.values())
+        assert {(r["entity_type"], r["source_entity_id"]): r["raw_id"] for r in client.tables["raw_data"]} == raw_ids
+    
+    def test_full_extract_keeps_hashes_current(self, monkeypatch, tmp_path):
+        """full -> incremental -> full -> incremental: the stored data always follows the last export."""
+        client = FakeClient()
+        monkeypatch.setattr(db, "_client", client)
+        original = json.loads((SOURCES_DIR / "doordash_orders.json").read_text(encoding="utf-8"))
+        edited = json.loads(json.dumps(original))
+        edited["orders"][0]["dasher_tip"] = edited["orders"][0].get("dasher_tip", 0) + 100
+        order_id = original["orders"][0]["external_delivery_id"]
+        path = tmp_path / "doordash_orders.json"
+        
+        def extract(export, incremental):
+            path.write_text(json.dumps(export), encoding="utf-8")
+            extract_doordash(path, tracker=ChangeTracker(client) if incremental else None)
+            [row] = [r for r in client.tables["raw_data"] if r["entity_type"] == "order" and r["source_entity_id"] == order_id]
+            return row["data"]
+        
+        assert extract(original, False) == original["orders"][0]
+        assert extract(edited, True) == edited["orders"][0]
+        assert extract(original, False) == original["orders"][0]
+        assert extract(edited, True) == edited["orders"][0]  # Stored hash is the original's again: not skipped
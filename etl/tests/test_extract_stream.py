@@ -0,0 +1,47 @@
+"""Tests for extractors.stream - Uses REAL data from data/sources/*.json"""
+
+import json
+import pytest
+from etl.extractors.changes import content_hash
+from etl.extractors.stream import iter_entities, stream_batches
+from etl.extractors.extract_doordash import ENTITIES as DOORDASH_ENTITIES
+from .fixtures import SOURCES_DIR
+
+
+class TestIterEntities:
+    """Test incremental entity reading matches json.load."""
+    
+    def test_yields_same_entities_as_json_load(self):
+        path = SOURCES_DIR / "toast_pos_export.json"
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        
+        streamed = list(iter_entities(path, ["locations", "orders"]))
+        expected = [("locations", e) for e in data["locations"]] + [("orders", e) for e in data["orders"]]
+        assert streamed == expected
+    
+    def test_missing_key_yields_nothing(self):
+        assert list(iter_entities(SOURCES_DIR / "square" / "locations.json", ["orders"])) == []
+
+
+class TestStreamBatches:
+    """Test raw_data record batching."""
+    
+    def test_batches_respect_size(self):
+        batches = list(stream_batches(SOURCES_DIR / "doordash_orders.json", "doordash", DOORDASH_ENTITIES, batch_size=5))
+        assert all(len(records) <= 5 for _, records in batches)
+    
+    def test_records_have_raw_data_shape(self):
+        path = SOURCES_DIR / "doordash_orders.json"
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        
+        records = [r for _, batch in stream_batches(path, "doordash", DOORDASH_ENTITIES, batch_size=7) for r in batch]
+        assert len(records) == len(data["stores"]) + len(data["orders"])
+        assert records[0] == {
+            "source_name": "doordash",
+            "entity_type": "location",
+            "source_entity_id": data["stores"][0]["store_id"],
+            "data": data["stores"][0],
+            "content_hash": content_hash(data["stores"][0]),
+        }
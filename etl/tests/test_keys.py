@@ -0,0 +1,95 @@
+"""Tests for transformers.keys - Deterministic UUIDv5 key strategy."""
+
+import uuid
+import pytest
+from etl.config import Config
+from etl.db.connection import db
+from etl.db.sqlite import SQLiteClient
+from etl.transformers.keys import DerivedLookup, derive_key, stamp_keys, KEY_NAMESPACE
+from etl.transformers.utils import build_location_lookup, build_order_lookup
+from etl.transformers.transform_locations import transform_locations
+from etl.transformers.transform_orders import extract_doordash, transform_orders
+from etl.transformers.utils import batch_upsert
+from .test_transform_fused import _raw_rows
+
+
+@pytest.fixture
+def uuid5_strategy(monkeypatch):
+    monkeypatch.setattr(Config, "KEY_STRATEGY", "uuid5")
+
+
+class TestDeriveKey:
+    """Test key derivation is stable and collision-free across kinds/sources."""
+    
+    def test_matches_uuid5_of_name(self):
+        expected = str(uuid.uuid5(KEY_NAMESPACE, "order:toast:abc"))
+        assert derive_key("order", "toast", "abc") == expected
+    
+    def test_same_inputs_same_key(self):
+        assert derive_key("order", "square", "o1") == derive_key("order", "square", "o1")
+    
+    def test_kind_and_source_are_part_of_key(self):
+        keys = {derive_key(k, s, "1") for k in ("location", "order") for s in ("doordash", "square", "toast")}
+        assert len(keys) == 6
+
+
+class TestDerivedLookup:
+    """Test the lookup replacement behaves like the DB-built dict."""
+    
+    def test_getitem_derives_key(self):
+        assert DerivedLookup("location")[("doordash", "str_1")] == derive_key("location", "doordash", "str_1")
+    
+    def test_missing_source_id_raises_key_error(self):
+        with pytest.raises(KeyError):
+            DerivedLookup("order")[("square", None)]
+    
+    def test_lookups_skip_db_round_trip(self, uuid5_strategy):
+        # client=None would fail on any DB call
+        assert isinstance(build_location_lookup(None), DerivedLookup)
+        assert isinstance(build_order_lookup(None), DerivedLookup)
+    
+    def test_order_location_matches_location_key(self, uuid5_strategy, doordash_order):
+        order = extract_doordash(doordash_order, build_location_lookup(None))
+        assert order["location_id"] == derive_key("location", "doordash", doordash_order["store_id"])
+
+
+class TestStampKeys:
+    """Test primary keys are set only under the uuid5 strategy."""
+    
+    def test_stamps_order_item_ids(self, uuid5_strategy):
+        records = stamp_keys("order_items", [{"source_name": "toast", "source_order_item_id": "sel1"}])
+        assert records[0]["order_item_id"] == derive_key("order_item", "toast", "sel1")
+    
+    def test_lookup_strategy_leaves_records_untouched(self, monkeypatch):
+        monkeypatch.setattr(Config, "KEY_STRATEGY", "lookup")
+        records = stamp_keys("orders", [{"source_name": "toast", "source_order_id": "o1"}])
+        assert "order_id" not in records[0]
+
+
+class TestMissingParents:
+    """Test a derived key whose parent was never written is one row error, not a failed page (FKs enforced by SQLite)."""
+    
+    @pytest.fixture
+    def local(self, uuid5_strategy, monkeypatch, tmp_path):
+        client = SQLiteClient(tmp_path / "keys.db")
+        monkeypatch.setattr(db, "_client", client)
+        yield client
+        client.close()
+    
+    def test_orphaned_orders_counted_as_errors(self, local):
+        raw = _raw_rows()
+        store = next(r["source_entity_id"] for r in raw if r["source_name"] == "doordash" and r["entity_type"] == "location")
+        local.table("raw_data").upsert([r for r in raw if r["source_entity_id"] != store]).execute()
+        transform_locations()
+        
+        orphans = sum(1 for r in raw if r["entity_type"] == "order" and r["data"].get("store_id") == store)
+        orders = sum(1 for r in raw if r["entity_type"] == "order")
+        counts = transform_orders()
+        
+        assert orphans and counts["errors"] == orphans
+        assert sum(v for k, v in counts.items() if k != "errors") == orders - orphans
+        assert len(local.table("orders").select("order_id").execute().data) == orders - orphans
+    
+    def test_other_errors_still_raise(self, local):
+        with pytest.raises(Exception):
+            batch_upsert(local, "orders", [{"source_name": "toast", "source_order_id": "1", "nope": 1}])
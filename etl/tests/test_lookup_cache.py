@@ -0,0 +1,87 @@
+"""Tests for transformers.lookup_cache - Snapshot persistence and watermark refresh."""
+
+import uuid
+import pytest
+from etl.config import Config
+from etl.transformers.lookup_cache import KeyLookup, LookupCache
+from etl.transformers.utils import build_location_lookup
+from .fakes import FakeClient
+
+OLD = "2025-01-01T00:00:00+00:00"
+
+
+def _order(source: str, source_id: str, updated: str = OLD) -> dict:
+    return {"order_id": str(uuid.uuid4()), "source_name": source, "source_order_id": source_id, "record_updated_at": updated}
+
+
+@pytest.fixture
+def client():
+    return FakeClient({"orders": [_order("toast", f"t{i}") for i in range(5)] + [_order("square", "s1")]})
+
+
+def _rows_read(client: FakeClient) -> int:
+    return sum(1 for op, table in client.requests if (op, table) == ("select", "orders"))
+
+
+class TestKeyLookup:
+    """Test the compact lookup behaves like the dict it replaces."""
+    
+    def test_dict_interface(self):
+        lookup, key = KeyLookup(), str(uuid.uuid4())
+        lookup.add("toast", "g1", key)
+        assert lookup[("toast", "g1")] == key
+        assert ("toast", "g1") in lookup and ("toast", "g2") not in lookup and ("square", "g1") not in lookup
+        assert lookup.get(("doordash", "x")) is None
+        assert len(lookup) == 1
+        with pytest.raises(KeyError):
+            lookup[("toast", "g2")]
+
+
+class TestLookupCache:
+    """Test snapshots survive restarts and refreshes read only changed rows."""
+    
+    def test_matches_full_read(self, client, tmp_path):
+        lookup = LookupCache(tmp_path).get(client, "orders")
+        assert {(o["source_name"], o["source_order_id"]): lookup[(o["source_name"], o["source_order_id"])]
+                for o in client.tables["orders"]} == {(o["source_name"], o["source_order_id"]): o["order_id"]
+                                                      for o in client.tables["orders"]}
+    
+    def test_refresh_reads_only_new_rows(self, client, tmp_path):
+        cache = LookupCache(tmp_path)
+        cache.get(client, "orders")
+        client.tables["orders"].append(_order("toast", "new", "2025-06-01T00:00:00+00:00"))
+        client.requests.clear()
+        
+        lookup = cache.get(client, "orders")
+        assert ("toast", "new") in lookup and len(lookup) == 7
+        assert _rows_read(client) == 2  # One row page + the empty terminating page
+        assert cache.watermarks["orders"] == "2025-06-01T00:00:00+00:00"
+    
+    def test_snapshot_survives_restart(self, client, tmp_path):
+        LookupCache(tmp_path).get(client, "orders")
+        client.tables["orders"].append(_order("doordash", "d1", "2025-06-01T00:00:00+00:00"))
+        
+        restarted = LookupCache(tmp_path)
+        lookup = restarted.get(client, "orders")
+        assert len(lookup) == 7
+        assert client.tables["orders"][-1]["order_id"] == lookup[("doordash", "d1")]
+    
+    def test_snapshot_of_other_database_ignored(self, client, tmp_path, monkeypatch):
+        LookupCache(tmp_path).get(client, "orders")
+        monkeypatch.setattr(Config, "SUPABASE_URL", "https://other.supabase.co")
+        lookup = LookupCache(tmp_path).get(FakeClient({"orders": [_order("toast", "only")]}), "orders")
+        assert len(lookup) == 1
+    
+    def test_invalidate_rebuilds(self, client, tmp_path):
+        cache = LookupCache(tmp_path)
+        cache.get(client, "orders")
+        client.tables["orders"] = client.tables["orders"][:1]  # Rows deleted
+        cache.invalidate("orders")
+        assert len(cache.get(client, "orders")) == 1
+        
+    def test_builder_uses_shared_cache(self, monkeypatch):
+        client = FakeClient({"locations": [{"location_id": str(uuid.uuid4()), "source_name": "toast",
+                                            "source_location_id": "r1", "updated_at": OLD}]})
+        assert build_location_lookup(client) is build_location_lookup(client)
+        monkeypatch.setattr(Config, "LOOKUP_CACHE", False)
+        assert isinstance(build_location_lookup(client), dict)
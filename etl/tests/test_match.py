@@ -0,0 +1,90 @@
+"""Tests for catalog.match - Cross-source product matching on the REAL item catalog."""
+
+import random
+import pytest
+from etl.catalog.match import NGramIndex, UnionFind, catalog_records, match_items
+from etl.catalog.match.core import canonical_id, jaccard, make_record, ngrams
+
+
+@pytest.fixture
+def matched(mock_item_catalog):
+    return match_items(catalog_records(mock_item_catalog))
+
+
+def _product(items: dict, source: str, name: str, catalog: dict) -> str:
+    item_id = next(i for i, v in catalog[source].items() if isinstance(v, dict) and v["name"] == name)
+    return items[(source, item_id)]
+
+
+class TestMatchItems:
+    """Test canonical product IDs across sources."""
+    
+    def test_same_product_across_sources(self, matched, mock_item_catalog):
+        items, _ = matched
+        ids = {_product(items, s, "Classic Burger", mock_item_catalog) for s in ("doordash", "square", "toast")}
+        assert ids == {canonical_id("Classic Burger")}
+    
+    def test_variants_stay_apart(self, matched, mock_item_catalog):
+        items, _ = matched
+        assert _product(items, "square", "Classic Burger Double", mock_item_catalog) != \
+            _product(items, "square", "Classic Burger", mock_item_catalog)
+        assert _product(items, "toast", "French Fries", mock_item_catalog) != \
+            _product(items, "doordash", "French Fries Large", mock_item_catalog)
+    
+    def test_every_item_assigned(self, matched, mock_item_catalog):
+        items, report = matched
+        assert len(items) == report["stats"]["items"] == sum(
+            isinstance(v, dict) for entries in mock_item_catalog.values() for v in entries.values())
+        assert {p for p in items.values()} == set(report["products"])
+    
+    def test_near_matches_reported_not_merged(self, matched):
+        _, report = matched
+        pairs = {(r["a"][2], r["b"][2]) for r in report["review"]}
+        assert ("Margherita Pizza", "Margherita Pizza Slice") in pairs
+        assert all(0.5 <= r["score"] < 0.85 for r in report["review"])
+    
+    def test_confidence(self, matched):
+        _, report = matched
+        for product in report["products"].values():
+            if len(product["members"]) == 1:
+                assert product["confidence"] is None
+            else:
+                assert 0.85 <= product["confidence"] <= 1.0
+
+
+class TestBlocking:
+    """Test the n-gram index finds every similar pair without comparing all pairs."""
+    
+    def _names(self, n: int) -> list:
+        rng = random.Random(3)
+        words = ["".join(rng.choice("abcdefghij") for _ in range(rng.randint(3, 7))) for _ in range(300)]
+        return [" ".join(rng.sample(words, 3)) for _ in range(n)]
+    
+    def test_prefix_filter_recall(self):
+        grams = [ngrams(name) for name in self._names(400)]
+        index = NGramIndex(grams, min_similarity=0.7)
+        for i in range(len(grams)):
+            found = set(index.candidates(i, limit=len(grams)))
+            for j in range(len(grams)):
+                if i != j and jaccard(grams[i], grams[j]) >= 0.7:
+                    assert j in found
+    
+    def test_sub_quadratic_comparisons(self):
+        names = self._names(1500)
+        records = [make_record(source, f"{source}{i}", name) for source in ("a", "b", "c") for i, name in enumerate(names)]
+        items, report = match_items(records)
+        n = len(records)
+        assert report["stats"]["comparisons"] < n * n / 50
+        assert all(items[("a", f"a{i}")] == items[("c", f"c{i}")] for i in range(len(names)))
+
+
+class TestUnionFind:
+    """Test clustering of accepted pairs."""
+    
+    def test_union_and_find(self):
+        sets = UnionFind(5)
+        sets.union(0, 1)
+        sets.union(3, 4)
+        sets.union(1, 4)
+        assert len({sets.find(i) for i in range(5)}) == 2
+        assert sets.find(0) == sets.find(3) != sets.find(2)
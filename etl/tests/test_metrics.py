@@ -0,0 +1,91 @@
+"""Tests for etl.metrics - Request tracing, step attribution across threads and run reports."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from etl import metrics
+from etl.db.reader import iter_rows
+from etl.db.writer import ChunkedWriter
+from .fakes import FakeClient
+
+
+@pytest.fixture
+def run():
+    return metrics.start_run("test", count_bytes=True)
+
+
+@pytest.fixture
+def client():
+    rows = [{"raw_id": i, "source_name": "toast", "entity_type": "order", "data": {"n": i}} for i in range(25)]
+    return metrics.instrument(FakeClient({"raw_data": rows}))
+
+
+class TestTracing:
+    """Test every execute() through the proxy is counted with rows and bytes."""
+    
+    def test_reads_count_rows_in(self, run, client):
+        with run.step("read"):
+            rows = list(iter_rows(client, "raw_data", "raw_id, data", "raw_id", page_size=10))
+        stats = run.report()["steps"]["read"]
+        assert len(rows) == 25
+        assert stats["requests"] == 4  # 10 + 10 + 5 + empty page
+        assert stats["rows_in"] == 25 and stats["rows_out"] == 0
+        assert stats["bytes_received"] > 0
+        assert run.report()["tables"]["raw_data"]["requests"] == 4
+    
+    def test_writer_threads_attributed_to_step(self, run, client):
+        records = [{"raw_id": 100 + i, "entity_type": "order"} for i in range(30)]
+        with run.step("write"):
+            with ChunkedWriter(client, chunk_size=10, max_in_flight=3) as writer:
+                writer.write(records)
+        stats = run.report()["steps"]["write"]
+        assert stats["requests"] == 3
+        assert stats["rows_out"] == 30
+        assert stats["bytes_sent"] == sum(len(json.dumps(records[i:i + 10], separators=(",", ":"))) for i in (0, 10, 20))
+        assert "-" not in run.report()["steps"]
+    
+    def test_submit_carries_substep(self, run, client):
+        with run.step("outer"), metrics.step("lookups"):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                metrics.submit(pool, lambda: client.table("raw_data").select("raw_id").execute()).result()
+        assert run.report()["steps"]["outer/lookups"]["requests"] == 1
+    
+    def test_failed_request_counted(self, run, client):
+        with run.step("rpc"), pytest.raises(ValueError):
+            client.rpc("missing", {}).execute()
+        assert run.report()["steps"]["rpc"]["errors"] == 1
+    
+    def test_instrument_is_idempotent(self, client):
+        assert metrics.instrument(client) is client
+    
+    def test_bytes_not_measured_by_default(self, monkeypatch, client):
+        monkeypatch.setattr(metrics, "_json_size", lambda payload: pytest.fail("payload re-serialized"))
+        run = metrics.start_run("test")
+        with run.step("read"):
+            client.table("raw_data").select("raw_id, data").execute()
+        stats = run.report()["steps"]["read"]
+        assert stats["requests"] == 1 and stats["rows_in"] == 25
+        assert stats["bytes_received"] is None and "MB" not in run.summary_lines()[0]
+        assert "etl_step_bytes_sent" not in run.prometheus().replace("# TYPE etl_step_bytes_sent gauge", "")
+
+
+class TestReport:
+    """Test the JSON report and Prometheus text output."""
+    
+    def test_step_times_and_memory(self, run):
+        with run.step("parse"):
+            sum(i * i for i in range(10000))
+        stats = run.report()["steps"]["parse"]
+        assert stats["wall_s"] >= stats["cpu_s"] > 0
+        if metrics.resource is not None:
+            assert stats["peak_rss_mb"] > 0
+    
+    def test_save_writes_json_and_prometheus(self, run, client, tmp_path):
+        with run.step("read"):
+            client.table("raw_data").select("raw_id").execute()
+        path = run.save(tmp_path, prometheus=tmp_path / "etl.prom")
+        assert json.loads(path.read_text())["steps"]["read"]["rows_in"] == 25
+        assert (tmp_path / "test-latest.json").exists()
+        prom = (tmp_path / "etl.prom").read_text()
+        assert '# TYPE etl_step_requests gauge' in prom
+        assert 'etl_step_requests{run="test",step="read"} 1' in prom
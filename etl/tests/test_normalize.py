@@ -0,0 +1,61 @@
+"""Tests for catalog.normalize - Single-pass normalizer must match the sequential reference exactly."""
+
+import random
+import pytest
+from etl.catalog.extract import extract_doordash, extract_square, extract_toast
+from etl.catalog.normalize import normalize_item_name, normalize_many
+from etl.catalog.normalize.config import ABBREVIATIONS, NAME_TYPOS
+from etl.catalog.normalize.core import normalize_item_name_sequential
+from .fixtures import SOURCES_DIR
+
+# Tokens that exercise every pattern and the boundaries between them
+TOKENS = [
+    *NAME_TYPOS, *ABBREVIATIONS, *(k.upper() for k in ABBREVIATIONS), "Dbl Shot", "ſm", "Kg",
+    "12pcs", "6PCS", "3Pcs", "x12pcs", "12pcsx", "lg12pcs", "Fries", "Coke", "Hashbrowns", "BBQ", "12PC",
+    "and", "OF", "the", "Burger", "coffee", "Griledd", "Lgs", "_reg", "reg_", "café", "",
+]
+SEPARATORS = [" ", "  ", "&", " & ", "-", " - ", "\t", "\xa0", " ", "\x1f", "/", ""]
+
+
+def _real_names() -> list:
+    dd_names, _ = extract_doordash(SOURCES_DIR / "doordash_orders.json")
+    sq_names, *_ = extract_square(SOURCES_DIR / "square" / "catalog.json", SOURCES_DIR / "square" / "orders.json")
+    toast_names, _ = extract_toast(SOURCES_DIR / "toast_pos_export.json")
+    return [*dd_names.values(), *sq_names.values(), *toast_names.values()]
+
+
+def _synthetic_names(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(TOKENS) + rng.choice(SEPARATORS) for _ in range(rng.randint(1, 6)))
+        for _ in range(n)
+    ]
+
+
+class TestMatchesReference:
+    """Test output is identical to the one-pattern-at-a-time normalizer."""
+    
+    def test_real_source_names(self):
+        names = _real_names()
+        assert names
+        for name in names:
+            assert normalize_item_name(name) == normalize_item_name_sequential(name), name
+    
+    def test_synthetic_names(self):
+        for name in _synthetic_names(20000):
+            assert normalize_item_name(name) == normalize_item_name_sequential(name), repr(name)
+    
+    @pytest.mark.parametrize("value", [None, "", "  ", 0, 12, 1.5, True, ["lg"]])
+    def test_non_string_inputs(self, value):
+        assert normalize_item_name(value) == normalize_item_name_sequential(value)
+
+
+class TestNormalizeMany:
+    """Test the batch API and memo."""
+    
+    def test_matches_single_calls(self):
+        names = _synthetic_names(500) * 3
+        assert normalize_many(names) == [normalize_item_name_sequential(n) for n in names]
+    
+    def test_equal_but_different_types_not_shared(self):
+        assert normalize_many([1, True, 1.0]) == ["1", "True", "1.0"]
@@ -0,0 +1,130 @@
+"""Tests for db.postgres - COPY + merge upserts with PostgREST upsert semantics."""
+
+import os
+import pytest
+from etl.db import postgres
+from etl.db.connection import DatabaseConnection
+from etl.db.postgres import CopyLoader, PostgresClient, _timestamp
+from etl.db.writer import ChunkedWriter
+from .fakes import FakeClient
+from .test_transform_fused import _raw_rows
+
+# Local Postgres for the load tests, e.g. postgresql://postgres@localhost/postgres
+TEST_DSN = os.getenv("ETL_TEST_DATABASE_URL", "")
+
+needs_postgres = pytest.mark.skipif(postgres.psycopg is None or not TEST_DSN, reason="needs psycopg and ETL_TEST_DATABASE_URL")
+
+SCHEMA_SQL = """
+CREATE TABLE raw_data (raw_id uuid PRIMARY KEY DEFAULT gen_random_uuid(), source_name text NOT NULL, entity_type text NOT NULL,
+    source_entity_id text NOT NULL, data jsonb NOT NULL, content_hash text, created_at timestamptz NOT NULL DEFAULT now(),
+    UNIQUE (source_name, entity_type, source_entity_id));
+CREATE TABLE orders (order_id uuid PRIMARY KEY DEFAULT gen_random_uuid(), source_name text NOT NULL, source_order_id text NOT NULL,
+    created_at timestamptz, status text, total_amount bigint, metadata jsonb);
+"""
+
+
+def _count(loader: CopyLoader, table: str) -> int:
+    """Rows of `table` as another session sees them (committed only)."""
+    import psycopg
+
+    with psycopg.connect(loader.dsn) as conn:
+        return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+class RecordingLoader:
+    def __init__(self):
+        self.calls = []
+
+    def upsert(self, table, records, on_conflict=None):
+        self.calls.append((table, len(records), on_conflict))
+        return records
+
+
+class TestRouting:
+    """Test only bulk upserts into COPY_TABLES leave the REST client."""
+
+    def test_upserts_go_to_loader(self):
+        loader, rest = RecordingLoader(), FakeClient()
+        client = PostgresClient(rest, loader)
+        client.table("raw_data").upsert([{"source_name": "toast"}], on_conflict="source_name").execute()
+        client.table("orders").upsert({"source_order_id": "1"}).execute()
+        assert loader.calls == [("raw_data", 1, "source_name"), ("orders", 1, None)]
+        assert rest.requests == []
+
+    def test_everything_else_goes_to_rest(self):
+        loader, rest = RecordingLoader(), FakeClient({"orders": [{"order_id": "a"}]})
+        client = PostgresClient(rest, loader)
+        assert client.table("orders").select("order_id").execute().data == [{"order_id": "a"}]
+        client.table("locations").upsert([{"location_id": "l"}]).execute()
+        client.rpc("refresh_gold_views", {}).execute()
+        assert loader.calls == []
+        assert rest.requests == [("select", "orders"), ("upsert", "locations"), ("rpc", "refresh_gold_views")]
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown backend"):
+            DatabaseConnection(backend="odbc")
+
+    def test_timestamps_parsed_for_binary_copy(self):
+        assert _timestamp("2025-01-01T10:00:00Z").utcoffset().total_seconds() == 0
+        assert _timestamp(None) is None
+
+
+@pytest.fixture
+def loader():
+    """CopyLoader on a scratch schema."""
+    import psycopg
+    from psycopg.conninfo import make_conninfo
+
+    schema = f"copy_test_{os.getpid()}"
+    with psycopg.connect(TEST_DSN, autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA {schema}")
+        conn.execute(f"SET search_path = {schema}, public")
+        conn.execute(SCHEMA_SQL)
+        loader = CopyLoader(make_conninfo(TEST_DSN, options=f"-csearch_path={schema},public"))
+        yield loader
+        loader.close()
+        conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+@needs_postgres
+class TestCopyUpsert:
+    """Test COPY + merge matches PostgREST upsert semantics."""
+
+    def test_inserts_with_defaults(self, loader):
+        rows = loader.upsert("orders", [{"source_name": "toast", "source_order_id": "1", "created_at": "2025-01-01T10:00:00Z"}])
+        assert len(rows) == 1 and len(rows[0]["order_id"]) == 36
+        assert rows[0]["created_at"].startswith("2025-01-01T10:00:00")
+
+    def test_conflict_updates_sent_columns(self, loader):
+        [row] = loader.upsert("orders", [{"source_name": "toast", "source_order_id": "1", "status": "completed", "total_amount": 5}])
+        [updated] = loader.upsert("orders", [{"order_id": row["order_id"], "source_name": "toast", "source_order_id": "1",
+                                              "status": "voided", "metadata": {"paid_date": "x"}}])
+        assert updated["order_id"] == row["order_id"]
+        assert (updated["status"], updated["metadata"], updated["total_amount"]) == ("voided", {"paid_date": "x"}, 5)
+
+    def test_missing_keys_are_null(self, loader):
+        rows = loader.upsert("orders", [{"source_name": "a", "source_order_id": "1", "status": "completed"},
+                                        {"source_name": "a", "source_order_id": "2"}])
+        assert [r["status"] for r in rows] == ["completed", None]
+
+    def test_unknown_column_rejected(self, loader):
+        with pytest.raises(ValueError, match="nope"):
+            loader.upsert("orders", [{"source_name": "a", "source_order_id": "1", "nope": 1}])
+
+    def test_raw_data_natural_key_through_writer(self, loader):
+        raw = [{k: v for k, v in r.items() if k != "raw_id"} for r in _raw_rows()]
+        client = PostgresClient(FakeClient(), loader)
+        for _ in range(2):  # Re-extract: same rows, no duplicates
+            with ChunkedWriter(client, chunk_size=50, on_conflict="source_name,entity_type,source_entity_id") as writer:
+                writer.write(raw)
+        assert _count(loader, "raw_data") == len(raw)
+        assert sum(writer.written.values()) == len(raw)
+
+    def test_each_upsert_committed(self, loader):
+        for n in range(1, 4):  # Same thread, same connection: staging table dropped at every commit
+            loader.upsert("orders", [{"source_name": "toast", "source_order_id": str(n)}])
+            assert _count(loader, "orders") == n
+
+    def test_raw_data_not_returned(self, loader):
+        rows = loader.upsert("raw_data", [{"source_name": "toast", "entity_type": "order", "source_entity_id": "1", "data": {"guid": "1"}}])
+        assert rows == [] and _count(loader, "raw_data") == 1
@@ -0,0 +1,117 @@
+"""Tests for db.reader keyset pagination and JSON projection - Uses an in-memory fake client."""
+
+import json
+import pytest
+from etl.db.reader import iter_pages, iter_rows, iter_raw_data, iter_raw_projected, json_columns, merge_paths, unflatten
+from etl.transformers.transform_orders import EXTRACTORS as ORDER_EXTRACTORS, PATHS as ORDER_PATHS
+from etl.transformers.transform_order_items import PATHS as ITEM_PATHS
+from etl.transformers.transform_enriched_orders import PATHS as METADATA_PATHS
+from etl.transformers.transform_locations import EXTRACTORS as LOCATION_EXTRACTORS, PATHS as LOCATION_PATHS
+from etl.transformers.transform_fused import PATHS as FUSED_PATHS, extract_items, extract_metadata, source_order_id
+from .fakes import FakeClient
+from .test_transform_fused import _raw_rows as _real_raw_rows
+
+
+def _raw_rows(n):
+    return [
+        {"raw_id": f"{i:04d}", "source_name": "doordash" if i % 2 else "toast",
+         "entity_type": "order" if i % 3 else "location", "data": {"n": i}}
+        for i in range(n)
+    ]
+
+
+class _Echo(dict):
+    """Lookup that answers every key with the key itself, so extractor output shows which key was looked up."""
+    
+    def __missing__(self, key):
+        return key
+    
+    def get(self, key, default=None):
+        return key
+
+
+# What each transform reads from a raw document (lookups echoed; Square prices empty so items fall back to the document)
+READERS = {
+    "orders": lambda source, data: ORDER_EXTRACTORS[source](data, _Echo()),
+    "order_items": lambda source, data: extract_items(source, data, "order", _Echo(), {}),
+    "metadata": lambda source, data: extract_metadata(source, data, {}),
+    "fused": lambda source, data: (ORDER_EXTRACTORS[source](data, _Echo()), extract_metadata(source, data, {}),
+                                   extract_items(source, data, "order", _Echo(), {}), source_order_id(data)),
+    "locations": lambda source, data: (*LOCATION_EXTRACTORS[source](data), data["name"], data.get("timezone", "")),
+}
+
+
+class TestKeysetPagination:
+    """Test full scans are complete, ordered and bounded per page."""
+    
+    @pytest.mark.parametrize("prefetch", [True, False])
+    def test_reads_every_row_once(self, prefetch):
+        client = FakeClient({"raw_data": _raw_rows(25)})
+        pages = list(iter_pages(client, "raw_data", "raw_id, data", "raw_id", page_size=10, prefetch=prefetch))
+        
+        assert [len(p) for p in pages] == [10, 10, 5]
+        assert [r["data"]["n"] for p in pages for r in p] == list(range(25))
+    
+    def test_server_row_cap_below_page_size_is_not_truncated(self):
+        client = FakeClient({"raw_data": _raw_rows(25)}, max_rows=7)
+        
+        rows = list(iter_rows(client, "raw_data", "raw_id", "raw_id", page_size=10))
+        assert len(rows) == 25
+    
+    def test_empty_table_yields_nothing(self):
+        assert list(iter_pages(FakeClient(), "raw_data", "raw_id", "raw_id")) == []
+
+
+class TestRawDataFilters:
+    """Test server-side entity/source filters."""
+    
+    def test_filters_by_entity_type_and_source(self):
+        rows = _raw_rows(30)
+        client = FakeClient({"raw_data": rows})
+        
+        got = [r["raw_id"] for page in iter_raw_data(client, "order", source="doordash", page_size=4) for r in page]
+        expected = [r["raw_id"] for r in rows if r["entity_type"] == "order" and r["source_name"] == "doordash"]
+        assert got == expected
+
+
+class TestProjection:
+    """Test JSON path projection rebuilds what the extractors read, from far fewer bytes (REAL data)."""
+    
+    def test_json_columns(self):
+        assert json_columns(("guid", "checks.0.payments.0")) == "p0:data->guid, p1:data->checks->0->payments->0"
+    
+    def test_unflatten_rebuilds_nesting_and_drops_nulls(self):
+        row = {"p0": "g1", "p1": {"type": "CREDIT"}, "p2": None, "p3": 5}
+        data = unflatten(row, ("guid", "checks.0.payments.0", "paidDate", "diningOption.size"))
+        assert data == {"guid": "g1", "checks": [{"payments": [{"type": "CREDIT"}]}], "diningOption": {"size": 5}}
+    
+    def test_merge_paths_drops_covered_paths(self):
+        assert merge_paths(("guid", "checks"), ("checks.0.payments.0", "paidDate")) == ("guid", "checks", "paidDate")
+    
+    def test_filters_by_source_server_side(self):
+        client = FakeClient({"raw_data": _real_raw_rows()})
+        pages = list(iter_raw_projected(client, "order", {"square": ("id",)}))
+        assert {r["source_name"] for page in pages for r in page} == {"square"}
+        assert all(set(r["data"]) == {"id"} for page in pages for r in page)
+    
+    @pytest.mark.parametrize("reader,paths,entity_type", [
+        ("orders", ORDER_PATHS, "order"), ("order_items", ITEM_PATHS, "order"), ("metadata", METADATA_PATHS, "order"),
+        ("fused", FUSED_PATHS, "order"), ("locations", LOCATION_PATHS, "location"),
+    ])
+    def test_paths_cover_every_field_read(self, reader, paths, entity_type):
+        """The transform's extractors give the same output on the projected document as on the full one."""
+        rows = [r for r in _real_raw_rows() if r["entity_type"] == entity_type]
+        client = FakeClient({"raw_data": rows})
+        projected = {r["raw_id"]: r["data"] for page in iter_raw_projected(client, entity_type, paths) for r in page}
+        assert len(projected) == len(rows)
+        for row in rows:
+            assert READERS[reader](row["source_name"], projected[row["raw_id"]]) == READERS[reader](row["source_name"], row["data"])
+    
+    def test_metadata_projection_is_a_fraction_of_the_document(self):
+        rows = [r for r in _real_raw_rows() if r["entity_type"] == "order" and r["source_name"] == "toast"]
+        client = FakeClient({"raw_data": rows})
+        full = sum(len(json.dumps(r["data"])) for page in iter_raw_data(client, "order", source="toast") for r in page)
+        projected = sum(len(json.dumps(r["data"])) for page in iter_raw_projected(
+            client, "order", {"toast": METADATA_PATHS["toast"]}) for r in page)
+        assert projected * 5 < full
+
@@ -0,0 +1,78 @@
+"""Tests for transformers.scheduler - Dependency order, concurrency, subgraph selection and critical path."""
+
+import threading
+import pytest
+from etl.transformers.run import GRAPH
+from etl.transformers.scheduler import critical_path, run_graph, select_steps
+
+
+def _graph(log: list, events: dict = None, fail: str = None) -> dict:
+    """Same shape as run.GRAPH with recording steps."""
+    def step(name):
+        def run():
+            if events and name in events:
+                events[name].set()
+                other = "metadata" if name == "order_items" else "order_items"
+                assert events[other].wait(timeout=5), f"{name} never overlapped {other}"
+            if name == fail:
+                raise RuntimeError(f"{name} failed")
+            log.append(name)
+            return {"total": 1}
+        return run
+    return {name: (step(name), deps) for name, (_, deps) in GRAPH.items()}
+
+
+class TestRunGraph:
+    """Test steps run after their dependencies and independent steps overlap."""
+    
+    def test_respects_dependencies(self):
+        log = []
+        results, durations = run_graph(_graph(log), workers=1)
+        for name, (_, deps) in GRAPH.items():
+            assert all(log.index(dep) < log.index(name) for dep in deps)
+        assert log[-1] == "rollups"
+        assert set(results) == set(durations) == set(GRAPH)
+    
+    def test_independent_steps_run_concurrently(self):
+        # Each of order_items/metadata blocks until the other has started: deadlocks if run serially
+        events = {"order_items": threading.Event(), "metadata": threading.Event()}
+        log = []
+        run_graph(_graph(log, events), workers=2)
+        assert set(log) == set(GRAPH)
+    
+    def test_failure_skips_dependents(self):
+        log = []
+        with pytest.raises(RuntimeError, match="orders failed"):
+            run_graph(_graph(log, fail="orders"))
+        assert set(log) == {"locations", "items"}
+
+
+class TestSelectSteps:
+    """Test --only/--from subgraph selection."""
+    
+    def test_default_is_whole_graph(self):
+        assert select_steps(GRAPH) == set(GRAPH)
+    
+    def test_from_includes_downstream(self):
+        assert select_steps(GRAPH, start_from="orders") == {"orders", "order_items", "metadata", "rollups"}
+        assert select_steps(GRAPH, start_from="metadata") == {"metadata", "rollups"}
+    
+    def test_only_runs_exactly_those(self):
+        log = []
+        run_graph(_graph(log), select_steps(GRAPH, only=["metadata"]))
+        assert log == ["metadata"]
+    
+    def test_unknown_step(self):
+        with pytest.raises(ValueError, match="Unknown step"):
+            select_steps(GRAPH, only=["nope"])
+
+
+class TestCriticalPath:
+    """Test the longest dependent chain is reported."""
+    
+    def test_longest_branch(self):
+        durations = {"locations": 1.0, "orders": 2.0, "order_items": 5.0, "metadata": 3.0}
+        assert critical_path(GRAPH, durations) == (8.0, ["locations", "orders", "order_items"])
+    
+    def test_partial_run_counts_only_selected(self):
+        assert critical_path(GRAPH, {"metadata": 3.0}) == (3.0, ["metadata"])
@@ -0,0 +1,107 @@
+"""Tests for etl.sources - Shared parsed-source cache on the REAL exports."""
+
+import json
+import os
+import shutil
+import pytest
+from etl import sources
+from etl.extractors.stream import iter_entities
+from .fixtures import SOURCES_DIR
+
+
+@pytest.fixture
+def toast_copy(tmp_path):
+    """Copy of the real Toast export (own memo key) and an empty snapshot dir."""
+    path = tmp_path / "toast_pos_export.json"
+    shutil.copy(SOURCES_DIR / "toast_pos_export.json", path)
+    yield path, tmp_path / "snapshots"
+    sources.clear()
+
+
+def _decode_count(monkeypatch) -> list:
+    calls = []
+    loads = json.loads
+    monkeypatch.setattr(sources.json, "loads", lambda raw: calls.append(1) or loads(raw))
+    return calls
+
+
+class TestLoadJson:
+    """Test memo, snapshot reuse and invalidation."""
+    
+    def test_matches_json_load(self, toast_copy):
+        path, directory = toast_copy
+        with open(path, encoding="utf-8") as f:
+            assert sources.load_json(path, directory) == json.load(f)
+    
+    def test_decoded_once_per_process(self, toast_copy, monkeypatch):
+        path, directory = toast_copy
+        calls = _decode_count(monkeypatch)
+        first = sources.load_json(path, directory)
+        assert sources.load_json(path, directory) is first
+        assert calls == [1]
+    
+    def test_cold_start_reads_snapshot(self, toast_copy, monkeypatch):
+        path, directory = toast_copy
+        expected = sources.load_json(path, directory)
+        sources.clear()
+        calls = _decode_count(monkeypatch)
+        assert sources.load_json(path, directory) == expected
+        assert calls == []
+    
+    def test_touched_file_reuses_snapshot(self, toast_copy, monkeypatch):
+        path, directory = toast_copy
+        sources.load_json(path, directory)
+        sources.clear()
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        calls = _decode_count(monkeypatch)
+        sources.load_json(path, directory)
+        assert calls == []
+    
+    def test_changed_file_decoded_again(self, toast_copy):
+        path, directory = toast_copy
+        data = sources.load_json(path, directory)
+        changed = dict(data, orders=data["orders"][:1])
+        path.write_text(json.dumps(changed), encoding="utf-8")
+        assert len(sources.load_json(path, directory)["orders"]) == 1
+        sources.clear()
+        assert len(sources.load_json(path, directory)["orders"]) == 1
+
+
+class TestMemoBudget:
+    """Test the in-process memo stays within SOURCE_MEMO_MB of file size, least recently used evicted."""
+    
+    def test_least_recently_used_evicted(self, toast_copy, monkeypatch):
+        path, directory = toast_copy
+        other = path.with_name("doordash_orders.json")
+        shutil.copy(SOURCES_DIR / "doordash_orders.json", other)
+        monkeypatch.setattr(sources.Config, "SOURCE_MEMO_MB", (path.stat().st_size + other.stat().st_size - 1) / 2**20)
+        
+        sources.load_json(path, directory)
+        sources.load_json(other, directory)
+        assert sources.cached(other) is not None and sources.cached(path) is None
+        sources.load_json(path, directory)
+        assert sources.cached(path) is not None and sources.cached(other) is None
+    
+    def test_file_over_budget_not_kept(self, toast_copy, monkeypatch):
+        path, directory = toast_copy
+        monkeypatch.setattr(sources.Config, "SOURCE_MEMO_MB", 0)
+        assert sources.load_json(path, directory)["orders"]
+        assert sources.cached(path) is None
+
+
+class TestIterEntities:
+    """Test extractors stream with ijson and reuse only what is already decoded."""
+    
+    def test_streams_without_decoding(self, toast_copy, monkeypatch):
+        path, directory = toast_copy
+        calls = _decode_count(monkeypatch)
+        streamed = list(iter_entities(path, ("locations", "orders")))
+        assert streamed and calls == []
+        assert sources.cached(path) is None
+    
+    def test_cached_equals_streamed(self, toast_copy):
+        path, directory = toast_copy
+        streamed = list(iter_entities(path, ("locations", "orders")))
+        sources.load_json(path, directory)
+        assert list(iter_entities(path, ("locations", "orders"))) == streamed
@@ -0,0 +1,185 @@
+"""Tests for db.sqlite - Offline stand-in for Supabase; the whole pipeline on REAL data matches the fake client."""
+
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import pytest
+from etl import metrics
+from etl.db.connection import DatabaseConnection, db
+from etl.db.reader import iter_raw_projected
+from etl.db.sqlite import SQLiteClient
+from etl.extractors.changes import RAW_DATA_KEY
+from etl.extractors.extract_doordash import extract_doordash
+from etl.transformers.keys import KEY_COLUMNS
+from etl.transformers.lookup_cache import LookupCache
+from etl.transformers.run import transform_all
+from etl.transformers.transform_orders import PATHS as ORDER_PATHS
+from .fakes import FakeClient
+from .fixtures import SOURCES_DIR
+from .test_transform_fused import _raw_rows, _snapshot
+
+TABLES = ("raw_data", "locations", "items", "orders", "order_items")
+
+
+def _tables(client: SQLiteClient) -> FakeClient:
+    """Every core table as plain rows (FakeClient holds them for _snapshot); database-stamped columns dropped."""
+    rows = {t: client.table(t).select("*").execute().data for t in TABLES}
+    return FakeClient({t: [{k: v for k, v in r.items() if k != "record_created_at"} for r in rs] for t, rs in rows.items()})
+
+
+@pytest.fixture
+def local(tmp_path):
+    client = SQLiteClient(tmp_path / "local.db")
+    yield client
+    client.close()
+
+
+class TestQuerySurface:
+    """Test the PostgREST builder surface the pipeline uses."""
+
+    def test_upsert_select_filters(self, local):
+        local.table("raw_data").upsert([
+            {"source_name": "toast", "entity_type": "order", "source_entity_id": str(i), "data": {"n": i, "guid": f"g{i}"}}
+            for i in range(5)
+        ]).execute()
+        rows = local.table("raw_data").select("raw_id, data").eq("source_name", "toast").gte("data->>n", 3).order("raw_id").execute().data
+        assert sorted(r["data"]["n"] for r in rows) == [3, 4]
+        assert [r["raw_id"] for r in rows] == sorted(r["raw_id"] for r in rows)
+
+    def test_json_path_aliases(self, local):
+        local.table("raw_data").upsert({"source_name": "toast", "entity_type": "order", "source_entity_id": "1",
+                                        "data": {"guid": "g1", "checks": [{"payments": [{"type": "CREDIT"}]}]}}).execute()
+        [row] = local.table("raw_data").select("p0:data->guid, p1:data->checks->0->payments->0, p2:data->missing").execute().data
+        assert row == {"p0": "g1", "p1": {"type": "CREDIT"}, "p2": None}
+
+    def test_upsert_on_conflict_keeps_key(self, local):
+        item = {"source_name": "toast", "source_item_id": "itm_1", "item_name": "Burger", "category": "Burgers"}
+        [first] = local.table("items").upsert(item, on_conflict="source_name,source_item_id").execute().data
+        [second] = local.table("items").upsert({**item, "item_name": "Classic Burger"}, on_conflict="source_name,source_item_id").execute().data
+        assert second["item_key"] == first["item_key"] and second["item_name"] == "Classic Burger"
+        
+        # UUID keys generated for rows sent without one must not replace the stored key
+        raw = {"source_name": "toast", "entity_type": "order", "source_entity_id": "1", "data": {"guid": "1"}}
+        [first] = local.table("raw_data").upsert(raw, on_conflict=RAW_DATA_KEY).execute().data
+        [second] = local.table("raw_data").upsert({**raw, "data": {"guid": "1", "voided": True}}, on_conflict=RAW_DATA_KEY).execute().data
+        assert second["raw_id"] == first["raw_id"] and second["data"]["voided"]
+    
+    @pytest.mark.parametrize("table,row", [
+        ("locations", {"source_name": "toast", "source_location_id": "loc_1", "name": "Downtown"}),
+        ("orders", {"source_name": "toast", "source_order_id": "ord_1", "status": "completed"}),
+    ])
+    def test_upsert_on_source_key(self, local, table, row):
+        on_conflict = f"source_name,{KEY_COLUMNS[table][2]}"
+        [first] = local.table(table).upsert(row, on_conflict=on_conflict).execute().data
+        [second] = local.table(table).upsert(row, on_conflict=on_conflict).execute().data
+        assert second[KEY_COLUMNS[table][0]] == first[KEY_COLUMNS[table][0]]
+        assert len(local.table(table).select("*").execute().data) == 1
+
+    def test_update_stamps_and_returns_rows(self, local):
+        [order] = local.table("orders").upsert({"source_name": "toast", "source_order_id": "1", "tip_amount": 0}).execute().data
+        [updated] = local.table("orders").update({"metadata": {"a": 1}}).eq("order_id", order["order_id"]).execute().data
+        assert updated["metadata"] == {"a": 1}
+        assert updated["record_updated_at"] >= order["record_updated_at"]
+
+    def test_unknown_table_and_function(self, local):
+        with pytest.raises(ValueError, match="table"):
+            local.table("nope")
+        with pytest.raises(ValueError, match="function"):
+            local.rpc("nope", {}).execute()
+
+    def test_rejects_injected_identifiers(self, local):
+        with pytest.raises(ValueError):
+            local.table("orders").select("order_id; DROP TABLE orders").execute()
+
+
+@pytest.fixture
+def pipelines(monkeypatch, tmp_path):
+    """The full transform graph on the fake client and on SQLite, same raw rows."""
+    monkeypatch.setattr(metrics, "RUNS_DIR", tmp_path / "runs")
+    raw = _raw_rows()
+    fake = FakeClient({"raw_data": raw}, max_rows=10)
+    monkeypatch.setattr(db, "_client", fake)
+    transform_all()
+
+    local = SQLiteClient(tmp_path / "local.db")
+    local.table("raw_data").upsert(raw).execute()
+    monkeypatch.setattr(db, "_client", local)
+    from etl.transformers.lookup_cache import shared_cache
+    shared_cache().invalidate()  # Cached keys belong to the other database
+    results = transform_all()
+    yield fake, local, results
+    local.close()
+
+
+class TestOfflinePipeline:
+    """Test extraction and the whole transform graph run against SQLite."""
+
+    def test_same_core_rows_as_fake(self, pipelines):
+        fake, local, _ = pipelines
+        assert _snapshot(_tables(local)) == _snapshot(fake)
+
+    def test_rollups_built(self, pipelines):
+        _, local, results = pipelines
+        assert results["rollups"]["errors"] == 0
+        assert results["rollups"]["sales_daily"] > 0
+        daily = local.table("sales_daily").select("orders").execute().data
+        assert sum(r["orders"] for r in daily) == len(local.table("orders").select("order_id").execute().data)
+
+    @pytest.mark.parametrize("fused", [False, True])
+    def test_rerun_updates_in_place(self, pipelines, fused):
+        _, local, _ = pipelines
+        counts = lambda: {t: len(local.table(t).select("*").execute().data) for t in TABLES}
+        before = counts()
+        results = transform_all(fused=fused)
+        assert counts() == before
+        assert results["orders"]["errors"] == 0
+    
+    def test_rerun_without_changes_refreshes_no_rows(self, pipelines, monkeypatch):
+        """Unchanged rows keep their updated_at, so the lookup refreshes of a rerun read nothing."""
+        _, local, _ = pipelines
+        hour_ago = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        with local.lock, local.conn:  # As if written an hour ago: outside the cached watermarks' overlap
+            local.conn.execute("UPDATE locations SET updated_at = ?", (hour_ago,))
+            local.conn.execute("UPDATE orders SET record_updated_at = ?", (hour_ago,))
+        reads, refresh = [], LookupCache._refresh
+        monkeypatch.setattr(LookupCache, "_refresh", lambda self, client, name: reads.append(refresh(self, client, name)) or reads[-1])
+        transform_all()
+        assert reads and sum(reads) == 0
+        stamps = local.table("orders").select("record_updated_at").execute().data
+        assert {r["record_updated_at"] for r in stamps} == {hour_ago}
+    
+    def test_projected_reads(self, pipelines):
+        _, local, _ = pipelines
+        pages = list(iter_raw_projected(local, "order", ORDER_PATHS))
+        assert sum(len(p) for p in pages) == len(local.table("orders").select("order_id").execute().data)
+
+    def test_extract_into_sqlite(self, monkeypatch, local):
+        monkeypatch.setattr(db, "_client", local)
+        counts = extract_doordash(SOURCES_DIR / "doordash_orders.json")
+        stored = local.table("raw_data").select("entity_type").eq("source_name", "doordash").execute().data
+        assert counts["orders"] + counts["locations"] == len(stored) > 0
+
+
+class TestLazyConnection:
+    """Test importing the pipeline needs no Supabase credentials."""
+
+    def test_import_without_credentials(self):
+        env = {**os.environ, "SUPABASE_URL": "", "SUPABASE_KEY": ""}
+        root = Path(__file__).parent.parent.parent
+        result = subprocess.run([sys.executable, "-c", "import etl.transformers.run, etl.extractors.extract_all"],
+                                cwd=root, env=env, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+    def test_rest_client_validates_on_first_use(self, monkeypatch):
+        from etl.config import Config
+        monkeypatch.setattr(Config, "SUPABASE_URL", "")
+        conn = DatabaseConnection(backend="rest")
+        with pytest.raises(ValueError, match="SUPABASE_URL"):
+            conn.client
+
+    def test_sqlite_backend(self, tmp_path):
+        conn = DatabaseConnection(backend="sqlite", path=tmp_path / "offline.db")
+        conn.client.table("items").upsert({"source_name": "toast", "source_item_id": "x", "item_name": "X"}).execute()
+        assert (tmp_path / "offline.db").exists()
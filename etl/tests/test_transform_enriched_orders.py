@@ -2,7 +2,8 @@
 
 import pytest
 from etl.transformers.transform_enriched_orders import extract_doordash_metadata, extract_square_metadata, extract_toast_metadata
-from etl.transformers.utils import map_payment_type, normalize_card_brand
+from etl.transformers.utils import map_payment_type, normalize_card_brand, batch_update_metadata
+from .fakes import FakeClient
 
 
 class TestPaymentTypeMapping:
@@ -100,3 +101,53 @@ class TestToastMetadataExtraction:
         order_no_checks = {"paidDate": "2025-01-01T12:00:00Z"}
         meta = extract_toast_metadata(order_no_checks)
         assert meta == {"paid_date": "2025-01-01T12:00:00Z"}
+
+
+class TestBatchUpdateMetadata:
+    """Test bulk metadata writes."""
+    
+    def _client(self, n):
+        return FakeClient({"orders": [{"order_id": f"o{i}", "metadata": None} for i in range(n)]})
+    
+    def test_one_request_per_chunk(self):
+        client = self._client(25)
+        updates = [(f"o{i}", {"payment_type": "CARD"}) for i in range(25)]
+        
+        assert batch_update_metadata(client, updates, chunk_size=10) == 25
+        assert client.requests == [("rpc", "bulk_update_order_metadata")] * 3
+        assert all(o["metadata"] == {"payment_type": "CARD"} for o in client.tables["orders"])
+    
+    def test_skips_empty_metadata(self):
+        client = self._client(2)
+        assert batch_update_metadata(client, [("o0", {}), ("o1", {"paid_date": "x"})]) == 1
+        assert client.tables["orders"][0]["metadata"] is None
+    
+    def test_falls_back_to_per_row_updates(self):
+        client = self._client(3)
+        client.rpc = lambda fn, params: FakeClient.rpc(client, "missing_function", params)
+        
+        assert batch_update_metadata(client, [(f"o{i}", {"k": i}) for i in range(3)]) == 3
+        assert [o["metadata"] for o in client.tables["orders"]] == [{"k": 0}, {"k": 1}, {"k": 2}]
+    
+    def test_missing_function_asked_once_per_client(self):
+        client = self._client(4)
+        client.rpc = lambda fn, params: FakeClient.rpc(client, "missing_function", params)
+        batch_update_metadata(client, [("o0", {"k": 0}), ("o1", {"k": 1})], chunk_size=1)
+        batch_update_metadata(client, [("o2", {"k": 2}), ("o3", {"k": 3})], chunk_size=1)
+        assert client.requests.count(("rpc", "missing_function")) == 1
+        assert client.requests.count(("update", "orders")) == 4
+    
+    def test_timeout_is_raised_not_downgraded(self):
+        client = self._client(4)
+        calls = []
+        
+        def rpc(fn, params):
+            calls.append(fn)
+            if len(calls) == 2:
+                raise TimeoutError("canceling statement due to statement timeout")
+            return FakeClient.rpc(client, fn, params)
+        client.rpc = rpc
+        
+        with pytest.raises(TimeoutError):
+            batch_update_metadata(client, [(f"o{i}", {"k": i}) for i in range(4)], chunk_size=2)
+        assert ("update", "orders") not in client.requests
@@ -0,0 +1,84 @@
+"""Tests for transform_fused - Fused output must match the step-by-step pipeline on REAL data."""
+
+import pytest
+from etl.db.connection import db
+from etl.extractors.stream import stream_batches
+from etl.extractors.extract_doordash import ENTITIES as DOORDASH_ENTITIES
+from etl.extractors.extract_toast import ENTITIES as TOAST_ENTITIES
+from etl.extractors.extract_square import FILES as SQUARE_FILES
+from etl.transformers import transform_locations, transform_items, transform_orders, transform_order_items, transform_enriched_orders
+from etl.transformers.transform_fused import transform_orders_fused
+from etl.transformers.lookup_cache import shared_cache
+from .fakes import FakeClient
+from .fixtures import SOURCES_DIR
+
+
+def _raw_rows() -> list:
+    """raw_data rows for every real source file, as the extractors would write them."""
+    batches = list(stream_batches(SOURCES_DIR / "doordash_orders.json", "doordash", DOORDASH_ENTITIES))
+    batches += stream_batches(SOURCES_DIR / "toast_pos_export.json", "toast", TOAST_ENTITIES)
+    for name, (key, entity_type) in SQUARE_FILES.items():
+        batches += stream_batches(SOURCES_DIR / "square" / name, "square", {key: (entity_type, "id")})
+    return [{**r, "raw_id": f"{i:06d}"} for i, r in enumerate(r for _, batch in batches for r in batch)]
+
+
+def _snapshot(client: FakeClient) -> tuple:
+    """Orders and items keyed by source IDs (generated UUIDs and timestamps differ between runs)."""
+    catalog_ids = {i["item_key"]: (i["source_name"], i["source_item_id"]) for i in client.tables["items"]}
+    locations = {l["location_id"]: l["source_location_id"] for l in client.tables["locations"]}
+    source_ids = {o["order_id"]: (o["source_name"], o["source_order_id"]) for o in client.tables["orders"]}
+    orders = {
+        source_ids[o["order_id"]]: {**{k: v for k, v in o.items() if k not in ("order_id", "record_updated_at")}, "location_id": locations[o["location_id"]]}
+        for o in client.tables["orders"]
+    }
+    items = sorted(
+        (source_ids[i["order_id"]], i["source_order_item_id"], catalog_ids.get(i["item_key"]), i["quantity"], i["total_price"])
+        for i in client.tables["order_items"]
+    )
+    return orders, items
+
+
+@pytest.fixture
+def pipelines(monkeypatch):
+    """Runs the step-by-step and fused pipelines on separate fake databases."""
+    raw = _raw_rows()
+    stepwise, fused = FakeClient({"raw_data": raw}, max_rows=10), FakeClient({"raw_data": raw}, max_rows=10)
+    
+    monkeypatch.setattr(db, "_client", stepwise)
+    counts = {}
+    for name, step in (("locations", transform_locations), ("items", transform_items), ("orders", transform_orders),
+                       ("order_items", transform_order_items), ("metadata", transform_enriched_orders)):
+        counts[name] = step()
+    
+    monkeypatch.setattr(db, "_client", fused)
+    shared_cache().invalidate()  # Cached keys belong to the other database
+    transform_locations()
+    transform_items()
+    fused_counts = transform_orders_fused()
+    return stepwise, counts, fused, fused_counts
+
+
+class TestFusedMatchesStepwise:
+    """Test the fused scan produces identical core rows."""
+    
+    def test_same_counts(self, pipelines):
+        _, counts, _, fused_counts = pipelines
+        for name in ("orders", "order_items", "metadata"):
+            assert fused_counts[name] == counts[name]
+    
+    def test_same_orders_and_metadata(self, pipelines):
+        stepwise, _, fused, _ = pipelines
+        stepwise_orders, _ = _snapshot(stepwise)
+        fused_orders, _ = _snapshot(fused)
+        for order in stepwise_orders.values():
+            order.setdefault("metadata", None)
+        assert fused_orders == stepwise_orders
+    
+    def test_same_order_items(self, pipelines):
+        stepwise, _, fused, _ = pipelines
+        assert _snapshot(fused)[1] == _snapshot(stepwise)[1]
+    
+    def test_reads_raw_orders_once(self, pipelines):
+        stepwise, _, fused, _ = pipelines
+        order_pages = lambda c: sum(1 for op, table in c.requests if (op, table) == ("select", "raw_data"))
+        assert order_pages(fused) < order_pages(stepwise) / 2
@@ -0,0 +1,45 @@
+"""Tests for transform_items - Items dimension loaded from the REAL catalog."""
+
+import pytest
+from etl.db.connection import db
+from etl.transformers.transform_items import catalog_items, load_items, transform_items
+from .fakes import FakeClient
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(db, "_client", client)
+    return client
+
+
+class TestCatalogItems:
+    """Test catalog entries become items rows."""
+    
+    def test_one_row_per_catalog_entry(self, mock_item_catalog):
+        rows = catalog_items(mock_item_catalog)
+        assert len(rows) == 128
+        assert {r["source_name"] for r in rows} == {"doordash", "square", "toast"}
+    
+    def test_skips_comments(self, mock_item_catalog):
+        assert all(not r["source_item_id"].startswith("_") for r in catalog_items(mock_item_catalog))
+
+
+class TestLoadItems:
+    """Test integer keys are assigned once and survive reloads and renames."""
+    
+    def test_counts_per_source(self, fake_db):
+        assert transform_items() == {"doordash": 47, "square": 39, "toast": 42, "errors": 0}
+        assert all(isinstance(r["item_key"], int) for r in fake_db.tables["items"])
+    
+    def test_reload_keeps_keys(self, fake_db, mock_item_catalog):
+        first = load_items(fake_db, mock_item_catalog)
+        assert load_items(fake_db, mock_item_catalog) == first
+        assert len(fake_db.tables["items"]) == len(first)
+    
+    def test_rename_updates_one_row(self, fake_db, mock_item_catalog):
+        keys = load_items(fake_db, mock_item_catalog)
+        renamed = {"toast": {"itm_burger_001": {"name": "House Burger", "category": "Burgers"}}}
+        assert load_items(fake_db, renamed) == keys
+        row = next(r for r in fake_db.tables["items"] if r["item_key"] == keys[("toast", "itm_burger_001")])
+        assert row["item_name"] == "House Burger"
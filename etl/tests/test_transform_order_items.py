@@ -31,49 +31,60 @@ class TestItemInfoLookup:
 class TestDoorDashItemExtraction:
     """Test DoorDash order item extraction with REAL data."""
     
-    def test_extracts_items_from_order(self, doordash_order, mock_item_catalog):
-        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_catalog)
+    def test_extracts_items_from_order(self, doordash_order, mock_item_keys):
+        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_keys)
         
         # Should have same number of items as in order
         expected_count = len(doordash_order.get("order_items", []))
         assert len(items) == expected_count
     
-    def test_items_have_required_fields(self, doordash_order, mock_item_catalog):
-        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_catalog)
+    def test_items_have_required_fields(self, doordash_order, mock_item_keys):
+        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_keys)
         
         if items:
             required = ["order_id", "source_name", "source_order_item_id", 
-                       "item_name", "quantity", "unit_price", "total_price", "category"]
+                       "item_key", "quantity", "unit_price", "total_price"]
             for field in required:
                 assert field in items[0], f"Missing field: {field}"
     
-    def test_source_name_is_doordash(self, doordash_order, mock_item_catalog):
-        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_catalog)
+    def test_source_name_is_doordash(self, doordash_order, mock_item_keys):
+        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_keys)
         for item in items:
             assert item["source_name"] == "doordash"
     
-    def test_total_price_equals_qty_times_unit(self, doordash_order, mock_item_catalog):
-        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_catalog)
+    def test_total_price_equals_qty_times_unit(self, doordash_order, mock_item_keys):
+        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_keys)
         for item in items:
             assert item["total_price"] == item["quantity"] * item["unit_price"]
+    
+    def test_item_key_from_lookup(self, doordash_order, mock_item_keys):
+        items = extract_doordash_items(doordash_order, "test-order-uuid", mock_item_keys)
+        expected = [mock_item_keys.get(("doordash", i["item_id"])) for i in doordash_order["order_items"]]
+        assert [item["item_key"] for item in items] == expected
+        assert all(isinstance(k, int) for k in expected)
+    
+    def test_unknown_item_has_no_key(self, doordash_order):
+        items = extract_doordash_items(doordash_order, "test-order-uuid", {})
+        assert all(item["item_key"] is None for item in items)
+        assert all("item_name" not in item and "category" not in item for item in items)
 
 
 class TestSquareItemExtraction:
     """Test Square order item extraction with REAL data."""
     
-    def test_extracts_items_from_order(self, square_order, mock_item_catalog, mock_square_prices):
-        items = extract_square_items(square_order, "test-order-uuid", mock_item_catalog, mock_square_prices)
+    def test_extracts_items_from_order(self, square_order, mock_item_keys, mock_square_prices):
+        items = extract_square_items(square_order, "test-order-uuid", mock_item_keys, mock_square_prices)
         
         expected_count = len(square_order.get("line_items", []))
         assert len(items) == expected_count
     
-    def test_quantity_is_integer(self, square_order, mock_item_catalog, mock_square_prices):
-        items = extract_square_items(square_order, "test-order-uuid", mock_item_catalog, mock_square_prices)
+    def test_quantity_is_integer(self, square_order, mock_item_keys, mock_square_prices):
+        items = extract_square_items(square_order, "test-order-uuid", mock_item_keys, mock_square_prices)
         for item in items:
             assert isinstance(item["quantity"], int)
     
-    def test_source_name_is_square(self, square_order, mock_item_catalog, mock_square_prices):
-        items = extract_square_items(square_order, "test-order-uuid", mock_item_catalog, mock_square_prices)
+    def test_source_name_is_square(self, square_order, mock_item_keys, mock_square_prices):
+        items = extract_square_items(square_order, "test-order-uuid", mock_item_keys, mock_square_prices)
         for item in items:
             assert item["source_name"] == "square"
 
@@ -81,8 +92,8 @@ class TestSquareItemExtraction:
 class TestToastItemExtraction:
     """Test Toast order item extraction with REAL data."""
     
-    def test_extracts_items_from_nested_checks(self, toast_order, mock_item_catalog):
-        items = extract_toast_items(toast_order, "test-order-uuid", mock_item_catalog)
+    def test_extracts_items_from_nested_checks(self, toast_order, mock_item_keys):
+        items = extract_toast_items(toast_order, "test-order-uuid", mock_item_keys)
         
         # Count expected items across all checks
         expected_count = sum(
@@ -92,16 +103,16 @@ class TestToastItemExtraction:
         )
         assert len(items) == expected_count
     
-    def test_source_name_is_toast(self, toast_order, mock_item_catalog):
-        items = extract_toast_items(toast_order, "test-order-uuid", mock_item_catalog)
+    def test_source_name_is_toast(self, toast_order, mock_item_keys):
+        items = extract_toast_items(toast_order, "test-order-uuid", mock_item_keys)
         for item in items:
             assert item["source_name"] == "toast"
     
-    def test_items_have_required_fields(self, toast_order, mock_item_catalog):
-        items = extract_toast_items(toast_order, "test-order-uuid", mock_item_catalog)
+    def test_items_have_required_fields(self, toast_order, mock_item_keys):
+        items = extract_toast_items(toast_order, "test-order-uuid", mock_item_keys)
         
         if items:
             required = ["order_id", "source_name", "source_order_item_id",
-                       "item_name", "quantity", "unit_price", "total_price", "category"]
+                       "item_key", "quantity", "unit_price", "total_price"]
             for field in required:
                 assert field in items[0], f"Missing field: {field}"
@@ -0,0 +1,185 @@
+"""Tests for transformers.run - Full graph on REAL data, then the rollups and the gold view refresh."""
+
+import os
+import pytest
+from postgrest.exceptions import APIError
+from etl import metrics
+from etl.db.connection import db
+from etl.db.errors import MissingFunction
+from etl.schemas.core import SOURCE_KEYS_SQL
+from etl.schemas.functions import TOUCH_UPDATED_AT
+from etl.schemas.rollups import ROLLUP_TABLES_SQL, REFRESH_SALES_ROLLUPS
+from etl.schemas.views import MATERIALIZED_VIEWS
+from etl.transformers import elt
+from etl.transformers import run
+from etl.transformers.run import transform_all
+from etl.transformers.transform_rollups import transform_rollups
+from etl.transformers.utils import refresh_gold_views
+from .fakes import FakeClient
+from .test_elt import SCHEMA_SQL, TEST_DSN, needs_postgres
+from .test_transform_fused import _raw_rows
+
+
+@pytest.fixture
+def fake_db(monkeypatch, tmp_path):
+    client = FakeClient({"raw_data": _raw_rows()}, max_rows=10)
+    monkeypatch.setattr(db, "_client", client)
+    monkeypatch.setattr(metrics, "RUNS_DIR", tmp_path / "runs")
+    return client
+
+
+class TestGoldRefresh:
+    """Test materialized gold views are refreshed once, after every step."""
+    
+    def test_refreshed_after_graph(self, fake_db):
+        results = transform_all(fused=True)
+        assert fake_db.requests.count(("rpc", "refresh_gold_views")) == 1
+        assert fake_db.requests[-1] == ("rpc", "refresh_gold_views")
+        assert sum(v for k, v in results["order_items"].items() if k != "errors") > 0
+    
+    def test_no_refresh(self, fake_db):
+        transform_all(fused=True, refresh=False)
+        assert ("rpc", "refresh_gold_views") not in fake_db.requests
+    
+    def test_refresh_returns_timings(self, fake_db):
+        assert set(refresh_gold_views(fake_db)) == set(MATERIALIZED_VIEWS)
+    
+    def test_missing_function_is_not_fatal(self, capsys):
+        class NoFunctions(FakeClient):
+            def rpc(self, fn, params):
+                raise MissingFunction(fn)
+        assert refresh_gold_views(NoFunctions()) == {}
+        assert "refresh_gold_views unavailable" in capsys.readouterr().out
+    
+    def test_timeout_is_an_error(self, fake_db, monkeypatch):
+        def rpc(fn, params):
+            if fn == "refresh_gold_views":
+                raise APIError({"code": "57014", "message": "canceling statement due to statement timeout"})
+            return FakeClient.rpc(fake_db, fn, params)
+        monkeypatch.setattr(fake_db, "rpc", rpc)
+        with pytest.raises(APIError):
+            refresh_gold_views(fake_db)
+        assert transform_all(fused=True)["refresh_gold"] == {"errors": 1}
+
+
+class TestResults:
+    """Test every step's counts reach the results and the summary."""
+    
+    def test_fused_outputs_reported_per_table(self, fake_db):
+        results = transform_all(fused=True, refresh=False)
+        assert {"orders", "order_items", "metadata"} <= results.keys() and "orders_fused" not in results
+    
+    def test_empty_result_kept(self, fake_db, monkeypatch, capsys):
+        monkeypatch.setitem(run.GRAPH, "items", (lambda: {}, ()))
+        results = transform_all(refresh=False)
+        assert results["items"] == {}
+        assert "  items: 0" in capsys.readouterr().out
+
+
+class TestRollups:
+    """Test the rollup stage runs after metadata and surfaces refresh failures."""
+    
+    def test_runs_after_metadata(self, fake_db):
+        transform_all()
+        rpcs = [fn for op, fn in fake_db.requests if op == "rpc"]
+        assert rpcs[-2:] == ["refresh_sales_rollups", "refresh_gold_views"]
+        assert fake_db.requests.index(("rpc", "refresh_sales_rollups")) > fake_db.requests.index(("rpc", "bulk_update_order_metadata"))
+    
+    def test_missing_function_counts_error(self, monkeypatch, capsys):
+        class NoFunctions(FakeClient):
+            def rpc(self, fn, params):
+                raise MissingFunction(fn)
+        monkeypatch.setattr(db, "_client", NoFunctions())
+        assert transform_rollups()["errors"] == 1
+        assert "refresh_sales_rollups unavailable" in capsys.readouterr().out
+    
+    def test_timeout_fails_step(self, monkeypatch):
+        class SlowRollups(FakeClient):
+            def rpc(self, fn, params):
+                raise APIError({"code": "57014", "message": "canceling statement due to statement timeout"})
+        monkeypatch.setattr(db, "_client", SlowRollups())
+        with pytest.raises(APIError):
+            transform_rollups()
+
+
+@pytest.fixture
+def rollup_db(monkeypatch, tmp_path):
+    """Core tables written by the ELT engine on a scratch Postgres schema, rows backdated, rollups installed."""
+    import psycopg
+    from psycopg.conninfo import make_conninfo
+    from psycopg.types.json import Jsonb
+
+    monkeypatch.setattr(metrics, "RUNS_DIR", tmp_path / "runs")
+    schema = f"rollup_test_{os.getpid()}"
+    with psycopg.connect(TEST_DSN, autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA {schema}")
+        conn.execute(f"SET search_path = {schema}, public")
+        conn.execute("SET TimeZone = 'Asia/Kolkata'")  # Half-hour offset: rollups must not depend on the session zone
+        conn.execute(SCHEMA_SQL)
+        conn.execute(SOURCE_KEYS_SQL)
+        with conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO raw_data VALUES (%s, %s, %s, %s, %s, %s)",
+                [(r["raw_id"], r["source_name"], r["entity_type"], r["source_entity_id"], Jsonb(r["data"]), r.get("content_hash")) for r in _raw_rows()],
+            )
+        elt.run_elt(make_conninfo(TEST_DSN, options=f"-csearch_path={schema},public"), refresh=False)
+        # Written well before the first refresh (outside its overlap window)
+        conn.execute("UPDATE orders SET record_updated_at = now() - interval '1 hour'")
+        conn.execute("UPDATE order_items SET record_updated_at = now() - interval '1 hour'")
+        conn.execute(TOUCH_UPDATED_AT)
+        conn.execute(ROLLUP_TABLES_SQL)
+        conn.execute(REFRESH_SALES_ROLLUPS)
+        yield conn
+        conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+def _refresh(conn, full: bool) -> dict:
+    return conn.execute("SELECT refresh_sales_rollups(%s)", (full,)).fetchone()[0]
+
+
+def _rollups(conn) -> dict:
+    return {table: sorted(conn.execute(f"SELECT * FROM {table}").fetchall(), key=repr) for table in ("sales_daily", "sales_hourly", "item_sales_daily")}
+
+
+@needs_postgres
+class TestRefreshSalesRollups:
+    """Test schemas/rollups.py REFRESH_SALES_ROLLUPS on Postgres recomputes only changed partitions."""
+    
+    def test_full_refresh_covers_every_order(self, rollup_db):
+        full = _refresh(rollup_db, True)
+        assert full["full"] and full["partitions"] > 1 and full["sales_daily"] >= full["partitions"]
+        [(orders, total)] = rollup_db.execute("SELECT count(*), sum(total_amount) FROM orders").fetchall()
+        assert rollup_db.execute("SELECT sum(orders), sum(total_amount) FROM sales_daily").fetchone() == (orders, total)
+    
+    def test_incremental_partitions(self, rollup_db):
+        _refresh(rollup_db, True)
+        assert _refresh(rollup_db, False)["partitions"] == 0  # Nothing changed since
+        
+        rollup_db.execute("UPDATE orders SET tip_amount = tip_amount + 100, total_amount = total_amount + 100 "
+                          "WHERE order_id = (SELECT min(order_id::text)::uuid FROM orders)")
+        incremental = _refresh(rollup_db, False)
+        assert not incremental["full"] and incremental["partitions"] == 1
+        patched = _rollups(rollup_db)
+        _refresh(rollup_db, True)
+        assert patched == _rollups(rollup_db)
+    
+    def test_item_only_change(self, rollup_db):
+        _refresh(rollup_db, True)
+        before = _rollups(rollup_db)
+        order_id, location_id, day = rollup_db.execute(
+            "SELECT o.order_id, o.location_id, (o.created_at AT TIME ZONE 'UTC')::date FROM order_items oi "
+            "JOIN orders o USING (order_id) ORDER BY oi.order_item_id LIMIT 1").fetchone()
+        rollup_db.execute("UPDATE order_items SET quantity = quantity + 1, total_price = total_price + 250 "
+                          "WHERE order_item_id = (SELECT min(order_item_id::text)::uuid FROM order_items WHERE order_id = %s)", (order_id,))
+        assert _refresh(rollup_db, False)["partitions"] == 1
+        after = _rollups(rollup_db)
+        assert after["sales_daily"] == before["sales_daily"] and after["sales_hourly"] == before["sales_hourly"]
+        changed = set(after["item_sales_daily"]) ^ set(before["item_sales_daily"])
+        assert changed and {(row[0], row[1]) for row in changed} == {(day, location_id)}
+        [(quantity,)] = rollup_db.execute("SELECT sum(quantity) FROM item_sales_daily WHERE day = %s AND location_id = %s", (day, location_id)).fetchall()
+        assert quantity == sum(row[6] for row in before["item_sales_daily"] if (row[0], row[1]) == (day, location_id)) + 1
+    
+    def test_hours_are_utc(self, rollup_db):
+        _refresh(rollup_db, True)
+        assert rollup_db.execute("SELECT count(*) FROM sales_hourly WHERE date_trunc('hour', hour AT TIME ZONE 'UTC') <> hour AT TIME ZONE 'UTC'").fetchone()[0] == 0
+        assert rollup_db.execute("SELECT sum(orders) FROM sales_hourly").fetchone()[0] == rollup_db.execute("SELECT count(*) FROM orders").fetchone()[0]
@@ -0,0 +1,66 @@
+"""Tests for catalog/scripts/verify_all_items.py - Verification gate on the REAL catalog and sources."""
+
+import csv
+import json
+import pytest
+from etl.sources import load_json
+from .fixtures import SOURCES_DIR
+
+SCRIPTS_DIR = SOURCES_DIR.parent.parent / "catalog" / "scripts"
+
+
+@pytest.fixture
+def verify(monkeypatch):
+    monkeypatch.syspath_prepend(str(SCRIPTS_DIR))
+    import verify_all_items
+    return verify_all_items
+
+
+@pytest.fixture
+def broken_catalog(verify, tmp_path):
+    """Real catalog with one unknown ID, one wrong category and one dropped Toast item."""
+    catalog = json.loads(json.dumps(load_json(verify.CATALOG_PATH)))
+    catalog["doordash"]["dd_unknown"] = {"name": "Ghost Item", "category": "Entrees"}
+    square_id = next(k for k, v in catalog["square"].items() if isinstance(v, dict))
+    catalog["square"][square_id]["category"] = "Wrong Category"
+    toast_id = next(k for k, v in catalog["toast"].items() if isinstance(v, dict))
+    del catalog["toast"][toast_id]
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(catalog), encoding="utf-8")
+    return path, square_id, toast_id
+
+
+class TestVerifyCatalog:
+    """Test failures are found per source and the exit code gates on them."""
+    
+    def test_real_catalog_passes(self, verify, capsys):
+        assert verify.main([]) == 0
+        assert capsys.readouterr().out.strip().startswith("[SUCCESS] 128 items checked")
+    
+    def test_finds_each_failure_kind(self, verify, broken_catalog):
+        path, square_id, toast_id = broken_catalog
+        results = verify.verify_catalog(load_json(path))
+        assert results["doordash"]["errors"] == [("dd_unknown", "NOT FOUND in source")]
+        assert [e[0] for e in results["square"]["category_errors"]] == [square_id]
+        assert [m[0] for m in results["toast"]["missing"]] == [toast_id]
+        assert verify.summary(results) == {"checked": 128, "error": 1, "category": 1, "missing": 1, "passed": False}
+    
+    def test_prints_failures_only(self, verify, broken_catalog, capsys):
+        path, _, _ = broken_catalog
+        assert verify.main(["--catalog", str(path)]) == 1
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 4
+        assert not any(line.startswith("[OK]") for line in lines)
+    
+    def test_json_and_csv_reports(self, verify, broken_catalog, tmp_path):
+        path, _, _ = broken_catalog
+        verify.main(["--catalog", str(path), "--report", str(tmp_path / "report.json")])
+        verify.main(["--catalog", str(path), "--report", str(tmp_path / "report.csv")])
+        
+        report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+        assert report["summary"]["passed"] is False
+        assert report["sources"]["toast"]["missing"] == 1
+        with open(tmp_path / "report.csv", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert sorted(r["kind"] for r in rows) == ["category", "error", "missing"]
+        assert rows == report["failures"]
@@ -0,0 +1,112 @@
+"""Tests for db.writer.ChunkedWriter - Uses an in-memory fake client."""
+
+import threading
+import pytest
+from etl.config import Config
+from etl.db.errors import RetriesExhausted
+from etl.db.writer import ChunkedWriter
+
+
+class FakeClient:
+    """Records upsert calls; rejects any request containing a row with bad=True; times out the first `outages` requests."""
+    
+    def __init__(self, outages=0):
+        self.outages = outages
+        self.requests = []
+        self.rows = []
+        self._lock = threading.Lock()
+    
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+class _FakeQuery:
+    def __init__(self, client, name):
+        self.client, self.name, self.records = client, name, []
+    
+    def upsert(self, records):
+        self.records = records
+        return self
+    
+    def execute(self):
+        with self.client._lock:
+            self.client.requests.append(len(self.records))
+            if self.client.outages:
+                self.client.outages -= 1
+                raise TimeoutError("statement timeout")
+            if any(r.get("bad") for r in self.records):
+                raise ValueError("bad row")
+            self.client.rows.extend(self.records)
+
+
+def _records(n, bad=()):
+    return [{"entity_type": "order", "source_entity_id": str(i), "bad": i in bad} for i in range(n)]
+
+
+class TestChunking:
+    """Test records are split into bounded requests."""
+    
+    def test_splits_into_chunk_size_requests(self):
+        client = FakeClient()
+        with ChunkedWriter(client, chunk_size=10, max_in_flight=3) as writer:
+            writer.write(_records(25))
+        assert sorted(client.requests) == [5, 10, 10]
+        assert writer.written["order"] == 25
+    
+    def test_records_all_chunk_stats(self):
+        client = FakeClient()
+        with ChunkedWriter(client, chunk_size=4, max_in_flight=2) as writer:
+            writer.write(_records(12))
+        assert [rows for rows, _ in writer.chunk_stats] == [4, 4, 4]
+    
+    def test_empty_write_sends_nothing(self):
+        client = FakeClient()
+        with ChunkedWriter(client, chunk_size=4) as writer:
+            writer.write([])
+        assert client.requests == []
+
+
+class TestBisection:
+    """Test failing chunks are bisected down to the bad rows."""
+    
+    def test_rejects_only_bad_rows(self):
+        client = FakeClient()
+        with ChunkedWriter(client, chunk_size=16, max_in_flight=2) as writer:
+            writer.write(_records(32, bad={3, 20}))
+        
+        assert writer.rejected["order"] == 2
+        assert writer.written["order"] == 30
+        assert {r["source_entity_id"] for r in client.rows} == {str(i) for i in range(32)} - {"3", "20"}
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(Config, "UPSERT_RETRY_BACKOFF", 0)
+    monkeypatch.setattr(Config, "UPSERT_RETRIES", 3)
+
+
+class TestRetries:
+    """Test transient failures are retried whole instead of bisected."""
+    
+    def test_transient_failure_retried(self, no_backoff):
+        client = FakeClient(outages=2)
+        with ChunkedWriter(client, chunk_size=16, max_in_flight=1) as writer:
+            writer.write(_records(16))
+        assert client.requests == [16, 16, 16]
+        assert writer.written["order"] == 16 and not writer.rejected
+    
+    def test_outage_raises_without_bisecting(self, no_backoff):
+        client = FakeClient(outages=100)
+        with pytest.raises(RetriesExhausted):
+            with ChunkedWriter(client, chunk_size=16, max_in_flight=1) as writer:
+                writer.write(_records(16))
+        assert client.requests == [16] * 4
+        assert not writer.rejected
+    
+    def test_api_error_codes(self):
+        from postgrest.exceptions import APIError
+        from etl.db.errors import is_transient
+        assert is_transient(APIError({"code": "57014", "message": "canceling statement due to statement timeout"}))
+        assert is_transient(APIError({"code": 503, "message": "JSON could not be generated"}))
+        assert not is_transient(APIError({"code": "23505", "message": "duplicate key value"}))
+        assert not is_transient(APIError({"code": "PGRST204", "message": "Could not find the column"}))
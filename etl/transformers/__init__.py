@@ -1,15 +1,19 @@
 """Transformers for converting raw_data to core tables."""
 
 from .transform_locations import transform_locations
+from .transform_items import transform_items
 from .transform_orders import transform_orders
 from .transform_order_items import transform_order_items
 from .transform_enriched_orders import transform_enriched_orders
+from .transform_rollups import transform_rollups
 from .run import transform_all
 
 __all__ = [
     "transform_locations",
+    "transform_items",
     "transform_orders",
     "transform_order_items",
     "transform_enriched_orders",
+    "transform_rollups",
     "transform_all",
 ]
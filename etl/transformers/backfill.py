@@ -0,0 +1,147 @@
+"""
+Process-pool backfill of raw orders into orders, order_items and metadata.
+Partitions raw orders by (source, location, date range) with server-side JSON path filters and runs
+the fused per-page transform in a ProcessPoolExecutor: CPU-bound dict work scales with cores.
+The items dimension is loaded once up front; each worker builds its lookups once and writes its own batches.
+
+Usage: python -m etl.transformers.backfill --start 2024-01-01 --end 2025-01-01 --days 30 --workers 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import NamedTuple
+from etl.db.connection import db
+from etl.db.reader import iter_raw_projected
+from .transform_locations import EXTRACTORS as LOCATION_EXTRACTORS, PATHS as LOCATION_PATHS
+from .transform_fused import PATHS, build_lookups, empty_counts, transform_page
+from .transform_items import load_items
+from .transform_rollups import transform_rollups
+from .utils import refresh_gold_views
+
+# source -> (location field, timestamp field) in the raw order JSON
+PARTITION_FIELDS = {
+    "doordash": ("store_id", "created_at"),
+    "square": ("location_id", "created_at"),
+    "toast": ("restaurantGuid", "openedDate"),
+}
+
+# Per-process lookups, built once by the pool initializer
+_lookups = None
+
+
+class Partition(NamedTuple):
+    source: str
+    location_id: str
+    start: str  # Inclusive ISO date
+    end: str    # Exclusive ISO date
+
+    def filters(self) -> tuple:
+        """Server-side raw_data filters selecting this partition's orders."""
+        location_field, time_field = PARTITION_FIELDS[self.source]
+        return (
+            ("eq", f"data->>{location_field}", self.location_id),
+            ("gte", f"data->>{time_field}", self.start),
+            ("lt", f"data->>{time_field}", self.end),
+        )
+
+    def __str__(self):
+        return f"{self.source}/{self.location_id} {self.start}..{self.end}"
+
+
+def date_ranges(start: date, end: date, days: int) -> list[tuple[str, str]]:
+    """Splits [start, end) into consecutive ranges of `days` days."""
+    ranges, current = [], start
+    while current < end:
+        upper = min(current + timedelta(days=days), end)
+        ranges.append((current.isoformat(), upper.isoformat()))
+        current = upper
+    return ranges
+
+
+def list_partitions(client, start: date, end: date, days: int, sources=None) -> list[Partition]:
+    """Cross product of raw locations per source and date ranges."""
+    sources = set(sources or PARTITION_FIELDS)
+    locations = sorted({
+        (row["source_name"], LOCATION_EXTRACTORS[row["source_name"]](row["data"])[0])
+        for page in iter_raw_projected(client, "location", {s: LOCATION_PATHS[s] for s in sorted(sources)})
+        for row in page
+    })
+    return [Partition(source, loc, lo, hi) for source, loc in locations for lo, hi in date_ranges(start, end, days)]
+
+
+def _init_worker() -> None:
+    """Fresh DB client per process (never share the parent's connection pool) and lookups built once."""
+    global _lookups
+    db._client = None
+    _lookups = build_lookups(db.client)
+
+
+def run_partition(partition: Partition) -> tuple[Partition, dict, float]:
+    """Transforms one partition. Returns (partition, counts, seconds)."""
+    global _lookups
+    if _lookups is None:
+        _lookups = build_lookups(db.client)
+
+    start = time.perf_counter()
+    counts = empty_counts()
+    try:
+        for page in iter_raw_projected(db.client, "order", {partition.source: PATHS[partition.source]}, filters=partition.filters()):
+            transform_page(db.client, page, _lookups, counts)
+    except Exception as e:
+        print(f"[ERROR] partition {partition}: {e}")
+        counts["orders"]["errors"] += 1
+    return partition, counts, time.perf_counter() - start
+
+
+def backfill(start: date, end: date, days: int = 30, workers: int = None, sources=None, refresh: bool = True) -> dict:
+    """
+    Runs every partition on a process pool (workers=1 runs inline), then refreshes the sales rollups
+    and the materialized gold views once (with `refresh`). Returns summed counts per output.
+    """
+    workers = workers or os.cpu_count() or 1
+    load_items(db.client)  # Item keys must exist before workers build their lookups
+    partitions = list_partitions(db.client, start, end, days, sources)
+    print(f"Backfilling {len(partitions)} partitions with {workers} workers...")
+
+    totals = empty_counts()
+    began = time.perf_counter()
+
+    def report(i: int, partition: Partition, counts: dict, seconds: float):
+        for output, output_counts in counts.items():
+            for key, value in output_counts.items():
+                totals[output][key] += value
+        stats = " | ".join(f"{name}: {sum(v for k, v in c.items() if k != 'errors')}" for name, c in counts.items())
+        errors = sum(c["errors"] for c in counts.values())
+        print(f"  [{i}/{len(partitions)}] {partition}: {stats}" + (f" | errors: {errors}" if errors else "") + f" ({seconds:.2f}s)")
+
+    if workers == 1:
+        for i, partition in enumerate(partitions, 1):
+            report(i, *run_partition(partition))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(run_partition, p) for p in partitions]
+            for i, future in enumerate(as_completed(futures), 1):
+                report(i, *future.result())
+
+    elapsed = time.perf_counter() - began
+    orders = sum(v for k, v in totals["orders"].items() if k != "errors")
+    print(f"Done: {orders} orders in {elapsed:.2f}s ({orders / max(elapsed, 1e-9):.0f} orders/s)")
+    if refresh:
+        transform_rollups()
+        refresh_gold_views(db.client)
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partitioned process-pool backfill of raw orders.")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="Inclusive start date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Exclusive end date (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=30, help="Days per partition")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--sources", nargs="+", choices=sorted(PARTITION_FIELDS), help="Limit to these sources")
+    parser.add_argument("--no-refresh", dest="refresh", action="store_false", help="Skip refreshing the rollups and materialized gold views")
+    args = parser.parse_args()
+    backfill(args.start, args.end, args.days, args.workers, args.sources, args.refresh)
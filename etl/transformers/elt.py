@@ -0,0 +1,363 @@
+"""
+ELT engine: the raw → core transforms as set-based SQL executed inside Postgres.
+MAPPINGS is the SQL form of the Python extractors (etl/mappings/*.md): one INSERT ... SELECT ... FROM raw_data
+... ON CONFLICT statement per (table, source), with status, fulfillment and payment values rendered as CASE
+expressions from the same STATUS_MAP/FULFILLMENT_MAP/PAYMENT_TYPE_MAP. Raw JSON never leaves the server:
+no pages pulled over HTTP, no per-row Python, one transaction for the whole load.
+
+Needs psycopg (optional dependency) and DATABASE_URL; ON CONFLICT targets come from schemas/core.py SOURCE_KEYS_SQL.
+
+Usage: python -m etl.transformers.elt [--print] [--no-refresh]
+"""
+
+import argparse
+from etl.config import Config
+from etl.metrics import start_run
+from etl.sources import load_json
+from .keys import KEY_COLUMNS, KEY_NAMESPACE, deterministic_keys
+from .transform_items import catalog_items
+from .utils import ACCOUNT_ID, CATALOG_PATH, STATUS_MAP, FULFILLMENT_MAP, PAYMENT_TYPE_MAP, load_square_prices
+
+try:
+    import psycopg
+    from psycopg.types.json import Jsonb
+except ImportError:  # Optional: only the ELT engine talks to Postgres directly
+    psycopg = None
+
+
+# SQL expression helpers over raw_data r (r.data is the source JSON)
+def _literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _json(*keys, root: str = "r.data") -> str:
+    """jsonb at root->key->... (integer keys index arrays)."""
+    return root + "".join(f"->{_literal(k)}" for k in keys)
+
+
+def _text(*keys, root: str = "r.data") -> str:
+    """text at root->...->>last."""
+    return f"{_json(*keys[:-1], root=root)}->>{_literal(keys[-1])}"
+
+
+def _int(*keys, root: str = "r.data", default: int = None) -> str:
+    expr = f"({_text(*keys, root=root)})::bigint"
+    return expr if default is None else f"COALESCE({expr}, {default})"
+
+
+def _truthy(expr: str) -> str:
+    """jsonb `expr`, NULL where Python would treat it as falsy (null, "", 0, false, [], {})."""
+    return f"(CASE WHEN {expr} IN ('null', '\"\"', '0', 'false', '[]', '{{}}') THEN NULL ELSE {expr} END)"
+
+
+def _sum(array: str, *keys) -> str:
+    """Sum of integer `keys` over the elements of jsonb `array` (missing array or values count as 0)."""
+    return (f"(SELECT COALESCE(sum(({_text(*keys, root='e')})::bigint), 0) "
+            f"FROM jsonb_array_elements(COALESCE({array}, '[]')) e)")
+
+
+def _floor_div(total: str, qty: str) -> str:
+    """Python's `total // qty if qty > 0 else 0` (floor, not truncating, division)."""
+    return f"(CASE WHEN {qty} > 0 THEN floor(({total})::numeric / {qty})::bigint ELSE 0 END)"
+
+
+def _mapped(mapping: dict, expr: str, default: str) -> str:
+    """CASE expr WHEN key THEN value ... ELSE default: dict.get(expr, default) in SQL."""
+    if not mapping:
+        return default
+    whens = " ".join(f"WHEN {_literal(k)} THEN {_literal(v)}" for k, v in mapping.items())
+    return f"(CASE {expr} {whens} ELSE {default} END)"
+
+
+def map_status(source: str, expr: str) -> str:
+    """utils.map_status for text `expr`."""
+    return _mapped(STATUS_MAP.get(source, {}), expr, f"COALESCE(lower(NULLIF({expr}, '')), 'completed')")
+
+
+def map_fulfillment(source: str, expr: str) -> str:
+    """utils.map_fulfillment for text `expr`."""
+    return _mapped(FULFILLMENT_MAP.get(source, {}), expr, f"COALESCE({expr}, '')")
+
+
+def map_payment_type(source: str, expr: str) -> str:
+    """utils.map_payment_type for text `expr`."""
+    return _mapped(PAYMENT_TYPE_MAP.get(source, {}), expr, expr)
+
+
+def _object(fields: dict) -> str:
+    """jsonb object of the non-NULL fields; NULL when none are set (metadata stays unset, as in Python)."""
+    pairs = ", ".join(f"{_literal(k)}, {v}" for k, v in fields.items())
+    return f"NULLIF(jsonb_strip_nulls(jsonb_build_object({pairs})), '{{}}')"
+
+
+# Parameters bound at execution: Square variation prices (the catalog export is not in raw_data) and catalog items
+SQUARE_PRICES = "%(square_prices)s::jsonb"
+CATALOG_ITEMS = "%(items)s::jsonb"
+
+# Latest Square payment per order (build_payment_lookup: the last row per order_id wins)
+SQUARE_PAYMENTS = """(
+    SELECT DISTINCT ON (data->>'order_id') data->>'order_id' AS order_id, data
+    FROM raw_data
+    WHERE source_name = 'square' AND entity_type = 'payment' AND data->>'order_id' <> ''
+    ORDER BY data->>'order_id', raw_id DESC
+) pay ON pay.order_id = r.data->>'id'"""
+
+_TOAST_PAYMENT = _json("checks", 0, "payments", 0)
+_SQUARE_QTY = "(e->>'quantity')::int"
+_SQUARE_TOTAL = _int("gross_sales_money", "amount", root="e", default=0)
+_TOAST_QTY = _int("quantity", root="e", default=0)
+_TOAST_PRICE = _int("price", root="e", default=0)
+
+# table -> source -> column -> SQL expression. Columns in REFERENCES hold the parent's source ID and are
+# resolved by a join; source_name and (with ETL_KEY_STRATEGY=uuid5) the primary key are added by build_statement.
+MAPPINGS = {
+    "locations": {
+        "doordash": {
+            "account_id": _literal(ACCOUNT_ID),
+            "source_location_id": _text("store_id"),
+            "name": _text("name"),
+            "address_line_1": _text("address", "street"),
+            "city": _text("address", "city"),
+            "state": _text("address", "state"),
+            "postal_code": _text("address", "zip_code"),
+            "country": _text("address", "country"),
+            "timezone": f"COALESCE({_text('timezone')}, '')",
+        },
+        "square": {
+            "account_id": _literal(ACCOUNT_ID),
+            "source_location_id": _text("id"),
+            "name": _text("name"),
+            "address_line_1": _text("address", "address_line_1"),
+            "city": _text("address", "locality"),
+            "state": _text("address", "administrative_district_level_1"),
+            "postal_code": _text("address", "postal_code"),
+            "country": _text("address", "country"),
+            "timezone": f"COALESCE({_text('timezone')}, '')",
+        },
+        "toast": {
+            "account_id": _literal(ACCOUNT_ID),
+            "source_location_id": _text("guid"),
+            "name": _text("name"),
+            "address_line_1": _text("address", "line1"),
+            "city": _text("address", "city"),
+            "state": _text("address", "state"),
+            "postal_code": _text("address", "zip"),
+            "country": _text("address", "country"),
+            "timezone": f"COALESCE({_text('timezone')}, '')",
+        },
+    },
+    "orders": {
+        "doordash": {
+            "location_id": _text("store_id"),
+            "source_order_id": _text("external_delivery_id"),
+            "created_at": f"({_text('created_at')})::timestamptz",
+            "closed_at": f"COALESCE(NULLIF({_text('delivery_time')}, ''), NULLIF({_text('pickup_time')}, ''), {_text('created_at')})::timestamptz",
+            "status": map_status("doordash", _text("order_status")),
+            "fulfillment_method": map_fulfillment("doordash", _text("order_fulfillment_method")),
+            "subtotal": _int("order_subtotal"),
+            "tax_amount": _int("tax_amount"),
+            "tip_amount": _int("dasher_tip", default=0),
+            "total_amount": _int("total_charged_to_consumer"),
+            "metadata": _object({
+                **{key: _json(key) for key in ("delivery_fee", "service_fee", "commission", "merchant_payout")},
+                **{key: _truthy(_json(key)) for key in ("pickup_time", "delivery_time")},
+                **{key: _json(key) for key in ("contains_alcohol", "is_catering")},
+            }),
+        },
+        "square": {
+            "location_id": _text("location_id"),
+            "source_order_id": _text("id"),
+            "created_at": f"({_text('created_at')})::timestamptz",
+            "closed_at": f"({_text('closed_at')})::timestamptz",
+            "status": map_status("square", _text("state")),
+            "fulfillment_method": map_fulfillment("square", _text("fulfillments", 0, "type")),
+            "subtotal": _sum(_json("line_items"), "gross_sales_money", "amount"),
+            "tax_amount": _int("total_tax_money", "amount", default=0),
+            "tip_amount": _int("total_tip_money", "amount", default=0),
+            "total_amount": _int("total_money", "amount", default=0),
+            "metadata": _object({
+                "payment_type": map_payment_type("square", f"NULLIF({_text('source_type', root='pay.data')}, '')"),
+                "card_brand": f"CASE WHEN {_text('source_type', root='pay.data')} = 'CARD' "
+                              f"THEN upper(NULLIF({_text('card_details', 'card', 'card_brand', root='pay.data')}, '')) END",
+                "entry_method": f"CASE WHEN {_text('source_type', root='pay.data')} = 'CARD' "
+                                f"THEN NULLIF({_text('card_details', 'entry_method', root='pay.data')}, '') END",
+            }),
+        },
+        "toast": {
+            "location_id": _text("restaurantGuid"),
+            "source_order_id": _text("guid"),
+            "created_at": f"({_text('openedDate')})::timestamptz",
+            "closed_at": f"COALESCE(NULLIF({_text('closedDate')}, ''), {_text('paidDate')})::timestamptz",
+            "status": f"(CASE WHEN ({_text('voided')})::boolean THEN 'voided' "
+                      f"WHEN ({_text('deleted')})::boolean THEN 'deleted' ELSE 'completed' END)",
+            "fulfillment_method": map_fulfillment("toast", _text("diningOption", "behavior")),
+            "subtotal": _sum(_json("checks"), "amount"),
+            "tax_amount": _sum(_json("checks"), "taxAmount"),
+            "tip_amount": _sum(_json("checks"), "tipAmount"),
+            "total_amount": _sum(_json("checks"), "totalAmount"),
+            "metadata": _object({
+                "paid_date": _truthy(_json("paidDate")),
+                "business_date": _truthy(_json("businessDate")),
+                "payment_type": map_payment_type("toast", f"NULLIF({_text('type', root=_TOAST_PAYMENT)}, '')"),
+                "card_brand": f"upper(NULLIF({_text('cardType', root=_TOAST_PAYMENT)}, ''))",
+            }),
+        },
+    },
+    "order_items": {
+        "doordash": {
+            "order_id": _text("external_delivery_id"),
+            "source_order_item_id": f"{_text('external_delivery_id')} || '_' || (e->>'item_id')",
+            "item_key": "e->>'item_id'",
+            "quantity": _int("quantity", root="e"),
+            "unit_price": _int("unit_price", root="e"),
+            "total_price": f"{_int('quantity', root='e')} * {_int('unit_price', root='e')}",
+        },
+        "square": {
+            "order_id": _text("id"),
+            "source_order_item_id": "e->>'uid'",
+            "item_key": "e->>'catalog_object_id'",
+            "quantity": _SQUARE_QTY,
+            "unit_price": f"COALESCE(NULLIF(({SQUARE_PRICES}->>(e->>'catalog_object_id'))::bigint, 0), "
+                          f"{_floor_div(_SQUARE_TOTAL, _SQUARE_QTY)})",
+            "total_price": _SQUARE_TOTAL,
+        },
+        "toast": {
+            "order_id": _text("guid"),
+            "source_order_item_id": "e->>'guid'",
+            "item_key": "e->'item'->>'guid'",
+            "quantity": _TOAST_QTY,
+            "unit_price": _floor_div(_TOAST_PRICE, _TOAST_QTY),
+            "total_price": _TOAST_PRICE,
+        },
+    },
+}
+
+# Extra FROM items per (table, source): joins that aren't REFERENCES, e.g. one row per line item
+SOURCE_JOINS = {
+    ("orders", "square"): f"LEFT JOIN {SQUARE_PAYMENTS}",
+    ("order_items", "doordash"): f"CROSS JOIN LATERAL jsonb_array_elements(COALESCE({_json('order_items')}, '[]')) e",
+    ("order_items", "square"): f"CROSS JOIN LATERAL jsonb_array_elements(COALESCE({_json('line_items')}, '[]')) e",
+    ("order_items", "toast"): (f"CROSS JOIN LATERAL jsonb_array_elements(COALESCE({_json('checks')}, '[]')) c "
+                               "CROSS JOIN LATERAL jsonb_array_elements(COALESCE(c->'selections', '[]')) e"),
+}
+
+# Row filters per (table, source) beyond source/entity type (Toast selections without an item are skipped)
+SOURCE_FILTERS = {
+    ("order_items", "toast"): "e->'item'->>'guid' <> ''",
+}
+
+# Columns resolved from a parent table by (source_name, source ID): column -> (table, alias, source ID column, join)
+# Inner joins drop rows whose parent is missing, like the KeyError the Python lookups count as an error.
+REFERENCES = {
+    "location_id": ("locations", "l", "source_location_id", "JOIN"),
+    "order_id": ("orders", "o", "source_order_id", "JOIN"),
+    "item_key": ("items", "i", "source_item_id", "LEFT JOIN"),
+}
+
+# raw_data entity type each table is built from
+ENTITY_TYPES = {"locations": "location", "orders": "order", "order_items": "order"}
+
+# Load order: parents before children
+TABLES = ("locations", "orders", "order_items")
+
+ITEMS_SQL = f"""
+INSERT INTO items (source_name, source_item_id, item_name, category)
+SELECT source_name, source_item_id, item_name, category
+FROM jsonb_to_recordset({CATALOG_ITEMS}) AS c(source_name text, source_item_id text, item_name text, category text)
+ON CONFLICT (source_name, source_item_id) DO UPDATE
+SET item_name = EXCLUDED.item_name, category = EXCLUDED.category
+"""
+
+# Run after the load commits, if installed (schemas/rollups.py, schemas/functions.py)
+REFRESH_FUNCTIONS = ("refresh_sales_rollups", "refresh_gold_views")
+
+
+def build_statement(table: str, source: str) -> str:
+    """INSERT ... SELECT ... FROM raw_data ... ON CONFLICT (source_name, source ID) DO UPDATE for one source."""
+    pk, kind, source_column = KEY_COLUMNS[table]
+    columns = {"source_name": _literal(source)}
+    joins = [SOURCE_JOINS[(table, source)]] if (table, source) in SOURCE_JOINS else []
+    for column, expr in MAPPINGS[table][source].items():
+        if column in REFERENCES:
+            parent, alias, parent_column, join = REFERENCES[column]
+            joins.append(f"{join} {parent} {alias} ON {alias}.source_name = r.source_name AND {alias}.{parent_column} = {expr}")
+            expr = f"{alias}.{column}"
+        columns[column] = expr
+    if deterministic_keys():
+        columns = {pk: (f"extensions.uuid_generate_v5('{KEY_NAMESPACE}'::uuid, "
+                        f"'{kind}:' || r.source_name || ':' || {MAPPINGS[table][source][source_column]})"), **columns}
+    filters = [f"r.source_name = {_literal(source)}", f"r.entity_type = {_literal(ENTITY_TYPES[table])}"]
+    if (table, source) in SOURCE_FILTERS:
+        filters.append(SOURCE_FILTERS[(table, source)])
+    updates = [c for c in columns if c not in (pk, "source_name", source_column)]
+    return "\n".join([
+        f"INSERT INTO {table} ({', '.join(columns)})",
+        "SELECT " + ",\n       ".join(f"{expr} AS {column}" for column, expr in columns.items()),
+        "FROM raw_data r",
+        *joins,
+        "WHERE " + " AND ".join(filters),
+        f"ON CONFLICT (source_name, {source_column}) DO UPDATE",
+        "SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in updates),
+    ])
+
+
+def statements() -> list:
+    """(table, source, sql) in load order: items, then each table's per-source statements."""
+    return [("items", None, ITEMS_SQL)] + [
+        (table, source, build_statement(table, source)) for table in TABLES for source in MAPPINGS[table]
+    ]
+
+
+def _params() -> dict:
+    return {"items": Jsonb(catalog_items(load_json(CATALOG_PATH))), "square_prices": Jsonb(load_square_prices())}
+
+
+def run_elt(dsn: str = None, refresh: bool = True) -> dict:
+    """
+    Runs every statement in one transaction on `dsn` (default DATABASE_URL), then the rollup and gold view
+    refreshes. Returns {table: {source: rows written, "errors": 0}}.
+    """
+    if psycopg is None:
+        raise RuntimeError("ELT mode needs psycopg: pip install 'psycopg[binary]'")
+    dsn = dsn or Config.DATABASE_URL
+    if not dsn:
+        raise ValueError("DATABASE_URL is required for ELT mode")
+
+    run = start_run("elt")
+    results = {}
+    with psycopg.connect(dsn) as conn:
+        params = _params()
+        with conn.transaction():
+            for table, source, sql in statements():
+                with run.step(table):
+                    rows = conn.execute(sql, params).rowcount
+                counts = results.setdefault(table, {"errors": 0})
+                counts[source or "catalog"] = counts.get(source or "catalog", 0) + rows
+        if refresh:
+            for function in REFRESH_FUNCTIONS:
+                if conn.execute("SELECT to_regproc(%s) IS NOT NULL", (function,)).fetchone()[0]:
+                    with run.step(function), conn.transaction():
+                        conn.execute(f"SELECT {function}()")
+                else:
+                    print(f"[WARNING] {function}() not installed; skipped")
+    run.save()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transform raw_data into core tables inside Postgres (ELT).")
+    parser.add_argument("--print", dest="print_sql", action="store_true", help="Print the generated SQL instead of running it")
+    parser.add_argument("--no-refresh", dest="refresh", action="store_false", help="Skip the rollup and gold view refreshes")
+    args = parser.parse_args()
+    if args.print_sql:
+        print(";\n\n".join(sql for _, _, sql in statements()) + ";")
+    else:
+        print("Transforming (ELT)...")
+        for table, counts in run_elt(refresh=args.refresh).items():
+            print(f"  {table}: {sum(v for k, v in counts.items() if k != 'errors')} ({counts})")
@@ -0,0 +1,146 @@
+"""
+Persistent, incrementally refreshed key lookups: (source_name, source_id) -> location_id / order_id.
+A marshal snapshot per table survives between runs; each get() reads only rows whose updated_at column
+is at or past the stored watermark, so a run pays for new rows instead of the whole table.
+One shared in-memory instance serves every step. Keys are stored as 16-byte UUIDs in per-source dicts
+(no tuple or UUID string per row).
+"""
+
+import marshal
+import os
+import sys
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+from etl.config import Config
+from etl.db.reader import iter_rows
+
+CACHE_DIR = Config.STATE_DIR / "lookups"
+SNAPSHOT_VERSION = 1
+
+# Re-read this far behind the watermark: rows from transactions that commit late keep their earlier timestamp
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# name -> (table, key column, source id column, watermark column)
+LOOKUPS = {
+    "locations": ("locations", "location_id", "source_location_id", "updated_at"),
+    "orders": ("orders", "order_id", "source_order_id", "record_updated_at"),
+}
+
+
+class KeyLookup:
+    """Drop-in for a (source_name, source_id) -> key dict, backed by {source: {source_id: uuid bytes}}."""
+
+    __slots__ = ("by_source",)
+
+    def __init__(self, by_source: Optional[dict] = None):
+        self.by_source = by_source or {}
+
+    def add(self, source: str, source_id: str, key: str) -> None:
+        self.by_source.setdefault(sys.intern(source), {})[source_id] = uuid.UUID(key).bytes
+
+    def __getitem__(self, key: tuple) -> str:
+        source, source_id = key
+        try:
+            return str(uuid.UUID(bytes=self.by_source[source][source_id]))
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: tuple) -> bool:
+        return key[1] in self.by_source.get(key[0], ())
+
+    def get(self, key: tuple, default=None):
+        return self[key] if key in self else default
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.by_source.values())
+
+
+class LookupCache:
+    """Snapshot + watermark refresh per lookup. Thread-safe; concurrent steps share one instance."""
+
+    def __init__(self, directory: Path = CACHE_DIR):
+        self.directory = directory
+        self.lookups = {}     # name -> KeyLookup
+        self.watermarks = {}  # name -> max watermark column value seen (server time, ISO string)
+        self._locks = defaultdict(threading.Lock)
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.snapshot"
+
+    def get(self, client, name: str) -> KeyLookup:
+        """Lookup `name` refreshed with every row changed since the last call (or the on-disk snapshot)."""
+        with self._locks[name]:
+            if name not in self.lookups:
+                self._load(name)
+            if self._refresh(client, name):
+                self._save(name)
+            return self.lookups[name]
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drops memory and snapshot (e.g. after rows were deleted); the next get() rebuilds in full."""
+        for n in [name] if name else list(LOOKUPS):
+            self.lookups.pop(n, None)
+            self.watermarks.pop(n, None)
+            self.path(n).unlink(missing_ok=True)
+
+    def _load(self, name: str) -> None:
+        self.lookups[name], self.watermarks[name] = KeyLookup(), None
+        try:
+            with open(self.path(name), "rb") as f:
+                snapshot = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        # A snapshot of another database or format is ignored (full rebuild)
+        if snapshot.get("version") == SNAPSHOT_VERSION and snapshot.get("url") == Config.database_id():
+            self.lookups[name] = KeyLookup({sys.intern(s): ids for s, ids in snapshot["by_source"].items()})
+            self.watermarks[name] = snapshot["watermark"]
+
+    def _refresh(self, client, name: str) -> int:
+        """Reads rows at/after the watermark (all rows without one). Returns rows read."""
+        table, key, source_column, watermark_column = LOOKUPS[name]
+        watermark = self.watermarks[name]
+        filters = (("gte", watermark_column, _rewind(watermark)),) if watermark else ()
+        lookup, read = self.lookups[name], 0
+        columns = f"{key}, source_name, {source_column}, {watermark_column}"
+        for row in iter_rows(client, table, columns, key, filters):
+            lookup.add(row["source_name"], row[source_column], row[key])
+            if row[watermark_column] and (watermark is None or row[watermark_column] > watermark):
+                watermark = row[watermark_column]
+            read += 1
+        self.watermarks[name] = watermark
+        return read
+
+    def _save(self, name: str) -> None:
+        """Atomic replace: concurrent processes (backfill workers) never read a partial snapshot."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.path(name).with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            marshal.dump({
+                "version": SNAPSHOT_VERSION,
+                "url": Config.database_id(),
+                "watermark": self.watermarks[name],
+                "by_source": self.lookups[name].by_source,
+            }, f)
+        os.replace(tmp, self.path(name))
+
+
+def _rewind(watermark: str) -> str:
+    try:
+        return (datetime.fromisoformat(watermark) - REFRESH_OVERLAP).isoformat()
+    except ValueError:
+        return watermark
+
+
+_shared = None
+
+
+def shared_cache() -> LookupCache:
+    """The process-wide cache used by build_location_lookup/build_order_lookup."""
+    global _shared
+    if _shared is None:
+        _shared = LookupCache()
+    return _shared
@@ -1,46 +1,113 @@
 """
 Transform all data from raw_data to core tables.
-Runs transformers in dependency order: locations → orders → order_items → metadata
+Runs transformers as a dependency graph: locations → orders → {order_items, metadata} → rollups, items → order_items.
+Independent steps run concurrently; --only/--from re-run a subgraph.
+Fused mode reads raw orders once and writes orders, order_items and metadata together.
+Materialized gold views are refreshed (concurrently) once the graph finishes.
 """
 
+import argparse
+import time
+from pathlib import Path
+from etl.db.connection import db
+from etl.metrics import start_run
 from .transform_locations import transform_locations
+from .transform_items import transform_items
 from .transform_orders import transform_orders
 from .transform_order_items import transform_order_items
 from .transform_enriched_orders import transform_enriched_orders
+from .transform_fused import transform_orders_fused
+from .transform_rollups import transform_rollups
+from .scheduler import critical_path, run_graph, select_steps
+from .utils import refresh_gold_views
 
-# Pipeline steps in dependency order
-STEPS = [
-    ("locations", transform_locations),
-    ("orders", transform_orders),
-    ("order_items", transform_order_items),
-    ("metadata", transform_enriched_orders),
-]
+# Pipeline graph: step -> (transformer, upstream steps)
+GRAPH = {
+    "locations": (transform_locations, ()),
+    "items": (transform_items, ()),
+    "orders": (transform_orders, ("locations",)),
+    "order_items": (transform_order_items, ("orders", "items")),
+    "metadata": (transform_enriched_orders, ("orders",)),
+    "rollups": (transform_rollups, ("order_items", "metadata")),
+}
 
+# Fused pipeline: one raw order scan produces several outputs
+FUSED_GRAPH = {
+    "locations": (transform_locations, ()),
+    "items": (transform_items, ()),
+    "orders_fused": (transform_orders_fused, ("locations", "items")),
+    "rollups": (transform_rollups, ("orders_fused",)),
+}
 
-def transform_all() -> dict:
-    """Transform all data from raw_data to core tables."""
+
+def _total(counts: dict) -> int:
+    return sum(v for k, v in counts.items() if k != "errors")
+
+
+def transform_all(fused: bool = False, only=None, start_from: str = None, workers: int = 4,
+                  prometheus: Path = None, refresh: bool = True) -> dict:
+    """
+    Transform raw_data to core tables. `only`/`start_from` select a subgraph (see scheduler.select_steps).
+    With `refresh`, then refreshes the materialized gold views (ai_orders, ai_order_items).
+    Writes a run report (etl.metrics) and, with `prometheus`, a Prometheus text file.
+    """
     print("=" * 50)
-    print("TRANSFORMING: RAW → CORE")
+    print("TRANSFORMING: RAW → CORE" + (" (fused)" if fused else ""))
     print("=" * 50)
     
+    graph = FUSED_GRAPH if fused else GRAPH
+    selected = select_steps(graph, only, start_from)
+    run = start_run("transform")
+    instrumented = {name: (run.wrap(name, func), deps) for name, (func, deps) in graph.items()}
     results = {}
-    for i, (name, func) in enumerate(STEPS, 1):
-        print(f"\n[{i}/{len(STEPS)}] {name}...")
-        results[name] = func()
-        total = sum(v for k, v in results[name].items() if k != "errors")
-        errors = results[name].get("errors", 0)
-        print(f"[OK] {total} {name}" + (f" ({errors} errors)" if errors else ""))
+
+    def on_start(name: str):
+        print(f"\n[START] {name}...")
+
+    def on_done(name: str, counts: dict, seconds: float):
+        # Multi-output steps return {output: counts}, outputs named after the unfused steps (an empty result is one step's)
+        outputs = counts if counts and counts.keys() <= GRAPH.keys() else {name: counts}
+        for output, output_counts in outputs.items():
+            results[output] = output_counts
+            errors = output_counts.get("errors", 0)
+            print(f"[OK] {_total(output_counts)} {output}" + (f" ({errors} errors)" if errors else "") + f" ({seconds:.2f}s)")
+
+    began = time.perf_counter()
+    _, durations = run_graph(instrumented, selected, workers, on_start, on_done)
+    if refresh:
+        print("\n[START] refresh gold views...")
+        with run.step("refresh_gold"):
+            try:
+                timings = refresh_gold_views(db.client)
+            except Exception as e:
+                print(f"[ERROR] refresh gold views failed, views are stale: {e}")
+                timings, results["refresh_gold"] = {}, {"errors": 1}
+        if timings:
+            print("[OK] " + ", ".join(f"{view} ({seconds:.2f}s)" for view, seconds in timings.items()))
+    wall = time.perf_counter() - began
+    critical_seconds, path = critical_path(graph, durations)
     
     # Summary
     print("\n" + "=" * 50)
     print("SUMMARY")
     print("=" * 50)
     for name, counts in results.items():
-        total = sum(v for k, v in counts.items() if k != "errors")
-        print(f"  {name}: {total}")
+        print(f"  {name}: {_total(counts)}" + (f" ({counts['errors']} errors)" if counts.get("errors") else ""))
+    print(f"\nCritical path: {' → '.join(path)} ({critical_seconds:.2f}s) | wall {wall:.2f}s | steps summed {sum(durations.values()):.2f}s")
+    print("\n".join(run.summary_lines()))
+    print(f"Run report: {run.save(prometheus=prometheus)}")
     
     return results
 
 
 if __name__ == "__main__":
-    transform_all()
+    parser = argparse.ArgumentParser(description="Transform raw_data into core tables.")
+    parser.add_argument("--fused", action="store_true", help="Single raw order scan for orders, order_items and metadata")
+    parser.add_argument("--only", nargs="+", metavar="STEP", help="Run only these steps (upstream assumed done)")
+    parser.add_argument("--from", dest="start_from", metavar="STEP", help="Run this step and everything downstream")
+    parser.add_argument("--workers", type=int, default=4, help="Max steps running concurrently")
+    parser.add_argument("--prometheus", type=Path, metavar="PATH", help="Also write run metrics in Prometheus text format")
+    parser.add_argument("--no-refresh", dest="refresh", action="store_false", help="Skip refreshing the materialized gold views")
+    args = parser.parse_args()
+    transform_all(fused=args.fused, only=args.only, start_from=args.start_from, workers=args.workers,
+                  prometheus=args.prometheus, refresh=args.refresh)
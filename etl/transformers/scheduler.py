@@ -0,0 +1,102 @@
+"""
+DAG scheduler for pipeline steps.
+Steps declare their dependencies; every step whose dependencies are done runs immediately on a
+thread pool, so independent steps overlap. Records per-step durations and the critical path.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Optional
+from etl.metrics import submit
+
+# name -> (func, dependency names)
+Graph = dict[str, tuple[Callable[[], dict], tuple[str, ...]]]
+
+
+def descendants(graph: Graph, roots: Iterable[str]) -> set:
+    """Roots plus every step that (transitively) depends on them."""
+    selected, frontier = set(roots), list(roots)
+    while frontier:
+        name = frontier.pop()
+        for child, (_, deps) in graph.items():
+            if name in deps and child not in selected:
+                selected.add(child)
+                frontier.append(child)
+    return selected
+
+
+def select_steps(graph: Graph, only: Optional[Iterable[str]] = None, start_from: Optional[str] = None) -> set:
+    """
+    Subgraph to run. `only` runs exactly those steps (their upstream outputs are assumed present);
+    `start_from` runs that step and everything downstream of it. Default: whole graph.
+    """
+    names = set(only or []) | ({start_from} if start_from else set())
+    unknown = names - set(graph)
+    if unknown:
+        raise ValueError(f"Unknown step(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(graph)}")
+    if only:
+        return set(only)
+    if start_from:
+        return descendants(graph, [start_from])
+    return set(graph)
+
+
+def critical_path(graph: Graph, durations: dict) -> tuple[float, list]:
+    """Longest chain of dependent steps by duration: (seconds, [step, ...]). O(V + E) with memoization."""
+    best = {}
+
+    def longest(name: str) -> tuple[float, list]:
+        if name not in best:
+            upstream = [longest(d) for d in graph[name][1] if d in durations]
+            seconds, path = max(upstream, default=(0.0, []), key=lambda x: x[0])
+            best[name] = (seconds + durations[name], path + [name])
+        return best[name]
+
+    return max((longest(name) for name in durations), default=(0.0, []), key=lambda x: x[0])
+
+
+def run_graph(graph: Graph, selected: Optional[set] = None, workers: int = 4,
+              on_start: Callable = None, on_done: Callable = None) -> tuple[dict, dict]:
+    """
+    Runs the selected steps respecting dependencies. Returns (results, durations).
+    Dependencies outside `selected` count as satisfied. A failing step skips its dependents and
+    its exception is re-raised once running steps finish.
+    """
+    selected = set(graph) if selected is None else selected
+    pending = {name: {d for d in graph[name][1] if d in selected} for name in selected}
+    results, durations, running = {}, {}, {}
+    failure = None
+
+    def timed(name: str):
+        start = time.perf_counter()
+        try:
+            return graph[name][0]()
+        finally:
+            durations[name] = time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="step") as pool:
+        while pending or running:
+            if failure is None:
+                for name in [n for n, deps in pending.items() if not deps]:
+                    del pending[name]
+                    if on_start:
+                        on_start(name)
+                    running[submit(pool, timed, name)] = name
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if future.exception() is not None:
+                    failure = failure or future.exception()
+                    continue
+                results[name] = future.result()
+                if on_done:
+                    on_done(name, results[name], durations[name])
+                for deps in pending.values():
+                    deps.discard(name)
+
+    if failure is not None:
+        raise failure
+    return results, durations
@@ -1,12 +1,23 @@
 """
 Transform enriched order data to orders.metadata JSONB field.
-Uses hash maps for O(1) lookups.
+Uses hash maps for O(1) lookups; streams raw_data in keyset pages, projected to the few fields metadata needs.
 """
 
 from etl.db.connection import db
+from etl.metrics import step
+from etl.db.reader import iter_raw_projected
 from .utils import build_order_lookup, build_payment_lookup, map_payment_type, normalize_card_brand, batch_update_metadata
 
 
+# JSON paths each extractor reads (Square metadata comes from the payment; Toast's from the first payment only)
+PATHS = {
+    "doordash": ("external_delivery_id", "delivery_fee", "service_fee", "commission", "merchant_payout",
+                 "pickup_time", "delivery_time", "contains_alcohol", "is_catering"),
+    "square": ("id",),
+    "toast": ("guid", "paidDate", "businessDate", "checks.0.payments.0"),
+}
+
+
 def extract_doordash_metadata(data: dict) -> dict:
     """Extract DoorDash metadata fields (fees, times, flags)."""
     meta = {}
@@ -71,35 +82,35 @@ def transform_enriched_orders() -> dict:
     counts = {"doordash": 0, "square": 0, "toast": 0, "errors": 0}
     
     # Build lookups once - O(1) per order
-    order_lookup = build_order_lookup(client)
-    payment_lookup = build_payment_lookup(client)
-    
-    response = client.table("raw_data").select("source_name, data").eq("entity_type", "order").execute()
-    
-    updates = []
-    for row in response.data:
-        source, data = row["source_name"], row["data"]
-        try:
-            source_order_id = data.get("external_delivery_id") or data.get("id") or data.get("guid")
-            order_id = order_lookup[(source, source_order_id)]
-            
-            if source == "doordash":
-                meta = extract_doordash_metadata(data)
-            elif source == "square":
-                meta = extract_square_metadata(data, payment_lookup.get(source_order_id))
-            elif source == "toast":
-                meta = extract_toast_metadata(data)
-            else:
-                continue
-            
-            if meta:
-                updates.append((order_id, meta))
-            counts[source] += 1
-        except Exception as e:
-            print(f"[ERROR] {source} metadata: {e}")
-            counts["errors"] += 1
+    with step("lookups"):
+        order_lookup = build_order_lookup(client)
+        payment_lookup = build_payment_lookup(client)
     
-    batch_update_metadata(client, updates)
+    for page in iter_raw_projected(client, "order", PATHS):
+        updates = []
+        for row in page:
+            source, data = row["source_name"], row["data"]
+            try:
+                source_order_id = data.get("external_delivery_id") or data.get("id") or data.get("guid")
+                order_id = order_lookup[(source, source_order_id)]
+                
+                if source == "doordash":
+                    meta = extract_doordash_metadata(data)
+                elif source == "square":
+                    meta = extract_square_metadata(data, payment_lookup.get(source_order_id))
+                elif source == "toast":
+                    meta = extract_toast_metadata(data)
+                else:
+                    continue
+                
+                if meta:
+                    updates.append((order_id, meta))
+                counts[source] += 1
+            except Exception as e:
+                print(f"[ERROR] {source} metadata: {e}")
+                counts["errors"] += 1
+        
+        batch_update_metadata(client, updates)
     return counts
 
 
@@ -0,0 +1,112 @@
+"""
+Fused transform of raw orders into orders, order_items and orders.metadata.
+Reads each raw order once (one raw_data scan instead of three) and writes metadata with the
+orders upsert. Order IDs come back from that upsert, so no order lookup is built.
+Reads the union of the three steps' JSON paths (PATHS).
+"""
+
+from etl.db.connection import db
+from etl.metrics import step
+from etl.db.reader import iter_raw_projected, merge_paths
+from .transform_orders import EXTRACTORS, PATHS as ORDER_PATHS
+from .transform_order_items import PATHS as ITEM_PATHS, extract_doordash_items, extract_square_items, extract_toast_items
+from .transform_enriched_orders import PATHS as METADATA_PATHS, extract_doordash_metadata, extract_square_metadata, extract_toast_metadata
+from .utils import build_location_lookup, build_payment_lookup, build_item_lookup, load_square_prices, batch_upsert, count_rejected, upsert_rows
+
+# JSON paths read by any of the three outputs
+PATHS = {source: merge_paths(ORDER_PATHS[source], ITEM_PATHS[source], METADATA_PATHS[source]) for source in ORDER_PATHS}
+
+
+def source_order_id(data: dict) -> str:
+    """Source order ID regardless of source schema."""
+    return data.get("external_delivery_id") or data.get("id") or data.get("guid")
+
+
+def extract_metadata(source: str, data: dict, payment_lookup: dict) -> dict:
+    """Dispatch to the per-source metadata extractor."""
+    if source == "doordash":
+        return extract_doordash_metadata(data)
+    if source == "square":
+        return extract_square_metadata(data, payment_lookup.get(data["id"]))
+    return extract_toast_metadata(data)
+
+
+def extract_items(source: str, data: dict, order_id: str, item_keys: dict, prices: dict) -> list:
+    """Dispatch to the per-source order item extractor."""
+    if source == "doordash":
+        return extract_doordash_items(data, order_id, item_keys)
+    if source == "square":
+        return extract_square_items(data, order_id, item_keys, prices)
+    return extract_toast_items(data, order_id, item_keys)
+
+
+def transform_page(client, page: list, lookups: dict, counts: dict) -> None:
+    """Transforms one page of raw orders into all three outputs and writes them."""
+    orders, raw_by_key = [], {}
+    for row in page:
+        source, data = row["source_name"], row["data"]
+        try:
+            order = EXTRACTORS[source](data, lookups["locations"])
+            meta = extract_metadata(source, data, lookups["payments"])
+            orders.append({**order, "metadata": meta or None})  # Same keys on every row for bulk upsert
+            raw_by_key[(source, order["source_order_id"])] = data
+            counts["orders"][source] += 1
+            counts["metadata"][source] += 1
+        except Exception as e:
+            print(f"[ERROR] {source} order {source_order_id(data) or '?'}: {e}")
+            counts["orders"]["errors"] += 1
+
+    if not orders:
+        return
+    written, rejected = upsert_rows(client, "orders", orders)
+    count_rejected(counts["orders"], rejected)
+    count_rejected(counts["metadata"], rejected)
+
+    # Order IDs from the upsert response: O(1) per item, no orders table scan
+    items = []
+    for row in written:
+        source = row["source_name"]
+        data = raw_by_key[(source, row["source_order_id"])]
+        try:
+            order_items = extract_items(source, data, row["order_id"], lookups["items"], lookups["prices"])
+            items.extend(order_items)
+            counts["order_items"][source] += len(order_items)
+        except Exception as e:
+            print(f"[ERROR] {source} order items: {e}")
+            counts["order_items"]["errors"] += 1
+
+    batch_upsert(client, "order_items", items, counts["order_items"])
+
+
+def build_lookups(client) -> dict:
+    """Build every lookup the fused transform needs, once - O(1) per order afterwards."""
+    return {
+        "locations": build_location_lookup(client),
+        "payments": build_payment_lookup(client),
+        "items": build_item_lookup(client),
+        "prices": load_square_prices(),
+    }
+
+
+def empty_counts() -> dict:
+    """Per-output, per-source counters."""
+    return {name: {"doordash": 0, "square": 0, "toast": 0, "errors": 0} for name in ("orders", "order_items", "metadata")}
+
+
+def transform_orders_fused() -> dict:
+    """Transform raw orders into orders, order_items and metadata in one raw_data scan."""
+    client = db.client
+    counts = empty_counts()
+    with step("lookups"):
+        lookups = build_lookups(client)
+    
+    for page in iter_raw_projected(client, "order", PATHS):
+        transform_page(client, page, lookups, counts)
+    return counts
+
+
+if __name__ == "__main__":
+    print("Transforming orders, order items and metadata (fused)...")
+    for name, counts in transform_orders_fused().items():
+        total = sum(v for k, v in counts.items() if k != "errors")
+        print(f"Done: {total} {name} ({counts})")
@@ -0,0 +1,46 @@
+"""
+Load the item catalog into the items dimension.
+order_items reference an item by its integer item_key instead of repeating name and category strings:
+smaller rows and indexes, integer GROUP BY keys, and a catalog rename updates one items row, not order history.
+Upserts on (source_name, source_item_id), so keys stay stable across runs.
+"""
+
+from etl.config import Config
+from etl.db.connection import db
+from etl.sources import load_json
+from .utils import CATALOG_PATH, build_item_lookup
+
+
+def catalog_items(catalog: dict) -> list:
+    """items rows for a {source: {item_id: {name, category}}} catalog (skips "_comment" entries)."""
+    return [
+        {"source_name": source, "source_item_id": item_id,
+         "item_name": info.get("name", ""), "category": info.get("category", "Unknown")}
+        for source, items in catalog.items()
+        for item_id, info in items.items() if isinstance(info, dict)
+    ]
+
+
+def load_items(client, catalog: dict = None) -> dict:
+    """Upserts the catalog into items. Returns (source_name, source_item_id) -> item_key."""
+    rows = catalog_items(catalog if catalog is not None else load_json(CATALOG_PATH))
+    for i in range(0, len(rows), Config.UPSERT_CHUNK_SIZE):
+        client.table("items").upsert(rows[i:i + Config.UPSERT_CHUNK_SIZE], on_conflict="source_name,source_item_id").execute()
+    return build_item_lookup(client)
+
+
+def transform_items() -> dict:
+    """Load item_catalog.json into the items table."""
+    catalog = load_json(CATALOG_PATH)
+    load_items(db.client, catalog)
+    counts = {"doordash": 0, "square": 0, "toast": 0, "errors": 0}
+    for row in catalog_items(catalog):
+        counts[row["source_name"]] = counts.get(row["source_name"], 0) + 1
+    return counts
+
+
+if __name__ == "__main__":
+    print("Loading items...")
+    counts = transform_items()
+    total = sum(v for k, v in counts.items() if k != "errors")
+    print(f"Done: {total} items ({counts})")
@@ -1,9 +1,10 @@
 """
 Transform location data from raw_data to locations table.
-Uses batch upsert for O(n) processing with single DB round-trip.
+Streams raw_data in keyset pages, projected to PATHS, and upserts each page: O(page) memory.
 """
 
 from etl.db.connection import db
+from etl.db.reader import iter_raw_projected
 from .utils import ACCOUNT_ID, batch_upsert
 
 # Extractors: source -> (id_field, address_field_map)
@@ -13,37 +14,43 @@ EXTRACTORS = {
     "toast": lambda d: (d["guid"], d["address"]["line1"], d["address"]["city"], d["address"]["state"], d["address"]["zip"], d["address"]["country"]),
 }
 
+# JSON paths each source's extractor reads (projection pushdown: nothing else is fetched)
+PATHS = {
+    "doordash": ("store_id", "name", "timezone", "address"),
+    "square": ("id", "name", "timezone", "address"),
+    "toast": ("guid", "name", "timezone", "address"),
+}
+
 
 def transform_locations() -> dict:
     """Transform all locations from raw_data to locations table."""
     client = db.client
     counts = {"doordash": 0, "square": 0, "toast": 0, "errors": 0}
     
-    response = client.table("raw_data").select("source_name, data").eq("entity_type", "location").execute()
-    
-    records = []
-    for row in response.data:
-        source, data = row["source_name"], row["data"]
-        try:
-            loc_id, addr1, city, state, postal, country = EXTRACTORS[source](data)
-            records.append({
-                "account_id": ACCOUNT_ID,
-                "source_name": source,
-                "source_location_id": loc_id,
-                "name": data["name"],
-                "address_line_1": addr1,
-                "city": city,
-                "state": state,
-                "postal_code": postal,
-                "country": country,
-                "timezone": data.get("timezone", ""),
-            })
-            counts[source] += 1
-        except Exception as e:
-            print(f"[ERROR] {source} location: {e}")
-            counts["errors"] += 1
-    
-    batch_upsert(client, "locations", records)
+    for page in iter_raw_projected(client, "location", PATHS):
+        records = []
+        for row in page:
+            source, data = row["source_name"], row["data"]
+            try:
+                loc_id, addr1, city, state, postal, country = EXTRACTORS[source](data)
+                records.append({
+                    "account_id": ACCOUNT_ID,
+                    "source_name": source,
+                    "source_location_id": loc_id,
+                    "name": data["name"],
+                    "address_line_1": addr1,
+                    "city": city,
+                    "state": state,
+                    "postal_code": postal,
+                    "country": country,
+                    "timezone": data.get("timezone", ""),
+                })
+                counts[source] += 1
+            except Exception as e:
+                print(f"[ERROR] {source} location: {e}")
+                counts["errors"] += 1
+        
+        batch_upsert(client, "locations", records)
     return counts
 
 
@@ -1,38 +1,47 @@
 """
 Transform order item data from raw_data to order_items table.
-Uses hash maps for O(1) lookups and batch upsert.
+Uses hash maps for O(1) lookups; streams raw_data in keyset pages (only the order ID and item arrays) and upserts each page.
+Items are written as integer item_key references to the items dimension (transform_items); names and
+categories live there once and the gold views join them back. Items missing from the catalog get a NULL key.
 """
 
 from etl.db.connection import db
-from .utils import build_order_lookup, load_item_catalog, load_square_prices, get_item_info, batch_upsert
+from etl.metrics import step
+from etl.db.reader import iter_raw_projected
+from .utils import build_order_lookup, build_item_lookup, load_square_prices, batch_upsert
 
 
-def extract_doordash_items(data: dict, order_id: str, catalog: dict) -> list:
+# JSON paths each extractor reads: the order ID and its item array
+PATHS = {
+    "doordash": ("external_delivery_id", "order_items"),
+    "square": ("id", "line_items"),
+    "toast": ("guid", "checks"),
+}
+
+
+def extract_doordash_items(data: dict, order_id: str, item_keys: dict) -> list:
     """Extract DoorDash order items."""
     source_order_id = data["external_delivery_id"]
     items = []
     for item in data.get("order_items", []):
         item_id = item["item_id"]
-        name, category = get_item_info(catalog, "doordash", item_id)
         items.append({
             "order_id": order_id,
             "source_name": "doordash",
             "source_order_item_id": f"{source_order_id}_{item_id}",
-            "item_name": name,
+            "item_key": item_keys.get(("doordash", item_id)),
             "quantity": item["quantity"],
             "unit_price": item["unit_price"],
             "total_price": item["quantity"] * item["unit_price"],
-            "category": category,
         })
     return items
 
 
-def extract_square_items(data: dict, order_id: str, catalog: dict, prices: dict) -> list:
+def extract_square_items(data: dict, order_id: str, item_keys: dict, prices: dict) -> list:
     """Extract Square order items."""
     items = []
     for item in data.get("line_items", []):
         cat_id = item["catalog_object_id"]
-        name, category = get_item_info(catalog, "square", cat_id)
         qty = int(item["quantity"])
         total = item.get("gross_sales_money", {}).get("amount", 0)
         unit = prices.get(cat_id) or (total // qty if qty > 0 else 0)
@@ -40,16 +49,15 @@ def extract_square_items(data: dict, order_id: str, catalog: dict, prices: dict)
             "order_id": order_id,
             "source_name": "square",
             "source_order_item_id": item["uid"],
-            "item_name": name,
+            "item_key": item_keys.get(("square", cat_id)),
             "quantity": qty,
             "unit_price": unit,
             "total_price": total,
-            "category": category,
         })
     return items
 
 
-def extract_toast_items(data: dict, order_id: str, catalog: dict) -> list:
+def extract_toast_items(data: dict, order_id: str, item_keys: dict) -> list:
     """Extract Toast order items from nested checks/selections."""
     items = []
     for check in data.get("checks", []):
@@ -57,18 +65,16 @@ def extract_toast_items(data: dict, order_id: str, catalog: dict) -> list:
             if not sel.get("item") or not sel["item"].get("guid"):
                 continue
             item_guid = sel["item"]["guid"]
-            name, category = get_item_info(catalog, "toast", item_guid)
             qty = sel.get("quantity", 0)
             price = sel.get("price", 0)
             items.append({
                 "order_id": order_id,
                 "source_name": "toast",
                 "source_order_item_id": sel["guid"],
-                "item_name": name,
+                "item_key": item_keys.get(("toast", item_guid)),
                 "quantity": qty,
                 "unit_price": price // qty if qty > 0 else 0,
                 "total_price": price,
-                "category": category,
             })
     return items
 
@@ -79,35 +85,35 @@ def transform_order_items() -> dict:
     counts = {"doordash": 0, "square": 0, "toast": 0, "errors": 0}
     
     # Build lookups once - O(1) per item instead of O(n) DB queries
-    order_lookup = build_order_lookup(client)
-    catalog = load_item_catalog()
-    square_prices = load_square_prices()
-    
-    response = client.table("raw_data").select("source_name, data").eq("entity_type", "order").execute()
-    
-    all_items = []
-    for row in response.data:
-        source, data = row["source_name"], row["data"]
-        try:
-            source_order_id = data.get("external_delivery_id") or data.get("id") or data.get("guid")
-            order_id = order_lookup[(source, source_order_id)]
-            
-            if source == "doordash":
-                items = extract_doordash_items(data, order_id, catalog)
-            elif source == "square":
-                items = extract_square_items(data, order_id, catalog, square_prices)
-            elif source == "toast":
-                items = extract_toast_items(data, order_id, catalog)
-            else:
-                continue
-            
-            all_items.extend(items)
-            counts[source] += len(items)
-        except Exception as e:
-            print(f"[ERROR] {source} order items: {e}")
-            counts["errors"] += 1
+    with step("lookups"):
+        order_lookup = build_order_lookup(client)
+        item_keys = build_item_lookup(client)
+        square_prices = load_square_prices()
     
-    batch_upsert(client, "order_items", all_items)
+    for page in iter_raw_projected(client, "order", PATHS):
+        page_items = []
+        for row in page:
+            source, data = row["source_name"], row["data"]
+            try:
+                source_order_id = data.get("external_delivery_id") or data.get("id") or data.get("guid")
+                order_id = order_lookup[(source, source_order_id)]
+                
+                if source == "doordash":
+                    items = extract_doordash_items(data, order_id, item_keys)
+                elif source == "square":
+                    items = extract_square_items(data, order_id, item_keys, square_prices)
+                elif source == "toast":
+                    items = extract_toast_items(data, order_id, item_keys)
+                else:
+                    continue
+                
+                page_items.extend(items)
+                counts[source] += len(items)
+            except Exception as e:
+                print(f"[ERROR] {source} order items: {e}")
+                counts["errors"] += 1
+        
+        batch_upsert(client, "order_items", page_items, counts)
     return counts
 
 
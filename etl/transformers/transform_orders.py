@@ -1,9 +1,12 @@
 """
 Transform order data from raw_data to orders table.
-Uses hash maps for O(1) location lookups and batch upsert.
+Uses hash maps for O(1) location lookups; streams raw_data in keyset pages and upserts each page.
+Reads only the JSON paths the extractors use (PATHS), one source at a time.
 """
 
 from etl.db.connection import db
+from etl.metrics import step
+from etl.db.reader import iter_raw_projected
 from .utils import build_location_lookup, map_status, map_fulfillment, batch_upsert
 
 
@@ -62,6 +65,17 @@ def extract_toast(data: dict, loc_lookup: dict) -> dict:
 
 EXTRACTORS = {"doordash": extract_doordash, "square": extract_square, "toast": extract_toast}
 
+# JSON paths each extractor reads. PostgREST can't project fields inside array elements, so arrays
+# summed per element (line_items, checks) are fetched whole.
+PATHS = {
+    "doordash": ("store_id", "external_delivery_id", "created_at", "delivery_time", "pickup_time", "order_status",
+                 "order_fulfillment_method", "order_subtotal", "tax_amount", "dasher_tip", "total_charged_to_consumer"),
+    "square": ("location_id", "id", "created_at", "closed_at", "state", "fulfillments.0.type", "line_items",
+               "total_tax_money.amount", "total_tip_money.amount", "total_money.amount"),
+    "toast": ("restaurantGuid", "guid", "openedDate", "closedDate", "paidDate", "voided", "deleted",
+              "diningOption.behavior", "checks"),
+}
+
 
 def transform_orders() -> dict:
     """Transform all orders from raw_data to orders table."""
@@ -69,22 +83,22 @@ def transform_orders() -> dict:
     counts = {"doordash": 0, "square": 0, "toast": 0, "errors": 0}
     
     # Build location lookup once - O(1) per order instead of O(n) DB queries
-    loc_lookup = build_location_lookup(client)
-    
-    response = client.table("raw_data").select("source_name, data").eq("entity_type", "order").execute()
-    
-    records = []
-    for row in response.data:
-        source, data = row["source_name"], row["data"]
-        try:
-            records.append(EXTRACTORS[source](data, loc_lookup))
-            counts[source] += 1
-        except Exception as e:
-            order_id = data.get("external_delivery_id") or data.get("id") or data.get("guid", "?")
-            print(f"[ERROR] {source} order {order_id}: {e}")
-            counts["errors"] += 1
+    with step("lookups"):
+        loc_lookup = build_location_lookup(client)
     
-    batch_upsert(client, "orders", records)
+    for page in iter_raw_projected(client, "order", PATHS):
+        records = []
+        for row in page:
+            source, data = row["source_name"], row["data"]
+            try:
+                records.append(EXTRACTORS[source](data, loc_lookup))
+                counts[source] += 1
+            except Exception as e:
+                order_id = data.get("external_delivery_id") or data.get("id") or data.get("guid", "?")
+                print(f"[ERROR] {source} order {order_id}: {e}")
+                counts["errors"] += 1
+        
+        batch_upsert(client, "orders", records, counts)
     return counts
 
 
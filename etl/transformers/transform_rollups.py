@@ -0,0 +1,36 @@
+"""
+Maintain the daily/hourly sales rollup tables (schemas/rollups.py).
+One RPC: refresh_sales_rollups recomputes, server-side and set-based, only the (location, day)
+partitions with orders or order items changed since its last run. --full rebuilds everything.
+"""
+
+import argparse
+from etl.db.connection import db
+from etl.schemas.rollups import ROLLUP_TABLES
+from .utils import MISSING, call_function
+
+
+def transform_rollups(full: bool = False) -> dict:
+    """
+    Refresh sales rollups. Returns rows written per rollup table (partitions recomputed under "partitions").
+    A missing function counts as an error; any other failure (e.g. a timeout) is raised and fails the step.
+    """
+    counts = {table: 0 for table in ROLLUP_TABLES}
+    result = call_function(db.client, "refresh_sales_rollups", {"full_refresh": full}, missing=MISSING)
+    if result is MISSING:
+        print("[WARNING] rollups not refreshed")
+        return {**counts, "errors": 1}
+    result = result or {}
+    counts.update({table: result.get(table, 0) for table in ROLLUP_TABLES})
+    print(f"  rollups: {result.get('partitions', 0)} partitions recomputed" + (" (full)" if result.get("full") else ""))
+    return {**counts, "errors": 0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the sales rollup tables.")
+    parser.add_argument("--full", action="store_true", help="Rebuild every partition instead of the changed ones")
+    args = parser.parse_args()
+    print("Refreshing sales rollups...")
+    counts = transform_rollups(args.full)
+    total = sum(v for k, v in counts.items() if k != "errors")
+    print(f"Done: {total} rollup rows ({counts})")
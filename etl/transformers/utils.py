@@ -3,14 +3,31 @@ Shared utilities for transformers.
 Uses hash maps for O(1) lookups instead of O(n) DB queries per item.
 """
 
-import json
+import weakref
 from pathlib import Path
+from etl.config import Config
+from etl.db.errors import is_foreign_key_violation, is_missing_function
+from etl.db.reader import iter_rows, iter_raw_data
+from etl.catalog.index import CatalogIndex, open_index
+from etl.sources import load_json
+from .keys import KEY_COLUMNS, SOURCE_KEYS, DerivedLookup, deterministic_keys, stamp_keys
+from .lookup_cache import shared_cache
 
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 CATALOG_PATH = PROJECT_ROOT / "etl" / "catalog" / "item_catalog.json"
+CATALOG_INDEX_PATH = CATALOG_PATH.with_suffix(".idx")
 SQUARE_CATALOG_PATH = PROJECT_ROOT / "etl" / "data" / "sources" / "square" / "catalog.json"
 
+# Compiled catalog index, opened once per process
+_catalog_index = None
+
+# call_function result for a function that is not installed
+MISSING = object()
+
+# Server-side functions found missing, per client: asked once per run, not once per page
+_missing_functions = weakref.WeakKeyDictionary()
+
 # Account ID for all locations
 ACCOUNT_ID = "33ccddbb-fe9f-489f-83b0-69e2a1e4eff8"
 
@@ -56,37 +73,60 @@ def normalize_card_brand(value: str) -> str:
     return value.upper() if value else None
 
 
-# Lookup builders (build once, query O(1))
+# Lookup builders (build once, query O(1)); keyset-paginated so large tables aren't truncated
 def build_location_lookup(client) -> dict:
     """Build hash map: (source_name, source_location_id) -> location_id"""
-    response = client.table("locations").select("location_id, source_name, source_location_id").execute()
-    return {(r["source_name"], r["source_location_id"]): r["location_id"] for r in response.data}
+    if deterministic_keys():
+        return DerivedLookup("location")  # No round trip: keys derive from source IDs
+    if Config.LOOKUP_CACHE:
+        return shared_cache().get(client, "locations")  # Snapshot + rows changed since the watermark
+    rows = iter_rows(client, "locations", "location_id, source_name, source_location_id", "location_id")
+    return {(r["source_name"], r["source_location_id"]): r["location_id"] for r in rows}
 
 
 def build_order_lookup(client) -> dict:
     """Build hash map: (source_name, source_order_id) -> order_id"""
-    response = client.table("orders").select("order_id, source_name, source_order_id").execute()
-    return {(r["source_name"], r["source_order_id"]): r["order_id"] for r in response.data}
+    if deterministic_keys():
+        return DerivedLookup("order")
+    if Config.LOOKUP_CACHE:
+        return shared_cache().get(client, "orders")
+    rows = iter_rows(client, "orders", "order_id, source_name, source_order_id", "order_id")
+    return {(r["source_name"], r["source_order_id"]): r["order_id"] for r in rows}
+
+
+def build_item_lookup(client) -> dict:
+    """Build hash map: (source_name, source_item_id) -> item_key (items dimension, see transform_items)"""
+    rows = iter_rows(client, "items", "item_key, source_name, source_item_id", "item_key")
+    return {(r["source_name"], r["source_item_id"]): r["item_key"] for r in rows}
 
 
 def build_payment_lookup(client) -> dict:
     """Build hash map: square_order_id -> payment_data"""
-    response = client.table("raw_data").select("data").eq("source_name", "square").eq("entity_type", "payment").execute()
-    return {r["data"]["order_id"]: r["data"] for r in response.data if r["data"].get("order_id")}
+    return {
+        r["data"]["order_id"]: r["data"]
+        for page in iter_raw_data(client, "payment", source="square", columns="raw_id, data")
+        for r in page if r["data"].get("order_id")
+    }
 
 
-def load_item_catalog() -> dict:
-    """Load item catalog (normalized names/categories)."""
-    with open(CATALOG_PATH, encoding="utf-8") as f:
-        return json.load(f)
+def load_item_catalog():
+    """
+    Load item catalog (normalized names/categories): the compiled mmap index (etl/catalog/index.py),
+    compiled on first use and shared by every step in the process; the parsed JSON if it can't be built.
+    """
+    global _catalog_index
+    if _catalog_index is None or not _catalog_index.is_fresh(CATALOG_PATH):
+        _catalog_index = open_index(CATALOG_PATH, CATALOG_INDEX_PATH)
+    if _catalog_index is not None:
+        return _catalog_index
+    return load_json(CATALOG_PATH)
 
 
 def load_square_prices() -> dict:
     """Build hash map: variation_id -> unit_price from Square catalog."""
     if not SQUARE_CATALOG_PATH.exists():
         return {}
-    with open(SQUARE_CATALOG_PATH, encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(SQUARE_CATALOG_PATH)
     return {
         var["id"]: var.get("item_variation_data", {}).get("price_money", {}).get("amount", 0)
         for obj in data.get("objects", []) if obj["type"] == "ITEM"
@@ -94,22 +134,82 @@ def load_square_prices() -> dict:
     }
 
 
-def get_item_info(catalog: dict, source: str, item_id: str) -> tuple:
-    """Get (name, category) from catalog. O(1) lookup."""
+def get_item_info(catalog, source: str, item_id: str) -> tuple:
+    """Get (name, category) from the catalog index or JSON dict. O(1) lookup."""
+    if isinstance(catalog, CatalogIndex):
+        return catalog.item_info(source, item_id)
     info = catalog.get(source, {}).get(item_id, {})
     return info.get("name", ""), info.get("category", "Unknown")
 
 
-def batch_upsert(client, table: str, records: list) -> int:
-    """Batch upsert records. Single round-trip."""
+def upsert_rows(client, table: str, records: list) -> tuple:
+    """
+    Upserts records on their source key (derived primary keys stamped when ETL_KEY_STRATEGY=uuid5): a re-run updates
+    rows in place whichever way their keys were made. Returns (written rows, rejected records).
+    A batch referencing a missing parent (foreign key violation: derived keys are never looked up) is bisected
+    so only the orphaned rows are rejected, one error each - as a lookup miss would be.
+    """
     if not records:
-        return 0
-    client.table(table).upsert(records).execute()
-    return len(records)
-
-
-def batch_update_metadata(client, updates: list) -> int:
-    """Batch update metadata field. One query per update (Supabase limitation)."""
+        return [], []
+    records = stamp_keys(table, records)
+    try:
+        return client.table(table).upsert(records, on_conflict=SOURCE_KEYS.get(table, "")).execute().data or [], []
+    except Exception as e:
+        if not is_foreign_key_violation(e):
+            raise
+        if len(records) == 1:
+            source_column = KEY_COLUMNS[table][2] if table in KEY_COLUMNS else None
+            print(f"[ERROR] {records[0].get('source_name')} {table} {records[0].get(source_column, '?')}: {e}")
+            return [], records
+    mid = len(records) // 2
+    left, right = upsert_rows(client, table, records[:mid]), upsert_rows(client, table, records[mid:])
+    return left[0] + right[0], left[1] + right[1]
+
+
+def count_rejected(counts: dict, rejected: list) -> None:
+    """Moves rejected records from their source's count to errors."""
+    for record in rejected:
+        counts[record["source_name"]] -= 1
+        counts["errors"] += 1
+
+
+def batch_upsert(client, table: str, records: list, counts: dict = None) -> int:
+    """Batch upsert records. Single round-trip unless rows reference missing parents (see upsert_rows); those move to counts["errors"]."""
+    _, rejected = upsert_rows(client, table, records)
+    if counts is not None:
+        count_rejected(counts, rejected)
+    return len(records) - len(rejected)
+
+
+def refresh_gold_views(client) -> dict:
+    """
+    Refresh the materialized gold views via refresh_gold_views (schemas/functions.py): one RPC, refreshed
+    CONCURRENTLY so dashboard reads are never blocked. Returns {view: seconds}; {} if the function is not
+    installed. Any other failure (a statement timeout included) is raised: the views would stay stale.
+    """
+    return call_function(client, "refresh_gold_views", {}) or {}
+
+
+def call_function(client, fn: str, params: dict, missing=None):
+    """
+    rpc(fn, params).execute().data. If the function is not installed returns `missing` (and remembers that for
+    `client`, so later calls skip the round trip); any other error - timeouts included - is raised.
+    """
+    known_missing = _missing_functions.setdefault(client, set())
+    if fn in known_missing:
+        return missing
+    try:
+        return client.rpc(fn, params).execute().data
+    except Exception as e:
+        if not is_missing_function(e):
+            raise
+        print(f"[WARNING] {fn} unavailable ({e})")
+        known_missing.add(fn)
+        return missing
+
+
+def update_metadata_per_row(client, updates: list) -> int:
+    """Update metadata one order at a time. One round-trip per update."""
     count = 0
     for order_id, metadata in updates:
         if metadata:
@@ -117,3 +217,21 @@ def batch_update_metadata(client, updates: list) -> int:
             count += 1
     return count
 
+
+def batch_update_metadata(client, updates: list, chunk_size: int = None) -> int:
+    """
+    Bulk update metadata field via bulk_update_order_metadata (schemas/functions.py).
+    One set-based UPDATE per chunk instead of one round-trip per order.
+    Falls back to per-row updates only if the function is not installed; other errors are raised.
+    """
+    rows = [{"order_id": order_id, "metadata": metadata} for order_id, metadata in updates if metadata]
+    chunk_size = chunk_size or Config.UPSERT_CHUNK_SIZE
+    count = 0
+    for i in range(0, len(rows), chunk_size):
+        chunk = rows[i:i + chunk_size]
+        updated = call_function(client, "bulk_update_order_metadata", {"updates": chunk}, missing=MISSING)
+        if updated is MISSING:
+            print("[WARNING] updating metadata per row")
+            return count + update_metadata_per_row(client, [(r["order_id"], r["metadata"]) for r in rows[i:]])
+        count += updated if isinstance(updated, int) else len(chunk)
+    return count
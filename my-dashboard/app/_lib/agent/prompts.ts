@@ -6,14 +6,22 @@ SILVER LAYER (normalized):
 - locations: location_id, source_name, source_location_id, name, address_line_1, city, state, postal_code, country, timezone
 - orders: order_id, location_id, source_name, source_order_id, created_at, closed_at, status, fulfillment_method, subtotal, tax_amount, tip_amount, total_amount, metadata (JSONB)
   - status values: "completed", "cancelled", "voided", "deleted" (all lowercase)
-- order_items: order_item_id, order_id, source_name, source_order_item_id, item_name, quantity, unit_price, total_price, category
+- items: item_key, source_name, source_item_id, item_name, category (one row per catalog item)
+- order_items: order_item_id, order_id, source_name, source_order_item_id, item_key, quantity, unit_price, total_price
+  - item names and categories live in items (JOIN on item_key); ai_order_items already joins them
 
-GOLD LAYER (AI views - pre-joined, flattened):
+GOLD LAYER (AI views - pre-joined, flattened, materialized and refreshed after each ETL run):
 - ai_orders: order_id, source_name, source_order_id, created_at, closed_at, status, fulfillment_method, subtotal, tax_amount, tip_amount, total_amount, location_name, location_city, location_state, payment_type, card_brand, delivery_fee, service_fee, commission, business_date, server_name, revenue_center
   - status values: "completed", "cancelled", "voided", "deleted" (all lowercase)
-- ai_order_items: order_item_id, order_id, source_name, item_name, quantity, unit_price, total_price, category, order_created_at, order_status, fulfillment_method, location_name, location_city
+- ai_order_items: order_item_id, order_id, source_name, item_key, item_name, quantity, unit_price, total_price, category, order_created_at, order_status, fulfillment_method, location_name, location_city
   - order_status values: "completed", "cancelled", "voided", "deleted" (all lowercase)
 
+ROLLUPS (pre-aggregated sums, refreshed after each ETL run; day/hour are UTC):
+- ai_sales_daily: day, source_name, fulfillment_method, status, payment_type, orders, subtotal, tax_amount, tip_amount, total_amount, location_name, location_city
+- ai_sales_hourly: hour, day, hour_of_day, source_name, fulfillment_method, status, orders, total_amount, location_name, location_city
+- ai_item_sales_daily: day, source_name, item_key, item_name, category, order_status, order_lines, quantity, total_price, location_name, location_city
+  - each row is already a SUM for its group: always SUM(...) the measures (orders = order count), never COUNT(*)
+
 JSONB metadata (orders table only):
 - DoorDash: delivery_fee, commission, service_fee, pickup_time, delivery_time
 - Square: payment_type, card_brand, entry_method
@@ -21,7 +29,8 @@ JSONB metadata (orders table only):
 
 ## SQL GUIDELINES
 
-- Use ai_orders/ai_order_items for most queries (already joined)
+- For totals by day, hour, location, item, category, source, channel or payment type, use the rollup views (ai_sales_daily, ai_sales_hourly, ai_item_sales_daily): far fewer rows to scan
+- Use ai_orders/ai_order_items for order-level detail or filters the rollups don't have (already joined)
 - Use Silver tables + JSONB only when needed fields aren't in views
 - Money values are stored in CENTS (divide by 100 for display)
 - Always use appropriate GROUP BY, ORDER BY, and LIMIT
@@ -6,9 +6,13 @@ import { ChartConfig, ChartType } from '@/app/_types/chart'
 const ALLOWED_TABLES = [
   'locations',
   'orders',
+  'items',
   'order_items',
   'ai_orders',
   'ai_order_items',
+  'ai_sales_daily',
+  'ai_sales_hourly',
+  'ai_item_sales_daily',
 ]
 
 const DANGEROUS_KEYWORDS = [